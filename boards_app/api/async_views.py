@@ -0,0 +1,87 @@
+"""
+Async implementations of the board reads, see core.async_api.
+
+Same responses, validators, payload cache and query plan as
+BoardsViewSet.list() and BoardsViewSet.retrieve().
+"""
+
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import JSONRenderer
+
+from boards_app import payload_cache, versions
+from boards_app.models import Boards
+from core import streaming
+from core.async_api import async_read_view, json_response
+from core.conditional import conditional_response, make_etag, set_validators
+from .serializers import BoardDetailSerializer, BoardsListSerializer
+from .views import BoardsViewSet
+
+
+@async_read_view
+async def board_list(request, user):
+    """
+    GET /api/boards/, see BoardsViewSet.list().
+    """
+    validators = await versions.aaccessible_board_validators(user)
+    etag = make_etag("boards", request.get_full_path(), validators)
+    response = conditional_response(request, etag)
+    if response is not None:
+        return response
+
+    size = streaming.chunk_size()
+    if len(validators) > size:
+
+        async def chunks():
+            for chunk in streaming.chunked(validators, size):
+                yield await _list_rows(user, chunk)
+
+        response = StreamingHttpResponse(
+            streaming.ajson_array(chunks()), content_type=JSONRenderer.media_type
+        )
+        return set_validators(response, etag)
+    return set_validators(json_response(await _list_rows(user, validators)), etag)
+
+
+async def _list_rows(user, validators):
+    """
+    Async variant of BoardsViewSet.list_rows().
+    """
+    rows = payload_cache.get_rows(validators)
+    missing = [board_id for board_id, _, _ in validators if board_id not in rows]
+    if missing:
+        queryset = Boards.objects.accessible_to(user).order_by("pk").filter(pk__in=missing)
+        boards = [board async for board in queryset]
+        payloads = BoardsListSerializer(boards, many=True).data
+        payload_cache.set_rows(boards, payloads)
+        rows.update((board.pk, payload) for board, payload in zip(boards, payloads))
+    return [rows[board_id] for board_id, _, _ in validators if board_id in rows]
+
+
+@async_read_view
+async def board_detail(request, user, pk):
+    """
+    GET /api/boards/{id}/, see BoardsViewSet.retrieve().
+
+    Unknown or foreign boards are answered by the viewset (404).
+    """
+    validators = await versions.aboard_validators(pk, user)
+    if validators is None:
+        return None
+    version, updated_at = validators
+    etag = make_etag("board", pk, version)
+    response = conditional_response(request, etag, updated_at)
+    if response is not None:
+        return response
+    payload = payload_cache.get_payload(payload_cache.DETAIL, pk, version, updated_at)
+    if payload is not None:
+        return set_validators(json_response(payload), etag, updated_at)
+
+    queryset = BoardsViewSet.get_detail_queryset(Boards.objects.accessible_to(user))
+    board = await queryset.filter(pk=pk).afirst()
+    if board is None:
+        return None
+    payload = BoardDetailSerializer(board).data
+    payload_cache.set_payload(payload_cache.DETAIL, board, payload)
+    return set_validators(
+        json_response(payload), make_etag("board", board.pk, board.version), board.updated_at
+    )
@@ -1,4 +1,5 @@
 from rest_framework.permissions import BasePermission
+from boards_app import membership
 
 
 class IsOwnerOrMember(BasePermission):
@@ -9,9 +10,8 @@ class IsOwnerOrMember(BasePermission):
     - the owner of the object, or
     - a member associated with the object.
 
-    Intended for models that define:
-    - an `owner` (or `owner_id`) field
-    - a ManyToMany relation `members` to User
+    Intended for boards: membership is looked up in the cached board IDs
+    of the user (boards_app.membership) instead of the members relation.
     """
 
     def has_object_permission(self, request, view, obj):
@@ -31,7 +31,10 @@ class IsOwnerOrMember(BasePermission):
             bool: True if access is allowed, False otherwise.
         """
         user = request.user
-        return (
-            obj.owner_id == user.id
-            or obj.members.filter(id=user.id).exists()
-        )
+        if obj.owner_id == user.id:
+            return True
+        # Reuse prefetched members (e.g. board detail) instead of querying again
+        if "members" in getattr(obj, "_prefetched_objects_cache", {}):
+            return any(member.pk == user.id for member in obj.members.all())
+        # Cached per user, see boards_app.membership
+        return membership.can_access(user, obj.pk)
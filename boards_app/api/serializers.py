@@ -13,18 +13,19 @@ class BoardsListSerializer(serializers.ModelSerializer):
 
     Provides aggregated information (member count, task counts)
     and supports assigning members on create/update.
+
+    The counters are stored on the board (see boards_app.counters)
+    and are read-only in the API.
     """
 
-    # Expose owner id without nesting the full owner object
-    owner_id = serializers.IntegerField(source="owner.id", read_only=True)
+    # Expose owner id without nesting (or loading) the full owner object
+    owner_id = serializers.IntegerField(read_only=True)
 
-    # Computed field, filled in to_representation
+    # Aggregated counters, maintained on the model by boards_app.counters
     member_count = serializers.IntegerField(read_only=True)
-
-    # Aggregated task counters (computed via methods below)
-    tasks_high_prio_count = serializers.SerializerMethodField()
-    tasks_to_do_count = serializers.SerializerMethodField()
-    ticket_count = serializers.SerializerMethodField()
+    tasks_high_prio_count = serializers.IntegerField(read_only=True)
+    tasks_to_do_count = serializers.IntegerField(read_only=True)
+    ticket_count = serializers.IntegerField(read_only=True)
 
     members = serializers.PrimaryKeyRelatedField(
         many=True,
@@ -60,8 +61,8 @@ class BoardsListSerializer(serializers.ModelSerializer):
         Steps:
         1) Extract the 'members' list from validated_data.
         2) Create the board instance.
-        3) Assign the provided members to the board.
-        4) Always add the creator (request.user) as a member.
+        3) Assign the provided members to the board, always
+           including the creator (request.user).
 
         Requirement:
         - The serializer must be instantiated with context={"request": request}.
@@ -69,24 +70,15 @@ class BoardsListSerializer(serializers.ModelSerializer):
         members = validated_data.pop("members", [])
         board = Boards.objects.create(**validated_data)
 
-        # Set selected members (overwrites existing relations)
-        board.members.set(members)
-
-        # Ensure the creator is always a member of the board
-        board.members.add(self.context["request"].user.id)
+        # Set selected members and always include the creator,
+        # in a single write on the members relation
+        creator_id = self.context["request"].user.id
+        board.members.set({creator_id, *(member.pk for member in members)})
 
+        # member_count was updated in the database by the m2m signal
+        board.refresh_from_db(fields=["member_count"])
         return board
 
-    def to_representation(self, instance):
-        """
-        Customize the serialized output.
-
-        Adds the computed member_count to the response.
-        """
-        data = super().to_representation(instance)
-        data["member_count"] = instance.members.count()
-        return data
-
     def update(self, instance, validated_data):
         """
         Update a board and optionally update its members.
@@ -97,33 +89,10 @@ class BoardsListSerializer(serializers.ModelSerializer):
         members = validated_data.pop("members", None)
         instance = super().update(instance, validated_data)
         if members is not None:
-            instance.members.set(members)  
+            instance.members.set(members)
+            instance.refresh_from_db(fields=["member_count"])
         return instance
 
-    def get_tasks_high_prio_count(self, board):
-        """
-        Return the number of tasks with HIGH priority for this board.
-        """
-        return Task.objects.filter(
-            board=board,
-            priority=Task.Priority.HIGH
-        ).count()
-
-    def get_tasks_to_do_count(self, board):
-        """
-        Return the number of tasks with TODO status for this board.
-        """
-        return Task.objects.filter(
-            board=board,
-            status=Task.Status.TODO
-        ).count()
-
-    def get_ticket_count(self, board):
-        """
-        Return the total number of tasks (tickets) for this board.
-        """
-        return Task.objects.filter(board=board).count()
-
 
 class MemberSerializer(serializers.ModelSerializer):
     """
@@ -144,6 +113,17 @@ class MemberSerializer(serializers.ModelSerializer):
         return obj.get_full_name() or obj.get_username()
     
 
+class SyncBoardSerializer(BoardsListSerializer):
+    """
+    Board representation of the delta sync (see boards_app.sync): the
+    list fields plus the members, which are not part of the task rows.
+
+    Expects members to be prefetched.
+    """
+
+    members = MemberSerializer(many=True, read_only=True)
+
+
 class BoardDetailSerializer(serializers.ModelSerializer):
     """
     Serializer for board detail views.
@@ -152,9 +132,12 @@ class BoardDetailSerializer(serializers.ModelSerializer):
     - Owner ID
     - Full member objects
     - All related tasks
+
+    Expects members and tasks (with assignee/reviewer) to be prefetched,
+    see BoardsViewSet.get_detail_queryset().
     """
 
-    owner_id = serializers.IntegerField(source="owner.id", read_only=True)
+    owner_id = serializers.IntegerField(read_only=True)
     members = MemberSerializer(many=True, read_only=True)
     tasks = TasksSerializer(many=True, read_only=True)
 
@@ -199,3 +182,86 @@ class BoardUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Boards
         fields = ["id", "title", "owner_data", "members_data"]
+
+
+class ImportUserField(serializers.EmailField):
+    """
+    User reference of an imported row (see boards_app.importer).
+
+    Accepts an email address or a user object with an "email" key, as
+    written by the export. Returns the lower-cased address, or None for
+    an empty reference.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("required", False)
+        kwargs.setdefault("allow_null", True)
+        kwargs.setdefault("allow_blank", True)
+        super().__init__(**kwargs)
+
+    def run_validation(self, data=serializers.empty):
+        if isinstance(data, dict):
+            data = data.get("email")
+        return super().run_validation(data) or None
+
+    def to_internal_value(self, data):
+        return super().to_internal_value(data).lower()
+
+
+class ImportBoardSerializer(serializers.Serializer):
+    """
+    Field validation of an imported board row.
+
+    `id` is the board's ID in the source, referenced by the `board` of
+    its tasks; it is not the ID of the new board.
+    """
+
+    id = serializers.CharField(required=False)
+    title = serializers.CharField(max_length=100, required=False, allow_null=True, allow_blank=True)
+    members = serializers.ListField(child=ImportUserField(), required=False)
+
+
+class ImportTaskSerializer(serializers.Serializer):
+    """
+    Field validation of an imported task row.
+
+    `board` is the source ID of a board imported before; without it the
+    task belongs to the preceding board row.
+    """
+
+    id = serializers.CharField(required=False)
+    board = serializers.CharField(required=False)
+    title = serializers.CharField(max_length=150, required=False, allow_null=True, allow_blank=True)
+    description = serializers.CharField(
+        max_length=250, required=False, allow_null=True, allow_blank=True
+    )
+    status = serializers.ChoiceField(choices=Task.Status.choices, required=False)
+    priority = serializers.ChoiceField(choices=Task.Priority.choices, required=False)
+    assignee = ImportUserField()
+    reviewer = ImportUserField()
+    due_date = serializers.DateField(required=False, allow_null=True)
+
+
+class ImportCommentSerializer(serializers.Serializer):
+    """
+    Field validation of an imported comment row.
+
+    `task` is the source ID of a task imported before; without it the
+    comment belongs to the preceding task row. The author is
+    `author_email`, or `author` if that is an email address (the export
+    writes the display name, which is the email for users without a
+    name); otherwise the importing user. Only used by imports that keep
+    the authors (see boards_app.importer).
+    """
+
+    id = serializers.CharField(required=False)
+    task = serializers.CharField(required=False)
+    content = serializers.CharField(required=False, allow_blank=True, trim_whitespace=False)
+    author = serializers.CharField(required=False, allow_null=True, allow_blank=True)
+    author_email = ImportUserField()
+
+    def validate(self, attrs):
+        author = attrs.pop("author", None) or ""
+        if not attrs.get("author_email") and "@" in author:
+            attrs["author_email"] = self.fields["author_email"].run_validation(author)
+        return attrs
@@ -1,8 +1,12 @@
 from django.urls import path
 from .views import BoardsViewSet
+from boards_app.realtime import board_events
 from rest_framework import routers
 
 router = routers.SimpleRouter()
 router.register(r'', BoardsViewSet, basename="boards")
-urlpatterns = router.urls
+urlpatterns = [
+    path("<int:pk>/events/", board_events, name="board-events"),
+    *router.urls,
+]
 
@@ -1,10 +1,29 @@
-from django.db.models import Q
+from django.db.models import Prefetch
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from boards_app import export, importer, membership, payload_cache, sync, versions
 from boards_app.models import Boards
-from .serializers import BoardUpdateSerializer, BoardsListSerializer, BoardDetailSerializer
+from core import streaming
+from core.conditional import conditional_response, lookup_id, make_etag, set_validators
+from tasks_app.api.serializers import SyncCommentSerializer, TasksSerializer
+from tasks_app.models import Task
+from .serializers import (
+    BoardUpdateSerializer,
+    BoardsListSerializer,
+    BoardDetailSerializer,
+    SyncBoardSerializer,
+)
 from .permissions import IsOwnerOrMember
 
+# Number of queries needed to load a board detail, see get_detail_queryset().
+BOARD_DETAIL_QUERIES = 3
+
+# Skipped rows listed in the response of the import.
+IMPORT_MAX_ERROR_ROWS = 1000
+
 
 class BoardsViewSet(viewsets.ModelViewSet):
     """
@@ -15,6 +34,18 @@ class BoardsViewSet(viewsets.ModelViewSet):
     - Users can only see boards they own or are members of.
     - Object-level access is additionally protected by IsOwnerOrMember.
     - Uses different serializers for list/create vs. retrieve actions.
+    - The list supports opt-in cursor pagination (?page_size=, ?cursor=),
+      see core.pagination.OptInCursorPagination.
+    - List and detail support conditional GETs (ETag, If-None-Match;
+      Last-Modified for the detail) based on the board versions, see
+      boards_app.versions, and serve rendered payloads from a server-side
+      cache, see boards_app.payload_cache.
+    - GET /api/boards/sync/?since=<cursor> returns only the boards, tasks
+      and comments changed or deleted since a cursor, see sync().
+    - GET /api/boards/export/ and /api/boards/{id}/export/ stream boards
+      with their tasks and comments as JSON Lines or CSV, see export().
+    - POST /api/boards/import/ imports such files as new boards, see
+      import_boards().
     """
 
     queryset = Boards.objects.all()
@@ -33,13 +64,129 @@ class BoardsViewSet(viewsets.ModelViewSet):
         - the user is the owner of the board, OR
         - the user is listed as a member of the board
 
-        The `distinct()` call prevents duplicate results when both
-        conditions match.
+        Access is resolved in indexed subqueries on the primary key
+        (see boards_app.models.accessible_board_filter), so the
+        membership table does not produce duplicate rows. The counters
+        shown by BoardsListSerializer are stored columns on Boards,
+        so listing boards does not touch the tasks table.
+
+        Related rows needed by the detail/update serializers are loaded
+        up front, see get_detail_queryset().
+        """
+        queryset = Boards.objects.accessible_to(self.request.user).order_by("pk")
+        if self.action == "retrieve":
+            return self.get_detail_queryset(queryset)
+        if self.action in ["update", "partial_update"]:
+            return queryset.select_related("owner").prefetch_related("members")
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        """
+        List the user's boards, or answer 304 if none of them changed.
+
+        The ID, version and updated_at of every accessible board are read
+        in one indexed query. They make up the ETag, so adding, removing
+        or changing a board changes it, and select the rows served from
+        the payload cache (boards_app.payload_cache). Only boards without
+        a current cached row are loaded and serialized.
+
+        Paginated requests are served without the payload cache. Lists
+        of more than KANMIND_STREAM_CHUNK_SIZE boards are streamed with the
+        same body, chunk by chunk (see core.streaming).
+        """
+        validators = versions.accessible_board_validators(request.user)
+        etag = make_etag("boards", request.get_full_path(), validators)
+        response = conditional_response(request, etag)
+        if response is not None:
+            return response
+
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return set_validators(self.get_paginated_response(serializer.data), etag)
+
+        size = streaming.chunk_size()
+        if len(validators) > size and streaming.renders_plain_json(request):
+            chunks = (
+                self.list_rows(queryset, chunk) for chunk in streaming.chunked(validators, size)
+            )
+            response = streaming.streaming_response(request, streaming.json_array(chunks))
+            return set_validators(response, etag)
+        return set_validators(Response(self.list_rows(queryset, validators)), etag)
+
+    def list_rows(self, queryset, validators):
         """
-        user = self.request.user
-        return Boards.objects.filter(
-            Q(owner=user) | Q(members=user)
-        ).distinct()
+        Return the list rows of the boards in `validators`, in their order.
+
+        Rows are taken from the payload cache (boards_app.payload_cache);
+        boards without a current cached row are loaded from `queryset` in
+        one query, serialized and cached. Boards deleted in the meantime
+        are skipped.
+        """
+        rows = payload_cache.get_rows(validators)
+        missing = [board_id for board_id, _, _ in validators if board_id not in rows]
+        if missing:
+            boards = list(queryset.filter(pk__in=missing))
+            payloads = self.get_serializer(boards, many=True).data
+            payload_cache.set_rows(boards, payloads)
+            rows.update((board.pk, payload) for board, payload in zip(boards, payloads))
+        return [rows[board_id] for board_id, _, _ in validators if board_id in rows]
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Return a board detail, or answer 304 if the board did not change.
+
+        Version and updated_at of the board are read in one indexed,
+        access-scoped query. They are the validators of the conditional
+        GET and select the payload cache entry (boards_app.payload_cache),
+        so an unchanged board costs this one query: a 304 for clients
+        that have it, the cached payload for everyone else. Otherwise the
+        board is loaded and serialized (get_detail_queryset) and cached.
+        Unknown or foreign boards continue to the regular 404, malformed
+        IDs get it right away.
+        """
+        board_id = lookup_id(kwargs[self.lookup_field])
+        validators = versions.board_validators(board_id, request.user)
+        if validators is not None:
+            version, updated_at = validators
+            etag = make_etag("board", board_id, version)
+            response = conditional_response(request, etag, updated_at)
+            if response is not None:
+                return response
+            payload = payload_cache.get_payload(
+                payload_cache.DETAIL, board_id, version, updated_at
+            )
+            if payload is not None:
+                return set_validators(Response(payload), etag, updated_at)
+
+        board = self.get_object()
+        payload = self.get_serializer(board).data
+        payload_cache.set_payload(payload_cache.DETAIL, board, payload)
+        return set_validators(
+            Response(payload), make_etag("board", board.pk, board.version), board.updated_at
+        )
+
+    @staticmethod
+    def get_detail_queryset(queryset):
+        """
+        Query plan for BoardDetailSerializer.
+
+        A board detail is loaded in exactly BOARD_DETAIL_QUERIES (3) queries,
+        independent of the number of members and tasks:
+        1) the board itself (owner_id is read from the FK column)
+        2) all members (prefetch)
+        3) all tasks joined with their assignee and reviewer (prefetch)
+
+        comments_count is a stored column on Task, so no per-task count
+        is needed. Authentication and the version lookup of retrieve()
+        are not included in this budget.
+        """
+        tasks = Task.objects.select_related("assignee", "reviewer").order_by("pk")
+        return queryset.prefetch_related(
+            "members",
+            Prefetch("tasks", queryset=tasks),
+        )
     
     def get_serializer_class(self):
         """
@@ -90,3 +237,117 @@ class BoardsViewSet(viewsets.ModelViewSet):
         is not expected to be provided by the client.
         """
         serializer.save(owner=self.request.user)
+
+    @action(detail=False, methods=["get"], url_path="export")
+    def export_all(self, request):
+        """
+        Export all boards of the user with their tasks and comments.
+
+        Endpoint:
+          GET /boards/export/?type=ndjson|csv
+
+        Streams the boards as JSON Lines (default) or CSV, see
+        boards_app.export.
+        """
+        board_ids = sorted(membership.accessible_board_ids(request.user))
+        return self.export_response(board_ids, "boards")
+
+    @action(detail=True, methods=["get"], url_path="export")
+    def export(self, request, pk=None):
+        """
+        Export one board with its tasks and comments.
+
+        Endpoint:
+          GET /boards/{id}/export/?type=ndjson|csv
+
+        Unknown or foreign boards get 404 (see get_queryset()).
+        """
+        board = self.get_object()
+        return self.export_response([board.pk], f"board-{board.pk}")
+
+    def export_response(self, board_ids, filename):
+        """
+        Stream the export of the given boards as an attachment.
+
+        Query parameters:
+        - type: "ndjson" (default) or "csv"; anything else is a 400.
+        """
+        export_format = self.request.query_params.get("type", "ndjson")
+        if export_format not in export.FORMATS:
+            raise ValidationError({"type": [f"Choose one of: {', '.join(export.FORMATS)}."]})
+        parts = export.render(export.export_records(board_ids), export_format)
+        response = streaming.streaming_response(
+            self.request, parts, content_type=export.CONTENT_TYPES[export_format]
+        )
+        response["Content-Disposition"] = f'attachment; filename="{filename}.{export_format}"'
+        return response
+
+    @action(detail=False, methods=["post"], url_path="import")
+    def import_boards(self, request):
+        """
+        Import boards with their tasks and comments as new boards of the
+        user.
+
+        Endpoint:
+          POST /boards/import/?type=ndjson|csv
+
+        Request body:
+          The raw JSON Lines (default) or CSV file, in the format of the
+          export, see boards_app.importer. The body is read line by line.
+          Comments are imported as written by the user, whatever their
+          author in the file.
+
+        Returns:
+          200 with the summary of boards_app.importer.BoardImport.run()
+          and `error_rows`: the first IMPORT_MAX_ERROR_ROWS skipped rows
+          as {"line", "type", "errors"}.
+        """
+        import_format = request.query_params.get("type", "ndjson")
+        if import_format not in importer.FORMATS:
+            raise ValidationError({"type": [f"Choose one of: {', '.join(importer.FORMATS)}."]})
+        error_rows = []
+
+        def collect(error):
+            if len(error_rows) < IMPORT_MAX_ERROR_ROWS:
+                error_rows.append(error)
+
+        summary = importer.import_rows(
+            request.user, request._request, import_format, on_error=collect
+        )
+        return Response({**summary, "error_rows": error_rows})
+
+    @action(detail=False, methods=["get"], url_path="sync")
+    def sync(self, request):
+        """
+        Return the changes of the user's boards since a cursor.
+
+        Query parameters:
+        - since: Cursor returned by the previous sync. Without it (or
+          with a cursor older than the last pruned tombstone of one of
+          the boards) all rows are returned and `full` is true.
+
+        Response:
+        - cursor: Pass as `since` to the next sync.
+        - full: Whether the response replaces the client's state.
+        - board_ids: All boards the user can access.
+        - boards, tasks, comments: Rows changed since the cursor.
+        - deleted: IDs of deleted tasks and comments, to apply first.
+
+        One indexed query per kind, see boards_app.sync.
+        """
+        since = request.query_params.get("since")
+        if since is not None:
+            try:
+                since = sync.decode_cursor(since)
+            except (ValueError, OverflowError):
+                raise ValidationError({"since": ["Invalid cursor."]})
+        changes = sync.changes_since(request.user, since)
+        return Response({
+            "cursor": changes["cursor"],
+            "full": changes["full"],
+            "board_ids": changes["board_ids"],
+            "boards": SyncBoardSerializer(changes["boards"], many=True).data,
+            "tasks": TasksSerializer(changes["tasks"], many=True).data,
+            "comments": SyncCommentSerializer(changes["comments"], many=True).data,
+            "deleted": changes["deleted"],
+        })
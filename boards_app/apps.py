@@ -3,3 +3,9 @@ from django.apps import AppConfig
 
 class BoardsAppConfig(AppConfig):
     name = 'boards_app'
+
+    def ready(self):
+        """
+        Connect the signal handlers of this app.
+        """
+        from . import signals  # noqa: F401
@@ -0,0 +1,169 @@
+"""
+Maintenance of the denormalized counters stored on `Boards`.
+
+The counters are updated incrementally with F() expressions whenever a
+task is written, and recomputed from the source tables when membership
+changes or when a full rebuild is requested.
+"""
+
+from collections import defaultdict
+
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from boards_app.models import Boards
+from boards_app.versions import version_bump
+from tasks_app.models import Task
+
+COUNTER_FIELDS = (
+    "member_count",
+    "ticket_count",
+    "tasks_to_do_count",
+    "tasks_high_prio_count",
+)
+
+
+def _task_counter_increments(status, priority):
+    """
+    Return the counter fields a task with the given status/priority counts towards.
+    """
+    fields = ["ticket_count"]
+    if status == Task.Status.TODO:
+        fields.append("tasks_to_do_count")
+    if priority == Task.Priority.HIGH:
+        fields.append("tasks_high_prio_count")
+    return fields
+
+
+def apply_task_change(old_state, new_state):
+    """
+    Adjust board counters and versions for a single task write.
+
+    Args:
+        old_state: (board_id, status, priority) before the write,
+            or None if the task did not exist.
+        new_state: (board_id, status, priority) after the write,
+            or None if the task was deleted.
+
+    The board of each state is updated with a single UPDATE that applies
+    the counter deltas (F() expressions) and bumps its version (see
+    boards_app.versions), also when no counter changes.
+    """
+    deltas = defaultdict(lambda: defaultdict(int))
+    if old_state is not None:
+        board_id, status, priority = old_state
+        for field in _task_counter_increments(status, priority):
+            deltas[board_id][field] -= 1
+    if new_state is not None:
+        board_id, status, priority = new_state
+        for field in _task_counter_increments(status, priority):
+            deltas[board_id][field] += 1
+
+    for board_id, fields in deltas.items():
+        changes = {
+            field: F(field) + delta
+            for field, delta in fields.items()
+            if delta
+        }
+        Boards.objects.filter(pk=board_id).update(**changes, **version_bump())
+
+
+def _count_subquery(queryset):
+    """
+    Wrap a per-board COUNT queryset into a correlated subquery defaulting to 0.
+    """
+    counted = (
+        queryset.order_by()
+        .values("board")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    return Coalesce(
+        Subquery(counted, output_field=IntegerField()),
+        Value(0),
+    )
+
+
+def _member_count_subquery():
+    through = Boards.members.through
+    counted = (
+        through.objects.filter(boards=OuterRef("pk"))
+        .order_by()
+        .values("boards")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    return Coalesce(
+        Subquery(counted, output_field=IntegerField()),
+        Value(0),
+    )
+
+
+def counter_expressions():
+    """
+    Return expressions computing every counter from the source tables.
+    """
+    tasks = Task.objects.filter(board=OuterRef("pk"))
+    return {
+        "member_count": _member_count_subquery(),
+        "ticket_count": _count_subquery(tasks),
+        "tasks_to_do_count": _count_subquery(
+            tasks.filter(status=Task.Status.TODO)
+        ),
+        "tasks_high_prio_count": _count_subquery(
+            tasks.filter(priority=Task.Priority.HIGH)
+        ),
+    }
+
+
+def refresh_member_count(board_ids):
+    """
+    Recompute member_count for the given boards and bump their versions.
+    """
+    board_ids = list(board_ids or [])
+    if board_ids:
+        Boards.objects.filter(pk__in=board_ids).update(
+            member_count=_member_count_subquery(),
+            **version_bump(),
+        )
+
+
+def rebuild_counters(board_ids=None):
+    """
+    Recompute all counters from the source tables.
+
+    Args:
+        board_ids: Optional iterable of board IDs. All boards if omitted.
+
+    Returns:
+        int: Number of boards updated.
+    """
+    queryset = Boards.objects.all()
+    if board_ids is not None:
+        queryset = queryset.filter(pk__in=list(board_ids))
+    return queryset.update(**counter_expressions())
+
+
+def find_counter_drift(board_ids=None):
+    """
+    Compare stored counters with the values computed from the source tables.
+
+    Returns:
+        list[dict]: One entry per out-of-sync board with the board id and
+        a mapping of field -> (stored, expected).
+    """
+    expected = {f"expected_{name}": expr for name, expr in counter_expressions().items()}
+    queryset = Boards.objects.annotate(**expected)
+    if board_ids is not None:
+        queryset = queryset.filter(pk__in=list(board_ids))
+
+    drift = []
+    for row in queryset.values("pk", *COUNTER_FIELDS, *expected).order_by("pk"):
+        fields = {
+            name: (row[name], row[f"expected_{name}"])
+            for name in COUNTER_FIELDS
+            if row[name] != row[f"expected_{name}"]
+        }
+        if fields:
+            drift.append({"board_id": row["pk"], "fields": fields})
+    return drift
@@ -0,0 +1,162 @@
+"""
+Board change events and the pub/sub broker that delivers them.
+
+The signal receivers of boards_app and tasks_app call publish() for
+every change of a board, its members, tasks or comments. Events are
+handed to the broker when the surrounding transaction commits, so
+subscribers never see changes that are rolled back. Subscribers are the
+push channels of boards_app.realtime (Server-Sent Events and WebSocket),
+one subscription per open connection.
+
+The broker is configured with KANMIND_EVENT_BROKER (import path of a
+class with publish(), subscribe() and unsubscribe()). The default
+InProcessBroker delivers events within the current process only; with
+several server processes, configure a broker backed by a shared message
+bus.
+
+Events are small dicts: `{"type": ..., "board": <id>, ...}` with the IDs
+of the changed rows; clients load the rows themselves, e.g. with the
+delta sync (boards_app.sync).
+"""
+
+import asyncio
+import threading
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+DEFAULT_BROKER = "boards_app.events.InProcessBroker"
+
+# Events buffered per subscription. A subscriber that falls further
+# behind loses the buffered events and gets a single "resync" event.
+QUEUE_SIZE = 100
+
+# Event types.
+BOARD_UPDATED = "board.updated"
+BOARD_DELETED = "board.deleted"
+MEMBERS_CHANGED = "members.changed"
+TASK_CREATED = "task.created"
+TASK_UPDATED = "task.updated"
+TASK_DELETED = "task.deleted"
+TASKS_CHANGED = "tasks.changed"
+COMMENT_CREATED = "comment.created"
+COMMENT_UPDATED = "comment.updated"
+COMMENT_DELETED = "comment.deleted"
+# Sent by the push channels once they receive events; changes before it
+# are not delivered, clients catch up with a delta sync.
+SUBSCRIBED = "subscribed"
+# Replaces events dropped for a subscriber that fell behind.
+RESYNC = "resync"
+
+
+class Subscription:
+    """
+    Events of a set of boards for one consumer on an asyncio event loop.
+
+    Created by the broker from within the loop (see subscribe()); the
+    broker delivers events from any thread through the loop.
+    """
+
+    def __init__(self, board_ids):
+        self.board_ids = frozenset(board_ids)
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(QUEUE_SIZE)
+
+    def deliver(self, event):
+        """
+        Queue an event; must run in the subscription's loop.
+        """
+        if self.queue.full():
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            event = {"type": RESYNC, "board": event["board"]}
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout=None):
+        """
+        Return the next event, or None if none arrived within `timeout`.
+        """
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+def _deliver_all(subscriptions, event):
+    for subscription in subscriptions:
+        subscription.deliver(event)
+
+
+class InProcessBroker:
+    """
+    Pub/sub within the current process.
+
+    Subscriptions are kept per board. publish() is safe to call from
+    any thread and schedules one delivery callback per event loop, so
+    fanning out to thousands of idle subscribers is a single loop
+    iteration.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = {}
+
+    def subscribe(self, board_ids):
+        """
+        Start receiving the events of the given boards.
+
+        Must be called from the consumer's event loop.
+        """
+        subscription = Subscription(board_ids)
+        with self._lock:
+            for board_id in subscription.board_ids:
+                self._subscriptions.setdefault(board_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            for board_id in subscription.board_ids:
+                subscribers = self._subscriptions.get(board_id)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._subscriptions[board_id]
+
+    def publish(self, event):
+        with self._lock:
+            subscribers = list(self._subscriptions.get(event["board"], ()))
+        by_loop = {}
+        for subscription in subscribers:
+            by_loop.setdefault(subscription.loop, []).append(subscription)
+        for loop, subscriptions in by_loop.items():
+            try:
+                loop.call_soon_threadsafe(_deliver_all, subscriptions, event)
+            except RuntimeError:
+                # The loop was closed; its subscriptions are gone.
+                pass
+
+    def subscriber_count(self):
+        with self._lock:
+            return len(set().union(*self._subscriptions.values()))
+
+
+@lru_cache(maxsize=None)
+def get_broker():
+    """
+    Return the configured broker (KANMIND_EVENT_BROKER), one per process.
+    """
+    return import_string(getattr(settings, "KANMIND_EVENT_BROKER", DEFAULT_BROKER))()
+
+
+def publish(board_id, event_type, **data):
+    """
+    Publish an event of a board once the current transaction commits.
+
+    Outside of a transaction the event is published right away.
+    """
+    if board_id is None:
+        return
+    event = {"type": event_type, "board": board_id, **data}
+    transaction.on_commit(lambda: get_broker().publish(event))
@@ -0,0 +1,185 @@
+"""
+Streaming export of whole boards with their tasks and comments.
+
+Boards are exported as records: every board is followed by its tasks
+(ordered by ID), every task by its comments. Records use the
+representations of the delta sync (SyncBoardSerializer with members,
+TasksSerializer with assignee and reviewer, SyncCommentSerializer), so
+clients can parse both with the same code.
+
+Formats:
+- "ndjson": one JSON object per line, with a "type" key ("board",
+  "task" or "comment") and the fields of the record.
+- "csv": one row per task and per comment, with CSV_COLUMNS. Board
+  columns are repeated on every row; members are not part of the CSV.
+
+Boards and tasks are read with chunked QuerySet.iterator() queries.
+Members are prefetched per chunk of boards, assignees and reviewers are
+joined, and comments are read with one query per chunk of tasks. Memory use
+therefore depends on the chunk size, not on the size of the boards. The
+export is not a snapshot: rows changed while it runs may show either
+state.
+"""
+
+import csv
+from collections import defaultdict
+from itertools import islice
+
+from rest_framework.utils.encoders import JSONEncoder
+
+from boards_app.api.serializers import SyncBoardSerializer
+from boards_app.models import Boards
+from core.streaming import chunked
+from tasks_app.api.serializers import SyncCommentSerializer, TasksSerializer
+
+FORMATS = ("ndjson", "csv")
+
+CONTENT_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+# Rows per query chunk and per block of output.
+DEFAULT_CHUNK_SIZE = 2000
+
+CSV_COLUMNS = [
+    "type",
+    "board_id",
+    "board_title",
+    "task_id",
+    "title",
+    "description",
+    "status",
+    "priority",
+    "due_date",
+    "assignee_id",
+    "assignee_email",
+    "assignee_fullname",
+    "reviewer_id",
+    "reviewer_email",
+    "reviewer_fullname",
+    "comments_count",
+    "comment_id",
+    "comment_created_at",
+    "comment_author",
+    "comment_content",
+]
+
+
+def export_records(board_ids, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yield the records of the given boards as (type, data) pairs.
+
+    Args:
+        board_ids: IDs of the boards to export; unknown IDs are skipped.
+        chunk_size: Rows per query chunk.
+
+    Yields:
+        tuple: ("board", data), then ("task", data) per task of the
+        board, each followed by ("comment", data) per comment.
+    """
+    boards = (
+        Boards.objects.filter(pk__in=board_ids)
+        .prefetch_related("members")
+        .order_by("pk")
+        .iterator(chunk_size=chunk_size)
+    )
+    for board in boards:
+        yield "board", SyncBoardSerializer(board).data
+        yield from _task_records(board, chunk_size)
+
+
+def _task_records(board, chunk_size):
+    from tasks_app.models import Comment, Task
+
+    tasks = (
+        Task.objects.filter(board=board)
+        .select_related("assignee", "reviewer")
+        .order_by("pk")
+        .iterator(chunk_size=chunk_size)
+    )
+    for chunk in chunked(tasks, chunk_size):
+        # One query per chunk, like prefetch_related("comments"), but
+        # without per-task querysets: those form reference cycles with
+        # the tasks, which are only freed by the cyclic GC.
+        comments = defaultdict(list)
+        for comment in (
+            Comment.objects.filter(task_id__in=[task.pk for task in chunk])
+            .select_related("author")
+            .order_by("pk")
+        ):
+            comments[comment.task_id].append(comment)
+        chunk_comments = [comment for task in chunk for comment in comments[task.pk]]
+        comment_data = iter(SyncCommentSerializer(chunk_comments, many=True).data)
+        for task, data in zip(chunk, TasksSerializer(chunk, many=True).data):
+            yield "task", data
+            for comment in islice(comment_data, len(comments[task.pk])):
+                yield "comment", comment
+
+
+class _Echo:
+    # File-like object for csv.writer that returns the written line.
+    def write(self, value):
+        return value
+
+
+def _ndjson_lines(records):
+    encoder = JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+    for record_type, data in records:
+        yield encoder.encode({"type": record_type, **data}) + "\n"
+
+
+def _user_columns(prefix, user):
+    user = user or {}
+    return {
+        f"{prefix}_id": user.get("id"),
+        f"{prefix}_email": user.get("email"),
+        f"{prefix}_fullname": user.get("fullname"),
+    }
+
+
+def _csv_lines(records):
+    writer = csv.DictWriter(_Echo(), CSV_COLUMNS)
+    yield writer.writeheader()
+    board = {}
+    for record_type, data in records:
+        if record_type == "board":
+            board = {"board_id": data["id"], "board_title": data["title"]}
+            continue
+        if record_type == "task":
+            yield writer.writerow({
+                "type": "task",
+                **board,
+                "task_id": data["id"],
+                "title": data["title"],
+                "description": data["description"],
+                "status": data["status"],
+                "priority": data["priority"],
+                "due_date": data["due_date"],
+                "comments_count": data["comments_count"],
+                **_user_columns("assignee", data["assignee"]),
+                **_user_columns("reviewer", data["reviewer"]),
+            })
+        else:
+            yield writer.writerow({
+                "type": "comment",
+                **board,
+                "task_id": data["task"],
+                "comment_id": data["id"],
+                "comment_created_at": data["created_at"],
+                "comment_author": data["author"],
+                "comment_content": data["content"],
+            })
+
+
+def render(records, export_format, block_size=DEFAULT_CHUNK_SIZE):
+    """
+    Render records in `export_format` (see FORMATS).
+
+    Yields:
+        str: Blocks of up to `block_size` complete lines (the CSV header
+        is part of the first block).
+    """
+    lines = _ndjson_lines(records) if export_format == "ndjson" else _csv_lines(records)
+    while block := "".join(islice(lines, block_size)):
+        yield block
@@ -0,0 +1,444 @@
+"""
+Bulk import of boards with their tasks and comments.
+
+Reads the formats written by boards_app.export:
+- "ndjson": one object per line with a "type" of "board", "task" or
+  "comment"; the fields are those of ImportBoardSerializer,
+  ImportTaskSerializer and ImportCommentSerializer.
+- "csv": rows with the CSV_COLUMNS of boards_app.export. The board of a
+  row is taken from its board columns.
+
+Rows reference each other by their IDs in the source: tasks their board,
+comments their task. Without a reference a row belongs to the preceding
+board or task row. Every imported board is a new board owned by the
+importing user, who is also a member; users are referenced by email.
+
+Rows are processed in batches. Every row of a batch is validated on its
+own (no queries, one serializer instance per row type), the users of all rows are resolved by email with one
+query (emails are cached across batches), and the boards, memberships,
+tasks and comments of the batch are written with one bulk_create each
+in one transaction, then stamped with the delta sync counters of their
+boards. bulk_create sends no signals, so the board counters and comment
+counts are computed once at the end (and stamped again) and the cached
+memberships of the members are invalidated, as in core.synthetic.
+
+Invalid rows are skipped and reported with their line number, as are
+rows referencing a skipped row. Comments get the date of the import as
+created_at. Their authors are only taken from the file with
+`keep_authors` (manage.py import_boards); the API imports every comment
+as written by the importing user, who could otherwise put words in any
+user's mouth.
+"""
+
+import codecs
+import csv
+import json
+import time
+from collections import Counter
+
+from django.db import DatabaseError, models, transaction
+from rest_framework.exceptions import ValidationError
+from rest_framework.serializers import as_serializer_error
+
+from boards_app import membership
+from boards_app.api.serializers import (
+    ImportBoardSerializer,
+    ImportCommentSerializer,
+    ImportTaskSerializer,
+)
+from boards_app.counters import rebuild_counters
+from boards_app.models import Boards
+from boards_app.versions import board_sync_seq, bump_board_versions
+from core.streaming import chunked
+from tasks_app.counters import comments_count_expression
+from tasks_app.models import Comment, Task
+from user_auth_app.emails import by_email
+
+FORMATS = ("ndjson", "csv")
+
+# Rows per batch (and transaction).
+DEFAULT_BATCH_SIZE = 1000
+
+SERIALIZERS = {
+    "board": ImportBoardSerializer,
+    "task": ImportTaskSerializer,
+    "comment": ImportCommentSerializer,
+}
+
+# Row type referenced by the rows of a type.
+PARENTS = {"task": "board", "comment": "task"}
+
+# Validated fields holding user emails, per row type.
+USER_FIELDS = {
+    "board": ("members",),
+    "task": ("assignee", "reviewer"),
+    "comment": ("author_email",),
+}
+
+TASK_FIELDS = ("title", "description", "status", "priority", "due_date")
+
+
+def _lines(lines):
+    # Byte lines of a file or request body to text (a BOM is dropped).
+    return codecs.iterdecode(lines, "utf-8-sig", errors="replace")
+
+
+def read_ndjson(lines):
+    """
+    Parse JSON Lines.
+
+    Args:
+        lines: Iterable of byte lines, e.g. a binary file or an HttpRequest.
+
+    Yields:
+        tuple: (line number, type, data). Unparsable lines have the type
+        None and the errors as data.
+    """
+    for number, line in enumerate(_lines(lines), 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield number, None, {"non_field_errors": ["Invalid JSON."]}
+            continue
+        if not isinstance(record, dict) or record.get("type") not in SERIALIZERS:
+            yield number, None, {"type": [f"Expected one of: {', '.join(SERIALIZERS)}."]}
+            continue
+        yield number, record.pop("type"), record
+
+
+def _present(data):
+    return {key: value for key, value in data.items() if value not in ("", None)}
+
+
+def read_csv(lines):
+    """
+    Parse CSV with the columns of boards_app.export.CSV_COLUMNS.
+
+    A board row is yielded before the first row of every board_id.
+
+    Yields:
+        tuple: (line number, type, data), see read_ndjson().
+    """
+    reader = csv.DictReader(_lines(lines))
+    board_ids = set()
+    for row in reader:
+        number = reader.line_num
+        row = _present({key: value for key, value in row.items() if isinstance(key, str)})
+        board_id = row.get("board_id")
+        if board_id is not None and board_id not in board_ids:
+            board_ids.add(board_id)
+            yield number, "board", _present({"id": board_id, "title": row.get("board_title")})
+        record_type = row.get("type")
+        if record_type == "task":
+            yield number, "task", _present({
+                "id": row.get("task_id"),
+                "board": board_id,
+                **{field: row.get(field) for field in TASK_FIELDS},
+                "assignee": row.get("assignee_email"),
+                "reviewer": row.get("reviewer_email"),
+            })
+        elif record_type == "comment":
+            yield number, "comment", _present({
+                "id": row.get("comment_id"),
+                "task": row.get("task_id"),
+                "content": row.get("comment_content"),
+                "author": row.get("comment_author"),
+            })
+        else:
+            yield number, None, {"type": ["Expected one of: task, comment."]}
+
+
+READERS = {"ndjson": read_ndjson, "csv": read_csv}
+
+
+def _source_key(data, line):
+    # Source ID of a row, or a key of its own for rows without one.
+    source_id = data.get("id") if isinstance(data, dict) else None
+    return str(source_id) if source_id not in (None, "") else f"#{line}"
+
+
+def _reference(name, target):
+    # FK keyword argument for a row of this batch (instance) or an earlier one (pk).
+    if isinstance(target, models.Model):
+        return {name: target}
+    return {f"{name}_id": target}
+
+
+class BoardImport:
+    """
+    Import rows (see read_ndjson()/read_csv()) as new boards of `owner`.
+
+    Args:
+        owner: User owning the boards and creating the tasks.
+        batch_size: Rows per batch and transaction.
+        on_error: Optional callable receiving every error as
+            {"line", "type", "errors"}.
+        keep_authors: Whether comments keep the author of the file
+            (resolved by email). Otherwise `owner` is the author of
+            every comment and author fields are ignored.
+    """
+
+    def __init__(self, owner, batch_size=DEFAULT_BATCH_SIZE, on_error=None, keep_authors=False):
+        self.owner = owner
+        self.batch_size = batch_size
+        self.on_error = on_error
+        self.keep_authors = keep_authors
+        self.user_fields = USER_FIELDS if keep_authors else {**USER_FIELDS, "comment": ()}
+        self.rows = 0
+        self.errors = 0
+        self.created = Counter()
+        # Source key -> primary key of the imported board/task.
+        self.imported = {"board": {}, "task": {}}
+        # (type, source key) -> line of a skipped board/task.
+        self.skipped = {}
+        # Source key of the preceding board/task row.
+        self.last = {"board": None, "task": None}
+        # Lower-cased email -> user ID, None for unknown emails.
+        self.user_ids = {}
+        self.member_ids = {owner.pk}
+        # One serializer per type validates all rows, like the child of a
+        # ListSerializer: a serializer per row would copy its fields per row.
+        self.serializers = {
+            record_type: serializer_class() for record_type, serializer_class in SERIALIZERS.items()
+        }
+
+    def run(self, rows):
+        """
+        Import all rows.
+
+        Counters are computed at the end, also if the import fails
+        midway: batches written until then stay imported.
+
+        Returns:
+            dict: rows, created ({"boards", "tasks", "comments"}),
+            errors, seconds and rows_per_second.
+        """
+        started = time.perf_counter()
+        try:
+            for batch in chunked(rows, self.batch_size):
+                self._import_batch(batch)
+        finally:
+            self._finish()
+        seconds = time.perf_counter() - started
+        return {
+            "rows": self.rows,
+            "created": {
+                "boards": self.created["board"],
+                "tasks": self.created["task"],
+                "comments": self.created["comment"],
+            },
+            "errors": self.errors,
+            "seconds": round(seconds, 3),
+            "rows_per_second": round(self.rows / seconds) if seconds else 0,
+        }
+
+    def _error(self, line, record_type, errors):
+        self.errors += 1
+        if self.on_error is not None:
+            self.on_error({"line": line, "type": record_type, "errors": errors})
+
+    def _skip(self, line, record_type, key, errors):
+        if record_type in self.last:
+            self.skipped[record_type, key] = line
+        self._error(line, record_type, errors)
+
+    def _validate(self, batch):
+        """
+        Validate the rows of a batch in order and resolve their references
+        to preceding rows.
+
+        Returns:
+            list: (line, type, source key, validated data, parent key).
+        """
+        valid = []
+        for line, record_type, data in batch:
+            if record_type is None:
+                self._error(line, None, data)
+                continue
+            key = _source_key(data, line)
+            parent_type = PARENTS.get(record_type)
+            try:
+                validated = self.serializers[record_type].run_validation(data)
+            except ValidationError as error:
+                validated, errors = None, as_serializer_error(error)
+            parent = None
+            if parent_type and validated is not None:
+                parent = validated.get(parent_type) or self.last[parent_type]
+            if record_type in self.last:
+                self.last[record_type] = key
+            if validated is None:
+                self._skip(line, record_type, key, errors)
+                continue
+            valid.append((line, record_type, key, validated, parent))
+        return valid
+
+    def _resolve_users(self, valid):
+        """
+        Look up the unknown emails of the validated rows with one query.
+        """
+        emails = set()
+        for _, record_type, _, data, _ in valid:
+            for field in self.user_fields[record_type]:
+                value = data.get(field)
+                emails.update(value if isinstance(value, list) else [value])
+        emails = {email for email in emails if email and email not in self.user_ids}
+        if not emails:
+            return
+        self.user_ids.update(dict.fromkeys(emails))
+        # Emails are unique in any case (see user_auth_app.emails).
+        self.user_ids.update(by_email(emails).values_list("email_key", "pk"))
+
+    def _user_errors(self, record_type, data):
+        errors = {}
+        for field in self.user_fields[record_type]:
+            value = data.get(field)
+            unknown = [
+                email
+                for email in (value if isinstance(value, list) else [value])
+                if email and self.user_ids.get(email) is None
+            ]
+            if unknown:
+                errors[field] = [f'Unknown user "{email}".' for email in unknown]
+        return errors
+
+    def _parent(self, parent_type, key, pending):
+        """
+        Return (board/task instance or pk, None) for a referenced row,
+        or (None, errors).
+        """
+        if key in pending[parent_type]:
+            return pending[parent_type][key], None
+        if key in self.imported[parent_type]:
+            return self.imported[parent_type][key], None
+        if key is None:
+            return None, {parent_type: [f"No {parent_type} before this row."]}
+        if (parent_type, key) in self.skipped:
+            line = self.skipped[parent_type, key]
+            return None, {parent_type: [f"The {parent_type} of line {line} was not imported."]}
+        return None, {parent_type: [f'Unknown {parent_type} "{key}".']}
+
+    def _import_batch(self, batch):
+        self.rows += len(batch)
+        valid = self._validate(batch)
+        self._resolve_users(valid)
+
+        user_ids = self.user_ids
+        pending = {"board": {}, "task": {}}
+        boards, memberships, tasks, comments, written = [], [], [], [], []
+        for line, record_type, key, data, parent in valid:
+            errors = self._user_errors(record_type, data)
+            target = None
+            if record_type in PARENTS:
+                target, parent_errors = self._parent(PARENTS[record_type], parent, pending)
+                errors.update(parent_errors or {})
+            if errors:
+                self._skip(line, record_type, key, errors)
+                continue
+
+            if record_type == "board":
+                board = Boards(title=data.get("title"), owner=self.owner)
+                members = [user_ids[email] for email in data.get("members", []) if email]
+                member_ids = {self.owner.pk, *members}
+                boards.append(board)
+                memberships.append((board, member_ids))
+                pending["board"][key] = board
+            elif record_type == "task":
+                task = Task(
+                    created_by=self.owner,
+                    assignee_id=user_ids.get(data.get("assignee")),
+                    reviewer_id=user_ids.get(data.get("reviewer")),
+                    **{field: data[field] for field in TASK_FIELDS if field in data},
+                    **_reference("board", target),
+                )
+                tasks.append(task)
+                pending["task"][key] = task
+            else:
+                author_id = user_ids.get(data.get("author_email")) if self.keep_authors else None
+                comments.append(Comment(
+                    content=data.get("content", ""),
+                    author_id=author_id or self.owner.pk,
+                    **_reference("task", target),
+                ))
+            written.append((line, record_type, key))
+
+        through = Boards.members.through
+        try:
+            with transaction.atomic():
+                Boards.objects.bulk_create(boards)
+                through.objects.bulk_create(
+                    through(boards_id=board.pk, user_id=user_id)
+                    for board, member_ids in memberships
+                    for user_id in member_ids
+                )
+                Task.objects.bulk_create(tasks)
+                Comment.objects.bulk_create(comments)
+                self._stamp(tasks, comments)
+        except DatabaseError as error:
+            for line, record_type, key in written:
+                self._skip(line, record_type, key, {"non_field_errors": [f"Not saved: {error}"]})
+            return
+
+        for record_type, instances in pending.items():
+            self.imported[record_type].update((key, obj.pk) for key, obj in instances.items())
+        for _, member_ids in memberships:
+            self.member_ids |= member_ids
+        self.created.update(record_type for _, record_type, _ in written)
+
+    def _stamp(self, tasks, comments):
+        """
+        Stamp the tasks and comments of a batch for delta sync
+        (boards_app.sync): increment the counters of their boards (also
+        of boards imported by earlier batches) and copy them to the rows.
+        """
+        task_ids = [task.pk for task in tasks]
+        comment_ids = [comment.pk for comment in comments]
+        comment_task_ids = {comment.task_id for comment in comments}
+        Boards.objects.filter(
+            models.Q(pk__in={task.board_id for task in tasks})
+            | models.Q(pk__in=Task.objects.filter(pk__in=comment_task_ids).values("board_id"))
+        ).update(sync_seq=models.F("sync_seq") + 1)
+        if task_ids:
+            Task.objects.filter(pk__in=task_ids).update(sync_seq=board_sync_seq())
+        if comment_ids:
+            Comment.objects.filter(pk__in=comment_ids).update(
+                sync_seq=board_sync_seq("task_id", "tasks")
+            )
+
+    def _finish(self):
+        """
+        Compute the counters of the imported boards and tasks.
+        """
+        board_ids = set(self.imported["board"].values())
+        if board_ids:
+            with transaction.atomic():
+                rebuild_counters(board_ids)
+                bump_board_versions(board_ids)
+                Task.objects.filter(board_id__in=board_ids).update(
+                    comments_count=comments_count_expression(), sync_seq=board_sync_seq()
+                )
+        membership.invalidate(self.member_ids)
+
+
+def import_rows(
+    owner, lines, import_format, batch_size=DEFAULT_BATCH_SIZE, on_error=None, keep_authors=False
+):
+    """
+    Import a JSON Lines or CSV file of `import_format` (see FORMATS).
+
+    Args:
+        owner: User owning the imported boards.
+        lines: Iterable of byte lines.
+        import_format: "ndjson" or "csv".
+        batch_size: Rows per batch and transaction.
+        on_error: Optional callable receiving every error row.
+        keep_authors: See BoardImport.
+
+    Returns:
+        dict: Summary, see BoardImport.run().
+    """
+    importer = BoardImport(
+        owner, batch_size=batch_size, on_error=on_error, keep_authors=keep_authors
+    )
+    return importer.run(READERS[import_format](lines))
@@ -0,0 +1,88 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from boards_app import importer
+from user_auth_app.emails import find_user
+
+
+class Command(BaseCommand):
+    """
+    Import boards with their tasks and comments from JSON Lines or CSV.
+
+    The file is read in the format of export_boards (see
+    boards_app.importer). All boards are created as new boards of the
+    given owner. Unlike the API, comments keep their authors, resolved by
+    email. Skipped rows can be written to an error file, one JSON object
+    per line with the line number and the errors.
+
+    Usage:
+        python manage.py import_boards boards.ndjson --owner me@example.com
+        python manage.py import_boards tasks.csv --type csv --owner me@example.com --errors errors.ndjson
+    """
+
+    help = "Import boards with their tasks and comments from JSON Lines or CSV."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import.")
+        parser.add_argument(
+            "--owner",
+            required=True,
+            help="Email of the user owning the imported boards.",
+        )
+        parser.add_argument(
+            "--type",
+            choices=importer.FORMATS,
+            default="ndjson",
+            help="Input format (default: ndjson).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=importer.DEFAULT_BATCH_SIZE,
+            help=f"Rows per batch and transaction (default: {importer.DEFAULT_BATCH_SIZE}).",
+        )
+        parser.add_argument(
+            "--errors",
+            help="Write skipped rows to this file (JSON Lines).",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive.")
+        owner = find_user(options["owner"])
+        if owner is None:
+            raise CommandError(f"No user with the email {options['owner']}.")
+
+        try:
+            source = open(options["path"], "rb")
+        except OSError as error:
+            raise CommandError(str(error))
+        error_file = open(options["errors"], "w", encoding="utf-8") if options["errors"] else None
+
+        def write_error(error):
+            if error_file is not None:
+                error_file.write(json.dumps(error) + "\n")
+
+        try:
+            summary = importer.import_rows(
+                owner,
+                source,
+                options["type"],
+                options["batch_size"],
+                on_error=write_error,
+                keep_authors=True,
+            )
+        finally:
+            source.close()
+            if error_file is not None:
+                error_file.close()
+
+        created = summary["created"]
+        message = (
+            f"Imported {created['boards']} board(s), {created['tasks']} task(s), "
+            f"{created['comments']} comment(s) from {summary['rows']} row(s) "
+            f"in {summary['seconds']:.1f}s ({summary['rows_per_second']} rows/s)."
+        )
+        self.stdout.write(self.style.SUCCESS(message))
+        if summary["errors"]:
+            self.stderr.write(f"Skipped {summary['errors']} row(s).")
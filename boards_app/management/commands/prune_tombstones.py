@@ -0,0 +1,51 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F, Max, OuterRef, Subquery
+from django.db.models.functions import Greatest
+from django.utils import timezone
+from boards_app.models import Boards, Tombstone
+from boards_app.sync import tombstone_retention
+
+
+class Command(BaseCommand):
+    """
+    Delete tombstones older than the delta sync retention.
+
+    The highest sync_seq of the deleted tombstones of each board is
+    recorded in Boards.sync_pruned: clients whose cursor is older get a
+    full sync (see boards_app.sync), so older tombstones are no longer
+    needed.
+
+    Usage:
+        python manage.py prune_tombstones              # KANMIND_SYNC_TOMBSTONE_DAYS
+        python manage.py prune_tombstones --days 7     # explicit retention
+    """
+
+    help = "Delete tombstones older than the delta sync retention."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            help="Retention in days (default: KANMIND_SYNC_TOMBSTONE_DAYS).",
+        )
+
+    def handle(self, *args, **options):
+        retention = tombstone_retention()
+        if options["days"] is not None:
+            retention = timedelta(days=options["days"])
+        expired = Tombstone.objects.filter(deleted_at__lt=timezone.now() - retention)
+        last = (
+            expired.filter(board_id=OuterRef("pk"))
+            .values("board_id")
+            .annotate(last=Max("sync_seq"))
+            .values("last")
+        )
+        with transaction.atomic():
+            Boards.objects.filter(pk__in=expired.values("board_id")).update(
+                sync_pruned=Greatest(F("sync_pruned"), Subquery(last))
+            )
+            deleted, _ = expired.delete()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} tombstone(s)."))
@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from boards_app.counters import find_counter_drift, rebuild_counters
+
+
+class Command(BaseCommand):
+    """
+    Verify and rebuild the denormalized counters stored on Boards.
+
+    Usage:
+        python manage.py rebuild_board_counters            # rebuild all boards
+        python manage.py rebuild_board_counters 3 7        # rebuild selected boards
+        python manage.py rebuild_board_counters --check    # only report drift
+    """
+
+    help = "Verify and rebuild member/task counters stored on boards."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "board_ids",
+            nargs="*",
+            type=int,
+            help="Restrict the run to these board IDs.",
+        )
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only verify the counters and fail if any board is out of sync.",
+        )
+
+    def handle(self, *args, **options):
+        board_ids = options["board_ids"] or None
+        drift = find_counter_drift(board_ids)
+
+        for entry in drift:
+            details = ", ".join(
+                f"{field}: stored={stored} expected={expected}"
+                for field, (stored, expected) in entry["fields"].items()
+            )
+            self.stdout.write(f"Board {entry['board_id']}: {details}")
+
+        if options["check"]:
+            if drift:
+                raise CommandError(f"{len(drift)} board(s) have out-of-sync counters.")
+            self.stdout.write(self.style.SUCCESS("All board counters are in sync."))
+            return
+
+        with transaction.atomic():
+            updated = rebuild_counters(board_ids)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt counters for {updated} board(s), {len(drift)} were out of sync."
+            )
+        )
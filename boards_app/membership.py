@@ -0,0 +1,127 @@
+"""
+Cached board membership.
+
+The IDs of the boards a user owns or is a member of are stored per user
+in the "membership" cache (a local-memory cache, see CACHES in
+core.settings). Entries expire after the cache TIMEOUT and the least
+recently used entries are evicted once MAX_ENTRIES is reached.
+
+Entries are invalidated by boards_app.signals whenever the members of a
+board change or a board gets a new owner, again after the change
+commits. Writes that bypass signals (bulk_create on the membership
+table, raw SQL) must call invalidate() themselves, see core.synthetic.
+
+A local-memory cache is per process: changes made in one process are seen
+by other processes after TIMEOUT at the latest. Point the alias at a shared
+backend to invalidate across processes.
+"""
+
+from django.core.cache import caches
+from django.db import transaction
+
+CACHE_ALIAS = "membership"
+KEY_PREFIX = "board-ids"
+
+
+def _cache():
+    return caches[CACHE_ALIAS]
+
+
+def _key(user_id):
+    return f"{KEY_PREFIX}:{user_id}"
+
+
+def accessible_board_ids(user):
+    """
+    Return the IDs of the boards `user` owns or is a member of.
+
+    Args:
+        user: The requesting user.
+
+    Returns:
+        frozenset: Board IDs; loaded with one query on a cache miss.
+    """
+    if not user.is_authenticated:
+        return frozenset()
+    cache = _cache()
+    key = _key(user.pk)
+    board_ids = cache.get(key)
+    if board_ids is None:
+        from boards_app.models import Boards
+
+        board_ids = frozenset(
+            Boards.objects.accessible_to(user).values_list("pk", flat=True)
+        )
+        cache.set(key, board_ids)
+    return board_ids
+
+
+def can_access(user, board_id):
+    """
+    Return True if `user` owns or is a member of the board `board_id`.
+
+    Unknown boards and malformed IDs are not accessible.
+    """
+    try:
+        board_id = int(board_id)
+    except (TypeError, ValueError):
+        return False
+    return board_id in accessible_board_ids(user)
+
+
+async def aaccessible_board_ids(user):
+    """
+    Async variant of accessible_board_ids().
+
+    The local-memory cache does no I/O and is read directly; misses are
+    loaded with the async ORM.
+    """
+    if not user.is_authenticated:
+        return frozenset()
+    cache = _cache()
+    key = _key(user.pk)
+    board_ids = cache.get(key)
+    if board_ids is None:
+        from boards_app.models import Boards
+
+        board_ids = frozenset([
+            board_id
+            async for board_id in Boards.objects.accessible_to(user).values_list("pk", flat=True)
+        ])
+        cache.set(key, board_ids)
+    return board_ids
+
+
+async def acan_access(user, board_id):
+    """
+    Async variant of can_access().
+    """
+    try:
+        board_id = int(board_id)
+    except (TypeError, ValueError):
+        return False
+    return board_id in await aaccessible_board_ids(user)
+
+
+def invalidate(user_ids):
+    """
+    Drop the cached board IDs of the given users, right away and again
+    once the current transaction commits.
+
+    Until then concurrent requests still read the previous membership and
+    may cache it; without the second delete that entry would be served
+    until it expires. The first one keeps the writing transaction from
+    reading its own stale entries.
+    """
+    keys = [_key(user_id) for user_id in user_ids if user_id is not None]
+    if keys:
+        _cache().delete_many(keys)
+        if transaction.get_connection().in_atomic_block:
+            transaction.on_commit(lambda: _cache().delete_many(keys))
+
+
+def clear():
+    """
+    Drop all cached memberships, e.g. after bulk changes or between tests.
+    """
+    _cache().clear()
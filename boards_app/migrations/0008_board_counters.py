@@ -0,0 +1,64 @@
+# Generated by Django 6.0 on 2026-10-18 19:00
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def _count(queryset, group_by):
+    counted = (
+        queryset.order_by()
+        .values(group_by)
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    return Coalesce(Subquery(counted, output_field=IntegerField()), Value(0))
+
+
+def fill_counters(apps, schema_editor):
+    """
+    Compute the initial counter values for existing boards.
+    """
+    Boards = apps.get_model("boards_app", "Boards")
+    Task = apps.get_model("tasks_app", "Task")
+    tasks = Task.objects.filter(board=OuterRef("pk"))
+    Boards.objects.update(
+        member_count=_count(
+            Boards.members.through.objects.filter(boards=OuterRef("pk")), "boards"
+        ),
+        ticket_count=_count(tasks, "board"),
+        tasks_to_do_count=_count(tasks.filter(status="to-do"), "board"),
+        tasks_high_prio_count=_count(tasks.filter(priority="high"), "board"),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards_app', '0007_alter_boards_members_alter_boards_owner_and_more'),
+        ('tasks_app', '0003_task_created_by_alter_task_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='boards',
+            name='member_count',
+            field=models.PositiveIntegerField(default=0, help_text='Cached number of board members.'),
+        ),
+        migrations.AddField(
+            model_name='boards',
+            name='tasks_high_prio_count',
+            field=models.PositiveIntegerField(default=0, help_text='Cached number of tasks with high priority.'),
+        ),
+        migrations.AddField(
+            model_name='boards',
+            name='tasks_to_do_count',
+            field=models.PositiveIntegerField(default=0, help_text='Cached number of tasks with status to-do.'),
+        ),
+        migrations.AddField(
+            model_name='boards',
+            name='ticket_count',
+            field=models.PositiveIntegerField(default=0, help_text='Cached number of tasks on the board.'),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 6.0 on 2026-10-18 19:32
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards_app', '0008_board_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='boards',
+            name='updated_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, help_text='Time of the last change of the board or its content.'),
+        ),
+        migrations.AddField(
+            model_name='boards',
+            name='version',
+            field=models.PositiveBigIntegerField(default=1, help_text='Incremented on every change of the board or its content.'),
+        ),
+    ]
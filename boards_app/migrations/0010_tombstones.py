@@ -0,0 +1,27 @@
+# Generated by Django 6.0 on 2026-10-18 21:04
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards_app', '0009_board_versions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('task', 'task'), ('comment', 'comment')], max_length=10)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('board_id', models.PositiveBigIntegerField()),
+                ('deleted_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['board_id', 'deleted_at'], name='tombstone_board_deleted_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 6.0 on 2026-10-19 00:20
+
+from django.db import migrations, models
+
+
+def create_clock(apps, schema_editor):
+    """
+    Create the single SyncClock row.
+
+    Existing rows keep sync_seq 0 and are part of every full sync;
+    cursors of the former timestamp format are ahead of the clock and
+    get a full sync as well.
+    """
+    apps.get_model("boards_app", "SyncClock").objects.using(schema_editor.connection.alias).create(pk=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards_app', '0010_tombstones'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncClock',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('value', models.PositiveBigIntegerField(default=0)),
+                ('pruned', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RemoveIndex(
+            model_name='tombstone',
+            name='tombstone_board_deleted_idx',
+        ),
+        migrations.AddField(
+            model_name='boards',
+            name='sync_seq',
+            field=models.PositiveBigIntegerField(default=0, help_text='Sync clock value of the last change of the board or its content.'),
+        ),
+        migrations.AddField(
+            model_name='tombstone',
+            name='sync_seq',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='tombstone',
+            index=models.Index(fields=['board_id', 'sync_seq'], name='tombstone_board_seq_idx'),
+        ),
+        migrations.RunPython(create_clock, migrations.RunPython.noop),
+    ]
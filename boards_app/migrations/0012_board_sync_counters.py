@@ -0,0 +1,41 @@
+# Generated by Django 6.0 on 2026-10-19 02:10
+
+from django.db import migrations, models
+
+
+def copy_pruned(apps, schema_editor):
+    """
+    Carry the pruned tombstones of the SyncClock over to every board.
+
+    Board counters continue from the clock values the rows were stamped
+    with: every change of a board also stamped the board, so its sync_seq
+    is the highest value of its rows.
+    """
+    using = schema_editor.connection.alias
+    clock = apps.get_model("boards_app", "SyncClock").objects.using(using).first()
+    if clock is not None and clock.pruned:
+        apps.get_model("boards_app", "Boards").objects.using(using).update(sync_pruned=clock.pruned)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards_app', '0011_sync_clock'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='boards',
+            name='sync_pruned',
+            field=models.PositiveBigIntegerField(default=0, help_text='Delta sync cursors of the board before this value get a full sync.'),
+        ),
+        migrations.AlterField(
+            model_name='boards',
+            name='sync_seq',
+            field=models.PositiveBigIntegerField(default=0, help_text='Incremented on every change of the board or its content, for delta sync.'),
+        ),
+        migrations.RunPython(copy_pruned, migrations.RunPython.noop),
+        migrations.DeleteModel(
+            name='SyncClock',
+        ),
+    ]
@@ -1,5 +1,69 @@
 from django.conf import settings
-from django.db import models
+from django.core.exceptions import EmptyResultSet
+from django.db import connections, models
+from django.db.models import F, Q
+from django.utils import timezone
+
+
+def accessible_board_filter(user, field="pk"):
+    """
+    Build a filter matching the boards `user` owns or is a member of.
+
+    Args:
+        user: The requesting user.
+        field: Lookup path to the board primary key, e.g. "pk" for Boards
+            or "board" for Task.
+
+    Returns:
+        Q: `<field> IN (owned boards) OR <field> IN (member boards)`.
+        Both subqueries are answered from an index (owner_id and the
+        membership user_id), there is no join, so filtered querysets
+        return every row at most once.
+    """
+    owned = Boards.objects.filter(owner=user).values("pk")
+    joined = Boards.members.through.objects.filter(user=user).values("boards_id")
+    return Q(**{f"{field}__in": owned}) | Q(**{f"{field}__in": joined})
+
+
+class BoardsQuerySet(models.QuerySet):
+
+    def accessible_to(self, user):
+        """
+        Boards the user owns or is a member of.
+        """
+        return self.filter(accessible_board_filter(user))
+
+    def tick(self):
+        """
+        Increment the delta sync counter (`sync_seq`) of the boards.
+
+        Must run inside the transaction that writes the rows stamped with
+        the new values (see boards_app.sync): the board rows stay locked
+        until it ends, so the values of a board become visible in order.
+        Writes to other boards do not wait. One UPDATE ... RETURNING
+        where supported.
+
+        Returns:
+            dict: {board_id: new sync_seq}, without boards that do not
+            exist.
+        """
+        connection = connections[self.db]
+        pk = self.model._meta.pk.column
+        try:
+            subquery, params = self.values("pk").query.get_compiler(self.db).as_sql()
+        except EmptyResultSet:
+            return {}
+        if not connection.features.can_return_columns_from_insert:
+            self.update(sync_seq=F("sync_seq") + 1)
+            return dict(self.values_list("pk", "sync_seq"))
+        quote = connection.ops.quote_name
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {quote(self.model._meta.db_table)} SET sync_seq = sync_seq + 1 "
+                f"WHERE {quote(pk)} IN ({subquery}) RETURNING {quote(pk)}, sync_seq",
+                params,
+            )
+            return dict(cursor.fetchall())
 
 
 class Boards(models.Model):
@@ -36,12 +100,121 @@ class Boards(models.Model):
         help_text="Users who are members of this board."
     )
 
-    @property
-    def member_count(self) -> int:
+    # Denormalized counters, maintained by boards_app.counters.
+    # They are kept in sync on every task and membership change and can be
+    # rebuilt with `manage.py rebuild_board_counters`.
+    member_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Cached number of board members."
+    )
+
+    ticket_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Cached number of tasks on the board."
+    )
+
+    tasks_to_do_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Cached number of tasks with status to-do."
+    )
+
+    tasks_high_prio_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Cached number of tasks with high priority."
+    )
+
+    # Change tracking for conditional GETs, maintained by boards_app.versions.
+    # Bumped whenever the board, its members, tasks or comments change.
+    version = models.PositiveBigIntegerField(
+        default=1,
+        help_text="Incremented on every change of the board or its content."
+    )
+
+    updated_at = models.DateTimeField(
+        default=timezone.now,
+        help_text="Time of the last change of the board or its content."
+    )
+
+    # Delta sync counter, see BoardsQuerySet.tick() and boards_app.sync.
+    sync_seq = models.PositiveBigIntegerField(
+        default=0,
+        help_text="Incremented on every change of the board or its content, for delta sync."
+    )
+
+    # Highest sync_seq of the board's pruned tombstones (manage.py
+    # prune_tombstones): older cursors may miss deletions.
+    sync_pruned = models.PositiveBigIntegerField(
+        default=0,
+        help_text="Delta sync cursors of the board before this value get a full sync."
+    )
+
+    objects = BoardsQuerySet.as_manager()
+
+    def save(self, *args, **kwargs):
         """
-        Return the number of members assigned to this board.
+        Save the board, bumping its version when an existing board changes.
 
-        Returns:
-            int: Count of related users in the members relation.
+        The increments of the version and the delta sync counter are part
+        of the same UPDATE (F expressions); the new values are loaded
+        again only if they are accessed afterwards.
+        """
+        bump = not self._state.adding
+        if bump:
+            self.version = F("version") + 1
+            self.sync_seq = F("sync_seq") + 1
+            self.updated_at = timezone.now()
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "version", "updated_at", "sync_seq"}
+        super().save(*args, **kwargs)
+        if bump:
+            # Deferred: refreshed from the database on next access.
+            del self.__dict__["version"]
+            del self.__dict__["sync_seq"]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Remember the owner as loaded from the database.
+
+        boards_app.signals compares it on save to invalidate the cached
+        memberships of the previous owner (see boards_app.membership).
         """
-        return self.members.count()
+        instance = super().from_db(db, field_names, values)
+        if "owner_id" in instance.__dict__:
+            instance._loaded_owner_id = instance.owner_id
+        return instance
+
+
+class Tombstone(models.Model):
+    """
+    Record of a deleted task or comment, for delta sync (see boards_app.sync).
+
+    Rows are written by the delete receivers of tasks_app.signals and are
+    pruned after KANMIND_SYNC_TOMBSTONE_DAYS with
+    `manage.py prune_tombstones`. Moving a task to another board leaves a
+    tombstone on the old board as well.
+    """
+
+    class Kind(models.TextChoices):
+        TASK = "task", "task"
+        COMMENT = "comment", "comment"
+
+    kind = models.CharField(max_length=10, choices=Kind.choices)
+
+    # Primary key of the deleted row.
+    object_id = models.PositiveBigIntegerField()
+
+    # Board the row belonged to. A plain ID, the board may be gone as well.
+    board_id = models.PositiveBigIntegerField()
+
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    # Delta sync counter value of the board for the deletion.
+    sync_seq = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            # Deletions on the user's boards since a cursor.
+            models.Index(fields=["board_id", "sync_seq"], name="tombstone_board_seq_idx"),
+        ]
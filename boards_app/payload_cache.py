@@ -0,0 +1,101 @@
+"""
+Server-side cache of rendered board payloads.
+
+BoardsListSerializer rows and BoardDetailSerializer payloads do not
+depend on the requesting user, so every board is serialized once per
+change and then served from the "responses" cache (see CACHES in
+core.settings) to all of its members.
+
+Entries are stored per board and tagged with the board's version and
+updated_at (see boards_app.versions); an entry is only used while its
+tag matches the current one. Every write that changes a payload bumps
+the version, so no explicit invalidation is needed for changes: the
+stale entry is replaced under the same key when the board is rendered
+next. Entries of deleted boards are dropped by a signal receiver in
+boards_app.signals.
+"""
+
+from django.core.cache import caches
+
+CACHE_ALIAS = "responses"
+
+# Payload kinds: a row of the board list and the board detail.
+ROW = "row"
+DETAIL = "detail"
+
+
+def _cache():
+    return caches[CACHE_ALIAS]
+
+
+def _key(kind, board_id):
+    return f"board-{kind}:{board_id}"
+
+
+def _tag(version, updated_at):
+    return (version, updated_at.isoformat())
+
+
+def get_payload(kind, board_id, version, updated_at):
+    """
+    Return the cached payload of a board at the given version, or None.
+    """
+    entry = _cache().get(_key(kind, board_id))
+    if entry is not None and entry[0] == _tag(version, updated_at):
+        return entry[1]
+    return None
+
+
+def set_payload(kind, board, payload):
+    """
+    Store the payload of a loaded board, tagged with its version.
+    """
+    _cache().set(_key(kind, board.pk), (_tag(board.version, board.updated_at), payload))
+
+
+def get_rows(validators):
+    """
+    Return the cached list rows for [(board_id, version, updated_at), ...].
+
+    Returns:
+        dict: board_id -> payload for every current entry (one cache read).
+    """
+    keys = {_key(ROW, board_id): (board_id, _tag(version, updated_at))
+            for board_id, version, updated_at in validators}
+    rows = {}
+    for key, entry in _cache().get_many(keys).items():
+        board_id, tag = keys[key]
+        if entry[0] == tag:
+            rows[board_id] = entry[1]
+    return rows
+
+
+def set_rows(boards, payloads):
+    """
+    Store list rows of loaded boards (in the same order as `payloads`).
+    """
+    _cache().set_many({
+        _key(ROW, board.pk): (_tag(board.version, board.updated_at), payload)
+        for board, payload in zip(boards, payloads)
+    })
+
+
+def invalidate(board_ids):
+    """
+    Drop all cached payloads of the given boards.
+    """
+    keys = [
+        _key(kind, board_id)
+        for board_id in board_ids
+        if board_id is not None
+        for kind in (ROW, DETAIL)
+    ]
+    if keys:
+        _cache().delete_many(keys)
+
+
+def clear():
+    """
+    Drop all cached payloads, e.g. between tests.
+    """
+    _cache().clear()
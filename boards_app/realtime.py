@@ -0,0 +1,200 @@
+"""
+Push channels for board change events (see boards_app.events).
+
+Two transports deliver the events of one board to a client:
+
+- Server-Sent Events: GET /api/boards/{id}/events/ (board_events), an
+  async Django view streaming `text/event-stream`.
+- WebSocket: ws://<host>/ws/boards/{id}/ (websocket_application), a plain
+  ASGI application routed by core.asgi; events are sent as JSON text
+  frames.
+
+Both authenticate with the API token (the `Authorization: Token <key>`
+header, or `?token=<key>` for browser clients that cannot set headers)
+and require access to the board (boards_app.membership). Access is
+checked again whenever the members of the board change, and the
+channel is closed when the user lost it or the board was deleted.
+
+An open channel holds no thread and no database connection of its own:
+it waits on its subscription in the event loop (database work runs in
+the shared thread of sync_to_async), so a worker can keep thousands of
+idle connections open. Both transports need an ASGI server (see
+core.asgi); under WSGI every stream would occupy a worker thread.
+"""
+
+import asyncio
+import json
+import re
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework.exceptions import AuthenticationFailed
+
+from boards_app import events, membership
+from user_auth_app.authentication import CachedTokenAuthentication
+
+# Idle channels send a keep-alive after this many seconds, so proxies
+# and clients notice dead connections.
+HEARTBEAT_SECONDS = 15
+
+# WebSocket close codes (4000-4999 are reserved for applications).
+CLOSE_UNAUTHORIZED = 4401
+CLOSE_NOT_FOUND = 4404
+
+WEBSOCKET_PATH = re.compile(r"^/ws/boards/(?P<board_id>\d+)/$")
+
+
+def _authorize(token_key, board_id):
+    """
+    Return the user of a token if it may access the board.
+
+    Returns:
+        tuple: (user, status) with status 200, or (None, 401) for a
+        missing or invalid token and (None, 404) if the board is not
+        accessible.
+    """
+    if not token_key:
+        return None, 401
+    try:
+        user, _ = CachedTokenAuthentication().authenticate_credentials(token_key)
+    except AuthenticationFailed:
+        return None, 401
+    if not membership.can_access(user, board_id):
+        return None, 404
+    return user, 200
+
+
+def _authorize_websocket(token_key, board_id):
+    # WebSocket connections are not wrapped in Django's request cycle,
+    # which otherwise closes the database connection afterwards.
+    close_old_connections()
+    try:
+        return _authorize(token_key, board_id)
+    finally:
+        close_old_connections()
+
+
+def _token_from(headers, query_string):
+    """
+    Return the token key of the Authorization header or ?token= parameter.
+
+    `headers` maps header names to values; lookups use lower-case names.
+    """
+    authorization = headers.get("authorization", "").split()
+    if len(authorization) == 2 and authorization[0].lower() == "token":
+        return authorization[1]
+    return parse_qs(query_string).get("token", [None])[0]
+
+
+async def board_event_stream(user, board_id):
+    """
+    Yield the events of a board for `user`, or None as a heartbeat.
+
+    Starts with a "subscribed" event once the subscription is active and
+    ends after the board was deleted or the user lost access to it.
+    """
+    broker = events.get_broker()
+    subscription = broker.subscribe([board_id])
+    try:
+        yield {"type": events.SUBSCRIBED, "board": board_id}
+        while True:
+            event = await subscription.get(HEARTBEAT_SECONDS)
+            if event is None:
+                yield None
+                continue
+            if event["type"] == events.MEMBERS_CHANGED and not await sync_to_async(
+                membership.can_access
+            )(user, board_id):
+                return
+            yield event
+            if event["type"] == events.BOARD_DELETED:
+                return
+    finally:
+        broker.unsubscribe(subscription)
+
+
+def format_sse(event):
+    """
+    Render an event (or a None heartbeat) as a Server-Sent Events message.
+    """
+    if event is None:
+        return ": keep-alive\n\n"
+    return f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+
+async def _sse_stream(user, board_id):
+    # Ask EventSource clients to reconnect after 3 seconds.
+    prefix = "retry: 3000\n\n"
+    async for event in board_event_stream(user, board_id):
+        yield prefix + format_sse(event)
+        prefix = ""
+
+
+async def board_events(request, pk):
+    """
+    Stream the change events of a board as Server-Sent Events.
+
+    Responses:
+        200: `text/event-stream`, open until the client disconnects.
+        401: Missing or invalid token.
+        404: Unknown board, or the user has no access to it.
+    """
+    token_key = _token_from(request.headers, request.META.get("QUERY_STRING", ""))
+    user, status = await sync_to_async(_authorize)(token_key, pk)
+    if user is None:
+        detail = "Invalid token." if status == 401 else "Not found."
+        return JsonResponse({"detail": detail}, status=status)
+    response = StreamingHttpResponse(_sse_stream(user, pk), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    # Disable response buffering of nginx.
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+async def websocket_application(scope, receive, send):
+    """
+    ASGI application for ws://<host>/ws/boards/{id}/.
+
+    Accepts the connection after authentication and the access check,
+    then sends every event of the board as a JSON text frame (heartbeats
+    as `{"type": "ping"}`) until the client disconnects or the channel
+    ends (see board_event_stream).
+    """
+    message = await receive()
+    if message["type"] != "websocket.connect":
+        return
+    match = WEBSOCKET_PATH.match(scope["path"])
+    if match is None:
+        await send({"type": "websocket.close", "code": CLOSE_NOT_FOUND})
+        return
+    board_id = int(match["board_id"])
+    headers = {name.decode("latin-1").lower(): value.decode("latin-1")
+               for name, value in scope.get("headers", [])}
+    token_key = _token_from(headers, scope.get("query_string", b"").decode("latin-1"))
+    user, status = await sync_to_async(_authorize_websocket)(token_key, board_id)
+    if user is None:
+        code = CLOSE_UNAUTHORIZED if status == 401 else CLOSE_NOT_FOUND
+        await send({"type": "websocket.close", "code": code})
+        return
+    await send({"type": "websocket.accept"})
+
+    async def forward():
+        async for event in board_event_stream(user, board_id):
+            await send({"type": "websocket.send", "text": json.dumps(event or {"type": "ping"})})
+        await send({"type": "websocket.close", "code": 1000})
+
+    async def wait_for_disconnect():
+        # Incoming frames are ignored.
+        while (await receive())["type"] != "websocket.disconnect":
+            pass
+
+    tasks = [asyncio.ensure_future(forward()), asyncio.ensure_future(wait_for_disconnect())]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await sync_to_async(close_old_connections)()
@@ -0,0 +1,154 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from boards_app import events, membership, payload_cache
+from boards_app.sync import touch_user_rows
+from boards_app.counters import refresh_member_count
+from boards_app.versions import bump_user_board_versions
+from boards_app.models import Boards
+
+
+@receiver(m2m_changed, sender=Boards.members.through)
+def update_member_count(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Keep Boards.member_count in sync with the members relation and
+    publish members.changed to the boards' subscribers.
+
+    Handles both directions of the relation:
+    - board.members.add/remove/set/clear (instance is a board)
+    - user.member_boards.add/remove/set/clear (instance is a user)
+    """
+    if reverse and action == "pre_clear":
+        # pk_set is not provided for clear(), remember the affected boards.
+        instance._cleared_board_ids = list(
+            instance.member_boards.values_list("pk", flat=True)
+        )
+        return
+
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if not reverse:
+        board_ids = [instance.pk]
+    elif action == "post_clear":
+        board_ids = getattr(instance, "_cleared_board_ids", [])
+    else:
+        board_ids = pk_set
+    refresh_member_count(board_ids)
+    for board_id in board_ids:
+        events.publish(board_id, events.MEMBERS_CHANGED)
+
+
+@receiver(pre_delete, sender=settings.AUTH_USER_MODEL)
+def remember_member_boards(sender, instance, **kwargs):
+    """
+    Record the boards of a user that is about to be deleted.
+
+    Deleting a user removes the membership rows by cascade, which does
+    not send m2m_changed.
+    """
+    instance._member_board_ids = list(
+        instance.member_boards.values_list("pk", flat=True)
+    )
+
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def refresh_member_counts_after_user_delete(sender, instance, **kwargs):
+    """
+    Recompute member_count for the boards a deleted user belonged to.
+    """
+    board_ids = getattr(instance, "_member_board_ids", [])
+    refresh_member_count(board_ids)
+    for board_id in board_ids:
+        events.publish(board_id, events.MEMBERS_CHANGED)
+
+
+@receiver(m2m_changed, sender=Boards.members.through)
+def invalidate_member_cache(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Drop the cached board IDs of users whose membership changed.
+
+    - board.members.*: the users in pk_set (all members for clear())
+    - user.member_boards.*: the user itself
+    """
+    if reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            membership.invalidate([instance.pk])
+        return
+
+    if action == "pre_clear":
+        # pk_set is not provided for clear(), remember the affected users.
+        instance._cleared_member_ids = list(
+            instance.members.values_list("pk", flat=True)
+        )
+    elif action == "post_clear":
+        membership.invalidate(getattr(instance, "_cleared_member_ids", []))
+    elif action in ("post_add", "post_remove"):
+        membership.invalidate(pk_set)
+
+
+@receiver(post_save, sender=Boards)
+def invalidate_owner_cache(sender, instance, created, **kwargs):
+    """
+    Drop the cached board IDs of the new and the previous owner.
+
+    Deleted boards need no invalidation: their IDs are not reused and
+    the board itself can no longer be loaded.
+    """
+    previous_owner_id = getattr(instance, "_loaded_owner_id", None)
+    if created or previous_owner_id != instance.owner_id:
+        membership.invalidate({instance.owner_id, previous_owner_id})
+    instance._loaded_owner_id = instance.owner_id
+
+
+@receiver(post_delete, sender=Boards)
+def drop_cached_payloads(sender, instance, **kwargs):
+    """
+    Drop the cached payloads of a deleted board and close its channels.
+    """
+    payload_cache.invalidate([instance.pk])
+    events.publish(instance.pk, events.BOARD_DELETED)
+
+
+@receiver(post_save, sender=Boards)
+def publish_board_update(sender, instance, created, raw, **kwargs):
+    """
+    Publish board.updated when an existing board was saved.
+    """
+    if not created and not raw:
+        events.publish(instance.pk, events.BOARD_UPDATED)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_new_user_cache(sender, instance, created, **kwargs):
+    """
+    Start new users without cached board IDs.
+
+    Primary keys can be reused after a rolled back transaction (e.g. in
+    tests), which must not expose the boards of the previous holder.
+    """
+    if created:
+        membership.invalidate([instance.pk])
+
+
+# User fields that are part of board and task payloads.
+DISPLAYED_USER_FIELDS = {"username", "first_name", "last_name", "email"}
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def bump_versions_on_user_change(sender, instance, created, raw, update_fields, **kwargs):
+    """
+    Mark the boards, tasks and comments of a user as changed when the
+    user's name or email may have changed. Password or last_login updates
+    are skipped.
+    """
+    if created or raw:
+        return
+    if update_fields and not DISPLAYED_USER_FIELDS & set(update_fields):
+        return
+    with transaction.atomic(savepoint=False):
+        bump_user_board_versions(instance)
+        touch_user_rows(instance)
+    for board_id in membership.accessible_board_ids(instance):
+        events.publish(board_id, events.BOARD_UPDATED)
@@ -0,0 +1,163 @@
+"""
+Delta sync: the rows of a user's boards changed since a cursor.
+
+Every board has its own delta sync counter (Boards.sync_seq). A write
+increments the counter of each board it changes before writing its rows
+(BoardsQuerySet.tick()), stamps the tasks, comments and tombstones of
+deleted tasks and comments with the new value of their board (`sync_seq`)
+and keeps the board row locked until it commits. The values of a board
+therefore become visible in order, while writes to different boards do
+not wait for each other. A cursor holds the counter of every board of
+the user: changes_since() reads the counters first and returns them as
+the next cursor, together with the rows stamped after the previous
+cursor's value of their board, read with one indexed query per kind. A
+row is never committed behind a cursor, and neither slow commits nor
+clock skew between server processes can make a client miss it. Rows of
+transactions that commit while a sync runs may be delivered again with
+the next one; applying them is idempotent.
+Clients apply `deleted` before `boards`, `tasks` and `comments` (a moved
+task is deleted on its old board and changed on the new one) and drop
+local boards missing from `board_ids`.
+
+Boards missing from the cursor (e.g. the user was added to them since)
+are sent with all their tasks and comments.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from boards_app import membership
+from boards_app.models import Boards, Tombstone
+from boards_app.versions import board_sync_seq, version_bump
+
+
+def tombstone_retention():
+    """
+    Return how long tombstones are kept (KANMIND_SYNC_TOMBSTONE_DAYS).
+    """
+    return timedelta(days=getattr(settings, "KANMIND_SYNC_TOMBSTONE_DAYS", 30))
+
+
+def encode_cursor(sequences):
+    """
+    Return the cursor of {board_id: sync_seq}, e.g. "3.17-5.2".
+    """
+    return "-".join(f"{board_id}.{sequence}" for board_id, sequence in sorted(sequences.items()))
+
+
+def decode_cursor(value):
+    """
+    Return the {board_id: sync_seq} of a cursor.
+
+    Returns:
+        dict | None: None for a cursor of a former format (a plain
+        number), which gets a full sync.
+
+    Raises:
+        ValueError: If `value` is not a cursor.
+    """
+    if value.isdigit():
+        return None
+    sequences = {}
+    for entry in value.split("-") if value else []:
+        board_id, _, sequence = entry.partition(".")
+        if not (board_id.isdigit() and sequence.isdigit()):
+            raise ValueError(f"invalid cursor entry {entry!r}")
+        sequences[int(board_id)] = int(sequence)
+    return sequences
+
+
+def changes_since(user, since=None):
+    """
+    Collect the changes of all boards `user` can access.
+
+    Args:
+        user: The requesting user.
+        since: {board_id: sync_seq} of the client's cursor (see
+            decode_cursor), or None for a full sync. Cursors before the
+            last pruned tombstone of one of the boards get a full sync,
+            since deletions may be missing, and so do cursors ahead of a
+            board's counter.
+
+    Returns:
+        dict: `cursor`, `full`, `board_ids` and the changed `boards`,
+        `tasks` and `comments` (model instances, tasks and comments with
+        their users loaded) plus `deleted` task and comment IDs.
+    """
+    from tasks_app.models import Comment, Task
+
+    board_ids = sorted(membership.accessible_board_ids(user))
+    # Read before the rows: everything up to these values is committed.
+    counters = {
+        board_id: (sequence, pruned)
+        for board_id, sequence, pruned in Boards.objects.filter(pk__in=board_ids)
+        .values_list("pk", "sync_seq", "sync_pruned")
+    }
+    full = since is None or any(
+        not pruned <= since[board_id] <= sequence
+        for board_id, (sequence, pruned) in counters.items()
+        if board_id in since
+    )
+    if full:
+        since = {}
+
+    # Boards new to the client are sent in full, the others from their
+    # cursor value on; boards without changes are skipped.
+    new = [board_id for board_id in counters if board_id not in since]
+    changed = [
+        (board_id, since[board_id])
+        for board_id, (sequence, _) in counters.items()
+        if board_id in since and since[board_id] < sequence
+    ]
+    rows, task_rows, deleted_rows = Q(board_id__in=new), Q(task__board_id__in=new), Q()
+    for board_id, sequence in changed:
+        rows |= Q(board_id=board_id, sync_seq__gt=sequence)
+        task_rows |= Q(task__board_id=board_id, sync_seq__gt=sequence)
+        deleted_rows |= Q(board_id=board_id, sync_seq__gt=sequence)
+
+    boards = Boards.objects.filter(
+        pk__in=[*new, *(board_id for board_id, _ in changed)]
+    ).prefetch_related("members")
+    tasks = Task.objects.filter(rows).select_related("assignee", "reviewer")
+    comments = Comment.objects.filter(task_rows).select_related("author")
+    deleted = {Tombstone.Kind.TASK: [], Tombstone.Kind.COMMENT: []}
+    if changed:
+        tombstones = Tombstone.objects.filter(deleted_rows).values_list("kind", "object_id")
+        for kind, object_id in tombstones:
+            deleted[kind].append(object_id)
+
+    return {
+        "cursor": encode_cursor({board_id: sequence for board_id, (sequence, _) in counters.items()}),
+        "full": full,
+        "board_ids": board_ids,
+        "boards": list(boards.order_by("pk")),
+        "tasks": list(tasks.order_by("pk")),
+        "comments": list(comments.order_by("pk")),
+        "deleted": {
+            "tasks": sorted(set(deleted[Tombstone.Kind.TASK])),
+            "comments": sorted(set(deleted[Tombstone.Kind.COMMENT])),
+        },
+    }
+
+
+def touch_user_rows(user):
+    """
+    Mark the tasks and comments showing a user's name or email as changed.
+
+    Their boards are marked as changed first (also boards the user is not
+    a member of), then the rows are stamped with their board's counter.
+    Must run in one transaction.
+    """
+    from tasks_app.models import Comment, Task
+
+    tasks = Task.objects.filter(Q(assignee=user) | Q(reviewer=user))
+    comments = Comment.objects.filter(author=user)
+    Boards.objects.filter(
+        Q(pk__in=tasks.values("board_id")) | Q(pk__in=comments.values("task__board_id"))
+    ).update(**version_bump())
+    now = timezone.now()
+    tasks.update(updated_at=now, sync_seq=board_sync_seq())
+    comments.update(updated_at=now, sync_seq=board_sync_seq("task_id", "tasks"))
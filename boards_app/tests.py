@@ -1,3 +1,1120 @@
-from django.test import TestCase
+import asyncio
+import csv
+import json
+import os
+import shutil
+import tempfile
+import threading
+from datetime import timedelta
+from io import StringIO
+from unittest import skipUnless
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from asgiref.sync import sync_to_async
+from django.db import connection, transaction
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+from boards_app import events, export, membership, payload_cache, realtime, sync
+from boards_app.api.views import BOARD_DETAIL_QUERIES
+from boards_app.counters import find_counter_drift
+from boards_app.models import Boards, Tombstone
+from core.cache import BoundedLocMemCache
+from core.testing import QueryBudgetTestCase
+from tasks_app.models import Comment, Task
 
-# Create your tests here.
+
+class BoardsListTests(APITestCase):
+    """
+    Tests for GET /api/boards/.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="owner@example.com", email="owner@example.com")
+        self.other = User.objects.create_user(username="other@example.com", email="other@example.com")
+        self.client.force_authenticate(self.user)
+
+    def create_board(self, tasks=0):
+        board = Boards.objects.create(title="Board", owner=self.user)
+        board.members.set([self.user, self.other])
+        for index in range(tasks):
+            Task.objects.create(
+                board=board,
+                title=f"Task {index}",
+                status=Task.Status.TODO if index % 2 else Task.Status.DONE,
+                priority=Task.Priority.HIGH if index % 3 == 0 else Task.Priority.LOW,
+            )
+        return board
+
+    def list_query_count(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/api/boards/")
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), response.json()
+
+    def test_list_returns_counters(self):
+        self.create_board(tasks=6)
+        _, data = self.list_query_count()
+        self.assertEqual(len(data), 1)
+        self.assertEqual(data[0]["member_count"], 2)
+        self.assertEqual(data[0]["ticket_count"], 6)
+        self.assertEqual(data[0]["tasks_to_do_count"], 3)
+        self.assertEqual(data[0]["tasks_high_prio_count"], 2)
+
+    def test_query_count_does_not_grow_with_boards(self):
+        self.create_board(tasks=2)
+        baseline, _ = self.list_query_count()
+        for _ in range(10):
+            self.create_board(tasks=3)
+        count, data = self.list_query_count()
+        self.assertEqual(len(data), 11)
+        self.assertEqual(count, baseline)
+
+    def test_opt_in_cursor_pagination(self):
+        for _ in range(5):
+            self.create_board()
+        self.assertIsInstance(self.client.get("/api/boards/").json(), list)
+
+        first = self.client.get("/api/boards/?page_size=2").json()
+        second = self.client.get(first["next"]).json()
+        self.assertEqual(len(first["results"]), 2)
+        self.assertEqual(len(second["results"]), 2)
+        self.assertLess(first["results"][-1]["id"], second["results"][0]["id"])
+
+    def test_create_returns_counters(self):
+        response = self.client.post(
+            "/api/boards/", {"title": "New", "members": [self.other.id]}, format="json"
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["member_count"], 2)
+        self.assertEqual(response.json()["ticket_count"], 0)
+
+
+class BoardDetailTests(APITestCase):
+    """
+    Tests for GET /api/boards/{id}/.
+    """
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username="owner@example.com")
+        self.member = User.objects.create_user(username="member@example.com", first_name="Member")
+        self.board = Boards.objects.create(title="Board", owner=self.owner)
+        self.board.members.set([self.owner, self.member])
+        payload_cache.clear()
+
+    def add_tasks(self, count):
+        for index in range(count):
+            task = Task.objects.create(
+                board=self.board,
+                title=f"Task {index}",
+                assignee=self.member,
+                reviewer=self.owner,
+            )
+            Comment.objects.create(task=task, author=self.member, content="x")
+
+    def test_detail_stays_within_query_budget(self):
+        self.client.force_authenticate(self.member)
+        for tasks in (1, 50):
+            self.add_tasks(tasks)
+            # Version lookup, then the detail itself.
+            with self.assertNumQueries(1 + BOARD_DETAIL_QUERIES):
+                response = self.client.get(f"/api/boards/{self.board.pk}/")
+            self.assertEqual(response.status_code, 200)
+
+        data = response.json()
+        self.assertEqual(data["owner_id"], self.owner.pk)
+        self.assertEqual(len(data["members"]), 2)
+        self.assertEqual(len(data["tasks"]), 51)
+        self.assertEqual(data["tasks"][0]["assignee"]["fullname"], "Member")
+        self.assertEqual(data["tasks"][0]["comments_count"], 1)
+
+    def test_detail_hidden_from_non_members(self):
+        outsider = User.objects.create_user(username="outsider@example.com")
+        self.client.force_authenticate(outsider)
+        response = self.client.get(f"/api/boards/{self.board.pk}/")
+        self.assertEqual(response.status_code, 404)
+
+
+class BoardCountersTests(APITestCase):
+    """
+    Tests for the denormalized counters stored on Boards.
+    """
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username="owner@example.com")
+        self.member = User.objects.create_user(username="member@example.com")
+        self.board = Boards.objects.create(title="Board", owner=self.owner)
+        self.other_board = Boards.objects.create(title="Other", owner=self.owner)
+
+    def assertCounters(self, board, **expected):
+        board.refresh_from_db()
+        for field, value in expected.items():
+            self.assertEqual(getattr(board, field), value, field)
+        self.assertEqual(find_counter_drift(), [])
+
+    def test_task_create_update_move_delete(self):
+        task = Task.objects.create(
+            board=self.board, status=Task.Status.TODO, priority=Task.Priority.HIGH
+        )
+        self.assertCounters(self.board, ticket_count=1, tasks_to_do_count=1, tasks_high_prio_count=1)
+
+        task.status = Task.Status.DONE
+        task.save()
+        self.assertCounters(self.board, ticket_count=1, tasks_to_do_count=0, tasks_high_prio_count=1)
+
+        task = Task.objects.get(pk=task.pk)
+        task.board = self.other_board
+        task.priority = Task.Priority.LOW
+        task.save()
+        self.assertCounters(self.board, ticket_count=0, tasks_high_prio_count=0)
+        self.assertCounters(self.other_board, ticket_count=1, tasks_high_prio_count=0)
+
+        task.delete()
+        self.assertCounters(self.other_board, ticket_count=0)
+
+    def test_stale_instances_do_not_drift(self):
+        task = Task.objects.create(board=self.board, status=Task.Status.TODO)
+        first = Task.objects.get(pk=task.pk)
+        second = Task.objects.get(pk=task.pk)
+
+        first.status = Task.Status.DONE
+        first.save()
+        second.status = Task.Status.REVIEW
+        second.save()
+        self.assertCounters(self.board, ticket_count=1, tasks_to_do_count=0)
+
+        first.priority = Task.Priority.HIGH
+        first.save()
+        second.priority = Task.Priority.HIGH
+        second.save()
+        self.assertCounters(self.board, tasks_high_prio_count=1)
+
+    def test_board_delete_cascades_cleanly(self):
+        Task.objects.create(board=self.board)
+        self.board.delete()
+        self.assertEqual(find_counter_drift(), [])
+
+    def test_member_changes(self):
+        self.board.members.add(self.owner, self.member)
+        self.assertCounters(self.board, member_count=2)
+
+        self.member.member_boards.add(self.other_board)
+        self.assertCounters(self.other_board, member_count=1)
+
+        self.member.member_boards.clear()
+        self.assertCounters(self.board, member_count=1)
+        self.assertCounters(self.other_board, member_count=0)
+
+        self.board.members.add(self.member)
+        self.member.delete()
+        self.assertCounters(self.board, member_count=1)
+
+    def test_rebuild_command_repairs_drift(self):
+        Task.objects.create(board=self.board)
+        Boards.objects.filter(pk=self.board.pk).update(ticket_count=5)
+
+        with self.assertRaises(CommandError):
+            call_command("rebuild_board_counters", "--check", stdout=StringIO())
+
+        call_command("rebuild_board_counters", stdout=StringIO())
+        self.assertCounters(self.board, ticket_count=1)
+
+
+class MembershipCacheTests(APITestCase):
+    """
+    Tests for the cached board IDs of boards_app.membership.
+    """
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username="owner@example.com")
+        self.member = User.objects.create_user(username="member@example.com")
+        self.board = Boards.objects.create(title="Board", owner=self.owner)
+
+    def assertAccessible(self, user, expected):
+        self.assertEqual(membership.accessible_board_ids(user), frozenset(expected))
+
+    def test_lookups_are_cached(self):
+        with self.assertNumQueries(1):
+            self.assertTrue(membership.can_access(self.owner, self.board.pk))
+        with self.assertNumQueries(0):
+            self.assertTrue(membership.can_access(self.owner, str(self.board.pk)))
+            self.assertFalse(membership.can_access(self.owner, "not-an-id"))
+            self.assertFalse(membership.can_access(self.owner, None))
+
+    def test_member_changes_invalidate(self):
+        self.assertAccessible(self.member, [])
+        self.board.members.add(self.member)
+        self.assertAccessible(self.member, [self.board.pk])
+        self.board.members.remove(self.member)
+        self.assertAccessible(self.member, [])
+
+        self.member.member_boards.add(self.board)
+        self.assertAccessible(self.member, [self.board.pk])
+        self.board.members.clear()
+        self.assertAccessible(self.member, [])
+
+        self.member.member_boards.set([self.board])
+        self.assertAccessible(self.member, [self.board.pk])
+        self.member.member_boards.clear()
+        self.assertAccessible(self.member, [])
+
+    def test_invalidated_again_on_commit(self):
+        self.assertAccessible(self.member, [])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.board.members.add(self.member)
+            # A concurrent request caches the membership before the commit.
+            membership._cache().set(membership._key(self.member.pk), frozenset())
+        self.assertAccessible(self.member, [self.board.pk])
+
+    def test_owner_change_invalidates(self):
+        self.assertAccessible(self.owner, [self.board.pk])
+        self.assertAccessible(self.member, [])
+        board = Boards.objects.get(pk=self.board.pk)
+        board.owner = self.member
+        board.save()
+        self.assertAccessible(self.owner, [])
+        self.assertAccessible(self.member, [self.board.pk])
+
+    def test_task_writes_reuse_cached_membership(self):
+        self.board.members.add(self.member)
+        self.client.force_authenticate(self.member)
+        payload = {"board": self.board.pk, "title": "Task", "assignee_id": self.member.pk}
+        with CaptureQueriesContext(connection) as cold:
+            self.assertEqual(self.client.post("/api/tasks/", payload, format="json").status_code, 201)
+        with CaptureQueriesContext(connection) as warm:
+            self.assertEqual(self.client.post("/api/tasks/", payload, format="json").status_code, 201)
+        self.assertEqual(len(warm.captured_queries), len(cold.captured_queries) - 1)
+
+        self.board.members.remove(self.member)
+        self.assertEqual(self.client.post("/api/tasks/", payload, format="json").status_code, 403)
+        payload["board"] = self.board.pk + 1
+        self.assertEqual(self.client.post("/api/tasks/", payload, format="json").status_code, 404)
+
+
+class ConditionalGetTests(APITestCase):
+    """
+    Tests for ETag / Last-Modified support based on board versions.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="owner@example.com")
+        self.member = User.objects.create_user(username="member@example.com")
+        self.board = Boards.objects.create(title="Board", owner=self.user)
+        self.board.members.set([self.user])
+        self.task = Task.objects.create(board=self.board, title="Task")
+        self.client.force_authenticate(self.user)
+        membership.accessible_board_ids(self.user)
+
+    def get(self, url, etag=None):
+        headers = {"HTTP_IF_NONE_MATCH": etag} if etag else {}
+        return self.client.get(url, **headers)
+
+    def assertChangedBy(self, url, change):
+        """
+        Assert that `url` answers 304 until `change` runs, and 200 afterwards.
+        """
+        etag = self.get(url)["ETag"]
+        self.assertEqual(self.get(url, etag).status_code, 304)
+        change()
+        response = self.get(url, etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_board_detail_not_modified_in_one_query(self):
+        url = f"/api/boards/{self.board.pk}/"
+        response = self.get(url)
+        self.assertIn("Last-Modified", response)
+        with self.assertNumQueries(1):
+            not_modified = self.get(url, response["ETag"])
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.content, b"")
+        self.assertEqual(not_modified["ETag"], response["ETag"])
+
+        since = self.client.get(url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"])
+        self.assertEqual(since.status_code, 304)
+
+    def test_board_versions_follow_every_change(self):
+        url = f"/api/boards/{self.board.pk}/"
+        comments = f"/api/tasks/{self.task.pk}/comments/"
+        self.assertChangedBy(url, lambda: Boards.objects.get(pk=self.board.pk).save())
+        self.assertChangedBy(url, lambda: self.board.members.add(self.member))
+        self.assertChangedBy(url, lambda: Task.objects.create(board=self.board, title="New"))
+        self.assertChangedBy(
+            url, lambda: self.client.patch(f"/api/tasks/{self.task.pk}/", {"title": "x"}, format="json")
+        )
+        self.assertChangedBy(url, lambda: self.client.post(comments, {"content": "Hi"}, format="json"))
+        self.assertChangedBy(url, lambda: Comment.objects.all().delete())
+        self.assertChangedBy(
+            url,
+            lambda: self.client.post(
+                "/api/tasks/bulk/", {"tasks": [{"id": self.task.pk, "status": "done"}]}, format="json"
+            ),
+        )
+        self.assertChangedBy(url, lambda: User.objects.filter(pk=self.member.pk).get().save())
+
+    def test_lists_and_tasks(self):
+        self.assertChangedBy("/api/boards/", lambda: self.board.members.add(self.member))
+        self.assertChangedBy(
+            "/api/boards/", lambda: Boards.objects.create(title="Second", owner=self.user)
+        )
+        self.assertChangedBy(
+            f"/api/tasks/{self.task.pk}/",
+            lambda: Comment.objects.create(task=self.task, author=self.user, content="Hi"),
+        )
+        for url in ("/api/tasks/", "/api/tasks/assigned-to-me/", "/api/tasks/reviewing/"):
+            self.assertChangedBy(
+                url, lambda: Task.objects.create(board=self.board, assignee=self.user)
+            )
+
+    def test_inaccessible_boards_are_not_found(self):
+        self.client.force_authenticate(self.member)
+        response = self.get(f"/api/boards/{self.board.pk}/", '"anything"')
+        self.assertEqual(response.status_code, 404)
+
+    def test_malformed_ids_are_not_found(self):
+        for url in ("/api/boards/abc/", "/api/tasks/abc/"):
+            self.assertEqual(self.get(url).status_code, 404)
+            self.assertEqual(self.get(url, '"anything"').status_code, 404)
+
+        for prefix, pk in (("/api/boards/", self.board.pk), ("/api/tasks/", self.task.pk)):
+            etag = self.get(f"{prefix}{pk}/")["ETag"]
+            self.assertEqual(self.get(f"{prefix}0{pk}/", etag).status_code, 304)
+
+
+class PayloadCacheTests(APITestCase):
+    """
+    Tests for the cached board payloads of boards_app.payload_cache.
+    """
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username="owner@example.com")
+        self.member = User.objects.create_user(username="member@example.com")
+        self.board = Boards.objects.create(title="Board", owner=self.owner)
+        self.board.members.set([self.owner, self.member])
+        self.other = Boards.objects.create(title="Other", owner=self.member)
+        Task.objects.create(board=self.board, title="Task", assignee=self.member)
+        payload_cache.clear()
+
+    def get(self, user, url):
+        self.client.force_authenticate(user)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_detail_is_rendered_once_for_all_members(self):
+        url = f"/api/boards/{self.board.pk}/"
+        first = self.get(self.owner, url)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.get(self.member, url), first)
+
+        Task.objects.create(board=self.board, title="Second")
+        with self.assertNumQueries(1 + BOARD_DETAIL_QUERIES):
+            changed = self.get(self.member, url)
+        self.assertEqual(len(changed["tasks"]), 2)
+
+    def test_list_renders_only_changed_boards(self):
+        self.assertEqual(len(self.get(self.member, "/api/boards/")), 2)
+        with self.assertNumQueries(1):
+            cached = self.get(self.member, "/api/boards/")
+
+        Boards.objects.filter(pk=self.other.pk).update(title="Renamed")
+        self.other.refresh_from_db()
+        self.other.save()
+        with CaptureQueriesContext(connection) as ctx:
+            changed = self.get(self.member, "/api/boards/")
+        self.assertEqual(len(ctx.captured_queries), 2)
+        self.assertIn(f'"boards_app_boards"."id" IN ({self.other.pk})', ctx.captured_queries[1]["sql"])
+        self.assertEqual(changed[0], cached[0])
+        self.assertEqual(changed[1]["title"], "Renamed")
+
+        self.assertEqual([row["id"] for row in self.get(self.owner, "/api/boards/")], [self.board.pk])
+
+    def test_deleted_boards_are_dropped(self):
+        self.get(self.member, "/api/boards/")
+        self.other.delete()
+        self.assertEqual(len(self.get(self.member, "/api/boards/")), 1)
+        self.assertIsNone(payload_cache._cache().get(f"board-row:{self.other.pk}"))
+
+
+class BoundedLocMemCacheTests(APITestCase):
+    """
+    Tests for the memory bound and statistics of core.cache.BoundedLocMemCache.
+    """
+
+    def make_cache(self, **options):
+        cache = BoundedLocMemCache(f"test-{self._testMethodName}", {"OPTIONS": options})
+        cache.clear()
+        cache.reset_stats()
+        return cache
+
+    def test_least_recently_used_entries_are_evicted_by_size(self):
+        cache = self.make_cache(MAX_BYTES=2000)
+        for key in "abc":
+            cache.set(key, "x" * 600)
+        cache.get("a")
+        cache.set("d", "x" * 600)
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+        stats = cache.stats()
+        self.assertEqual(stats["evictions"], 1)
+        self.assertEqual(stats["entries"], 3)
+        self.assertLessEqual(stats["bytes"], 2000)
+
+        cache.set("huge", "x" * 5000)
+        self.assertIsNone(cache.get("huge"))
+        self.assertEqual(cache.stats()["entries"], 3)
+
+    def test_hit_and_miss_counters(self):
+        cache = self.make_cache()
+        cache.set("a", 1)
+        cache.get("a")
+        cache.get("a")
+        cache.get("missing")
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["hit_rate"]), (2, 1, 0.667))
+        cache.delete("a")
+        self.assertEqual(cache.stats()["bytes"], 0)
+
+    def test_stats_endpoint_is_admin_only(self):
+        user = User.objects.create_user(username="user@example.com")
+        self.client.force_authenticate(user)
+        self.assertEqual(self.client.get("/api/stats/cache/").status_code, 403)
+        user.is_staff = True
+        user.save()
+        response = self.client.get("/api/stats/cache/")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("hit_rate", response.json()["responses"])
+        self.assertEqual(self.client.delete("/api/stats/cache/").status_code, 204)
+
+
+class DeltaSyncTests(APITestCase):
+    """
+    Tests for GET /api/boards/sync/ (boards_app.sync).
+    """
+
+    url = "/api/boards/sync/"
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="owner@example.com")
+        self.other = User.objects.create_user(username="other@example.com")
+        self.board = Boards.objects.create(title="Board", owner=self.user)
+        self.second = Boards.objects.create(title="Second", owner=self.user)
+        self.foreign = Boards.objects.create(title="Foreign", owner=self.other)
+        self.tasks = [
+            Task.objects.create(board=self.board, title=f"Task {index}", assignee=self.user)
+            for index in range(3)
+        ]
+        self.comment = Comment.objects.create(task=self.tasks[0], author=self.user, content="Hi")
+        Task.objects.create(board=self.foreign, title="Foreign")
+        self.client.force_authenticate(self.user)
+
+    def sync(self, since=None):
+        response = self.client.get(self.url, {"since": since} if since is not None else {})
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def counters(self):
+        return dict(
+            Boards.objects.filter(pk__in=[self.board.pk, self.second.pk]).values_list("pk", "sync_seq")
+        )
+
+    def test_full_sync(self):
+        data = self.sync()
+        self.assertTrue(data["full"])
+        self.assertEqual(data["board_ids"], [self.board.pk, self.second.pk])
+        self.assertEqual(len(data["boards"]), 2)
+        self.assertEqual([task["id"] for task in data["tasks"]], [task.pk for task in self.tasks])
+        self.assertEqual(data["comments"][0]["task"], self.tasks[0].pk)
+        self.assertEqual(data["cursor"], sync.encode_cursor(self.counters()))
+
+    def test_only_changes_since_cursor(self):
+        since = self.sync()["cursor"]
+        data = self.sync(since)
+        self.assertFalse(data["full"])
+        self.assertEqual((data["boards"], data["tasks"], data["comments"]), ([], [], []))
+
+        self.client.patch(f"/api/tasks/{self.tasks[1].pk}/", {"title": "Changed"}, format="json")
+        self.client.delete(f"/api/tasks/{self.tasks[2].pk}/")
+        self.client.delete(f"/api/tasks/{self.tasks[0].pk}/comments/{self.comment.pk}/")
+        Task.objects.create(board=self.foreign, title="Foreign change")
+        with self.assertNumQueries(6):
+            data = self.sync(since)
+        self.assertEqual([board["id"] for board in data["boards"]], [self.board.pk])
+        self.assertEqual(
+            [task["id"] for task in data["tasks"]], [self.tasks[0].pk, self.tasks[1].pk]
+        )
+        self.assertEqual(data["deleted"], {"tasks": [self.tasks[2].pk], "comments": [self.comment.pk]})
+
+    def test_moves_and_lost_access(self):
+        self.foreign.members.add(self.user)
+        since = self.sync()["cursor"]
+        self.tasks[1].board = self.foreign
+        self.tasks[1].save()
+        data = self.sync(since)
+        self.assertEqual(data["deleted"]["tasks"], [self.tasks[1].pk])
+        self.assertEqual([task["board"] for task in data["tasks"]], [self.foreign.pk])
+
+        self.foreign.members.remove(self.user)
+        data = self.sync(since)
+        self.assertNotIn(self.foreign.pk, data["board_ids"])
+        self.assertEqual(data["tasks"], [])
+
+    def test_cursor_is_monotonic(self):
+        first = self.sync()
+        self.assertEqual(self.sync(first["cursor"])["cursor"], first["cursor"])
+
+        task = Task.objects.create(board=self.board, title="New")
+        later = self.sync(first["cursor"])
+        before, after = sync.decode_cursor(first["cursor"]), sync.decode_cursor(later["cursor"])
+        self.assertGreater(after[self.board.pk], before[self.board.pk])
+        self.assertEqual(after[self.second.pk], before[self.second.pk])
+        self.assertEqual([row["id"] for row in later["tasks"]], [task.pk])
+        self.assertEqual(self.sync(later["cursor"])["tasks"], [])
+
+    def test_writes_tick_their_boards_only(self):
+        # Writes lock the counters of the boards they change, writes to
+        # other boards do not wait for them.
+        counters = self.counters()
+        task = Task.objects.create(board=self.board, title="New")
+        Comment.objects.create(task=task, author=self.user, content="Hi")
+        task.delete()
+        self.assertGreater(self.counters()[self.board.pk], counters[self.board.pk])
+        self.assertEqual(self.counters()[self.second.pk], counters[self.second.pk])
+
+    def test_new_boards_come_with_their_rows(self):
+        since = self.sync()["cursor"]
+        self.foreign.members.add(self.user)
+        data = self.sync(since)
+        self.assertFalse(data["full"])
+        self.assertEqual([board["id"] for board in data["boards"]], [self.foreign.pk])
+        self.assertEqual([task["board"] for task in data["tasks"]], [self.foreign.pk])
+
+    def test_timestamps_do_not_matter(self):
+        # A write whose timestamp lags behind (slow commit, clock skew
+        # between processes) is still delivered.
+        since = self.sync()["cursor"]
+        self.tasks[1].title = "Late"
+        self.tasks[1].save()
+        past = timezone.now() - timedelta(hours=1)
+        Task.objects.filter(pk=self.tasks[1].pk).update(updated_at=past)
+        Boards.objects.filter(pk=self.board.pk).update(updated_at=past)
+        data = self.sync(since)
+        self.assertEqual([task["title"] for task in data["tasks"]], ["Late"])
+        self.assertEqual([board["id"] for board in data["boards"]], [self.board.pk])
+
+    def test_user_changes_stamp_their_rows(self):
+        since = self.sync()["cursor"]
+        self.user.first_name = "Renamed"
+        self.user.save()
+        data = self.sync(since)
+        self.assertEqual(len(data["tasks"]), 3)
+        self.assertEqual([comment["id"] for comment in data["comments"]], [self.comment.pk])
+
+    def test_old_or_invalid_cursors(self):
+        # Cursors of the former formats (a timestamp or a global counter
+        # value), and cursors ahead of a board's counter.
+        self.assertTrue(self.sync(int(timezone.now().timestamp() * 1_000_000))["full"])
+        self.assertTrue(self.sync(42)["full"])
+        self.assertTrue(self.sync(f"{self.board.pk}.1000")["full"])
+        for since in ("abc", "-1", "1.2-", "1.x"):
+            self.assertEqual(self.client.get(self.url, {"since": since}).status_code, 400)
+
+    def test_prune_tombstones(self):
+        before_prune = self.sync()["cursor"]
+        kept = self.tasks[1].pk
+        self.tasks[2].delete()
+        Tombstone.objects.update(deleted_at=timezone.now() - timedelta(days=31))
+        after_prune = self.sync()["cursor"]
+        self.tasks[1].delete()
+        call_command("prune_tombstones", stdout=StringIO())
+        self.assertEqual(list(Tombstone.objects.values_list("object_id", flat=True)), [kept])
+        self.assertTrue(self.sync(before_prune)["full"])
+        data = self.sync(after_prune)
+        self.assertFalse(data["full"])
+        self.assertEqual(data["deleted"]["tasks"], [kept])
+
+
+@skipUnless(connection.vendor == "postgresql", "SQLite runs one writer at a time")
+class ConcurrentWriterTests(TransactionTestCase):
+    """
+    Writes to different boards do not wait for each other's delta sync
+    counters (BoardsQuerySet.tick()).
+    """
+
+    def test_writers_of_different_boards_do_not_block(self):
+        user = User.objects.create_user(username="owner@example.com")
+        first = Boards.objects.create(title="First", owner=user)
+        second = Boards.objects.create(title="Second", owner=user)
+        written, release, errors = threading.Event(), threading.Event(), []
+
+        def write_first():
+            try:
+                with transaction.atomic():
+                    Task.objects.create(board=first, title="Open")
+                    written.set()
+                    release.wait(10)
+            except Exception as error:
+                errors.append(error)
+                written.set()
+            finally:
+                connection.close()
+
+        writer = threading.Thread(target=write_first)
+        writer.start()
+        try:
+            self.assertTrue(written.wait(10))
+            with transaction.atomic():
+                # Fails instead of waiting if the first writer's lock is needed.
+                with connection.cursor() as cursor:
+                    cursor.execute("SET LOCAL lock_timeout = '2s'")
+                Task.objects.create(board=second, title="Concurrent")
+                Comment.objects.create(task=Task.objects.get(title="Concurrent"), author=user)
+        finally:
+            release.set()
+            writer.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(Task.objects.count(), 2)
+
+
+class BoardExportTests(APITestCase):
+    """
+    Tests for GET /api/boards/export/ and /api/boards/{id}/export/
+    (boards_app.export).
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="owner@example.com", email="owner@example.com", first_name="Owner"
+        )
+        self.other = User.objects.create_user(username="other@example.com")
+        self.board = Boards.objects.create(title="Board", owner=self.user)
+        self.board.members.add(self.user)
+        self.second = Boards.objects.create(title="Second", owner=self.user)
+        self.foreign = Boards.objects.create(title="Foreign", owner=self.other)
+        self.tasks = [
+            Task.objects.create(board=self.board, title=f"Task {index}", assignee=self.user)
+            for index in range(3)
+        ]
+        self.comment = Comment.objects.create(
+            task=self.tasks[1], author=self.user, content='Line, with "quotes"\nand newline'
+        )
+        Task.objects.create(board=self.foreign, title="Foreign")
+        self.client.force_authenticate(self.user)
+
+    def export(self, url, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response, b"".join(response.streaming_content).decode()
+
+    def test_ndjson(self):
+        response, body = self.export("/api/boards/export/")
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertIn('filename="boards.ndjson"', response["Content-Disposition"])
+        records = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual(
+            [(record["type"], record["id"]) for record in records],
+            [
+                ("board", self.board.pk),
+                ("task", self.tasks[0].pk),
+                ("task", self.tasks[1].pk),
+                ("comment", self.comment.pk),
+                ("task", self.tasks[2].pk),
+                ("board", self.second.pk),
+            ],
+        )
+        self.assertEqual(records[1]["assignee"]["email"], "owner@example.com")
+        self.assertEqual(records[3]["content"], self.comment.content)
+
+    def test_csv(self):
+        response, body = self.export(f"/api/boards/{self.board.pk}/export/", type="csv")
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertIn(f'filename="board-{self.board.pk}.csv"', response["Content-Disposition"])
+        rows = list(csv.DictReader(StringIO(body)))
+        self.assertEqual([row["type"] for row in rows], ["task", "task", "comment", "task"])
+        self.assertEqual({row["board_title"] for row in rows}, {"Board"})
+        self.assertEqual(rows[2]["task_id"], str(self.tasks[1].pk))
+        self.assertEqual(rows[2]["comment_content"], self.comment.content)
+        self.assertEqual(rows[0]["assignee_email"], "owner@example.com")
+
+    def test_access_and_validation(self):
+        self.assertEqual(self.client.get(f"/api/boards/{self.foreign.pk}/export/").status_code, 404)
+        response = self.client.get("/api/boards/export/", {"type": "xml"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("type", response.json())
+
+    def test_queries_do_not_grow_with_tasks(self):
+        url = f"/api/boards/{self.board.pk}/export/"
+        with CaptureQueriesContext(connection) as small:
+            self.export(url)
+        for index in range(20):
+            task = Task.objects.create(board=self.board, title=f"More {index}", reviewer=self.other)
+            Comment.objects.create(task=task, author=self.other, content="More")
+        with CaptureQueriesContext(connection) as large:
+            _, body = self.export(url)
+        self.assertEqual(len(body.splitlines()), 1 + 23 + 21)
+        self.assertEqual(len(large), len(small))
+
+    def test_export_boards_command(self):
+        stdout, stderr = StringIO(), StringIO()
+        call_command(
+            "export_boards", str(self.board.pk), "--chunk-size", "2", stdout=stdout, stderr=stderr
+        )
+        _, body = self.export(f"/api/boards/{self.board.pk}/export/")
+        self.assertEqual(stdout.getvalue(), body)
+        self.assertIn("1 board(s), 3 task(s), 1 comment(s)", stderr.getvalue())
+
+
+class BoardImportTests(APITestCase):
+    """
+    Tests for POST /api/boards/import/ (boards_app.importer).
+    """
+
+    url = "/api/boards/import/"
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="owner@example.com", email="owner@example.com")
+        self.other = User.objects.create_user(username="other@example.com", email="Other@Example.com")
+        self.client.force_authenticate(self.user)
+
+    def lines(self, *records):
+        return "".join(json.dumps(record) + "\n" for record in records).encode()
+
+    def post(self, body, import_format="ndjson"):
+        content_type = export.CONTENT_TYPES[import_format]
+        response = self.client.post(f"{self.url}?type={import_format}", body, content_type=content_type)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_import_ndjson(self):
+        data = self.post(self.lines(
+            {"type": "board", "id": 7, "title": "Imported", "members": [{"email": "other@example.com"}]},
+            {"type": "task", "id": 1, "board": 7, "title": "A", "status": "to-do", "priority": "high",
+             "assignee": "OTHER@example.com", "due_date": "2026-01-31"},
+            {"type": "task", "id": 2, "title": "B", "reviewer": {"email": "owner@example.com"}},
+            {"type": "comment", "task": 1, "content": "First", "author": "other@example.com"},
+            {"type": "comment", "content": "On B", "author": "Some Name"},
+        ))
+        self.assertEqual(data["created"], {"boards": 1, "tasks": 2, "comments": 2})
+        self.assertEqual((data["rows"], data["errors"], data["error_rows"]), (5, 0, []))
+
+        board = Boards.objects.get(title="Imported")
+        self.assertEqual(board.owner, self.user)
+        self.assertEqual(set(board.members.all()), {self.user, self.other})
+        self.assertEqual(
+            (board.member_count, board.ticket_count, board.tasks_to_do_count, board.tasks_high_prio_count),
+            (2, 2, 2, 1),
+        )
+        first, second = board.tasks.order_by("pk")
+        self.assertEqual((first.assignee, first.created_by, first.comments_count), (self.other, self.user, 1))
+        self.assertEqual((second.reviewer, second.comments_count), (self.user, 1))
+        # Comments are imported as written by the importing user.
+        self.assertEqual(first.comments.get().author, self.user)
+        self.assertEqual(second.comments.get().author, self.user)
+        self.assertIn(board.pk, membership.accessible_board_ids(self.other))
+
+    def test_comment_authors_are_not_taken_from_the_request(self):
+        data = self.post(self.lines(
+            {"type": "board", "title": "Board"},
+            {"type": "task", "title": "Task"},
+            {"type": "comment", "content": "Forged", "author_email": "other@example.com"},
+            {"type": "comment", "content": "Unknown", "author_email": "nobody@example.com"},
+        ))
+        self.assertEqual((data["errors"], data["created"]["comments"]), (0, 2))
+        self.assertFalse(Comment.objects.filter(author=self.other).exists())
+
+    def test_round_trip(self):
+        board = Boards.objects.create(title="Source", owner=self.user)
+        board.members.add(self.other)
+        task = Task.objects.create(board=board, title="Task", assignee=self.other, priority="high")
+        Comment.objects.create(task=task, author=self.user, content="Hi, there")
+        Task.objects.create(board=board, title="Other task")
+
+        for import_format in export.FORMATS:
+            body = "".join(export.render(export.export_records([board.pk]), import_format))
+            data = self.post(body.encode(), import_format)
+            self.assertEqual(data["errors"], 0, data["error_rows"])
+            self.assertEqual(data["created"], {"boards": 1, "tasks": 2, "comments": 1})
+            copy = Boards.objects.order_by("-pk").first()
+            self.assertEqual(copy.title, "Source")
+            self.assertEqual(
+                list(copy.tasks.order_by("pk").values_list("title", "assignee", "priority", "comments_count")),
+                list(board.tasks.order_by("pk").values_list("title", "assignee", "priority", "comments_count")),
+            )
+            self.assertEqual(Comment.objects.filter(task__board=copy).get().content, "Hi, there")
+
+    def test_invalid_rows_are_skipped(self):
+        data = self.post(self.lines(
+            {"type": "board", "id": 1, "title": "Bad", "members": ["nobody@example.com"]},
+            {"type": "task", "board": 1, "title": "Orphan"},
+            {"type": "board", "id": 2, "title": "Good"},
+            {"type": "task", "id": 5, "status": "blocked"},
+            {"type": "comment", "task": 5, "content": "Lost"},
+            {"type": "task", "board": 3, "title": "Unknown board"},
+            {"type": "task", "title": "Kept"},
+        ) + b"not json\n")
+        self.assertEqual(data["created"], {"boards": 1, "tasks": 1, "comments": 0})
+        errors = {error["line"]: error for error in data["error_rows"]}
+        self.assertEqual(sorted(errors), [1, 2, 4, 5, 6, 8])
+        self.assertEqual(errors[1]["errors"], {"members": ['Unknown user "nobody@example.com".']})
+        self.assertEqual(errors[2]["errors"], {"board": ["The board of line 1 was not imported."]})
+        self.assertIn("status", errors[4]["errors"])
+        self.assertEqual(errors[5]["errors"], {"task": ["The task of line 4 was not imported."]})
+        self.assertEqual(errors[6]["errors"], {"board": ['Unknown board "3".']})
+        self.assertEqual(errors[8]["type"], None)
+        self.assertEqual(Boards.objects.get(title="Good").ticket_count, 1)
+        self.assertEqual(self.client.post(f"{self.url}?type=xml", b"", content_type="text/csv").status_code, 400)
+
+    def test_queries_do_not_grow_with_rows(self):
+        def body(count):
+            return self.lines(
+                {"type": "board", "id": 1, "members": ["other@example.com"]},
+                *(
+                    {"type": "task", "title": f"Task {index}", "assignee": "other@example.com"}
+                    for index in range(count)
+                ),
+                *({"type": "comment", "content": "Hi"} for _ in range(count)),
+            )
+
+        with CaptureQueriesContext(connection) as small:
+            self.post(body(5))
+        with CaptureQueriesContext(connection) as large:
+            data = self.post(body(50))
+        self.assertEqual(data["created"], {"boards": 1, "tasks": 50, "comments": 50})
+        self.assertEqual(len(large), len(small))
+
+    def test_import_boards_command(self):
+        path = self.tmp_path("import.ndjson")
+        errors_path = self.tmp_path("errors.ndjson")
+        with open(path, "wb") as source:
+            source.write(self.lines(
+                {"type": "board", "title": "From file"},
+                {"type": "task", "title": "A", "assignee": "missing@example.com"},
+                {"type": "task", "title": "B"},
+                {"type": "comment", "content": "Kept author", "author": "other@example.com"},
+            ))
+        stdout, stderr = StringIO(), StringIO()
+        call_command(
+            "import_boards", path, "--owner", "OWNER@example.com", "--batch-size", "2",
+            "--errors", errors_path, stdout=stdout, stderr=stderr,
+        )
+        self.assertIn("1 board(s), 1 task(s), 1 comment(s) from 4 row(s)", stdout.getvalue())
+        self.assertIn("Skipped 1 row(s).", stderr.getvalue())
+        with open(errors_path) as errors:
+            self.assertEqual([json.loads(line)["line"] for line in errors], [2])
+        self.assertEqual(Boards.objects.get(title="From file").ticket_count, 1)
+        self.assertEqual(Comment.objects.get(content="Kept author").author, self.other)
+        with self.assertRaises(CommandError):
+            call_command("import_boards", path, "--owner", "nobody@example.com", stdout=StringIO())
+
+    def tmp_path(self, name):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        return os.path.join(directory, name)
+
+
+class RecordingBroker(events.InProcessBroker):
+    """
+    Broker stand-in that also records every published event.
+    """
+
+    published = []
+
+    def publish(self, event):
+        self.published.append(event)
+        super().publish(event)
+
+
+@override_settings(KANMIND_EVENT_BROKER="boards_app.tests.RecordingBroker")
+class BoardEventsTests(APITestCase):
+    """
+    Tests for the board change events (boards_app.events) and their push
+    channels (boards_app.realtime).
+    """
+
+    def setUp(self):
+        events.get_broker.cache_clear()
+        self.addCleanup(events.get_broker.cache_clear)
+        RecordingBroker.published = []
+        self.user = User.objects.create_user(username="owner@example.com")
+        self.member = User.objects.create_user(username="member@example.com")
+        self.outsider = User.objects.create_user(username="outsider@example.com")
+        self.board = Boards.objects.create(title="Board", owner=self.user)
+        self.board.members.set([self.user, self.member])
+        self.task = Task.objects.create(board=self.board, title="Task")
+        self.token = Token.objects.create(user=self.member)
+
+    def published(self, request):
+        """
+        Run a request and return the types of the events it published.
+        """
+        RecordingBroker.published = []
+        with self.captureOnCommitCallbacks(execute=True):
+            request()
+        return [(event["type"], event["board"]) for event in RecordingBroker.published]
+
+    def test_api_writes_publish_on_commit(self):
+        self.client.force_authenticate(self.user)
+        board = self.board.pk
+        comments = f"/api/tasks/{self.task.pk}/comments/"
+        self.assertEqual(
+            self.published(lambda: self.client.patch(f"/api/tasks/{self.task.pk}/", {"title": "x"})),
+            [("task.updated", board)],
+        )
+        self.assertEqual(
+            self.published(lambda: self.client.post(comments, {"content": "Hi"})),
+            [("comment.created", board)],
+        )
+        comment = Comment.objects.get()
+        self.assertEqual(
+            self.published(lambda: self.client.delete(f"{comments}{comment.pk}/")),
+            [("comment.deleted", board)],
+        )
+        self.assertEqual(
+            self.published(lambda: self.client.patch(f"/api/boards/{board}/", {"title": "New"})),
+            [("board.updated", board)],
+        )
+        self.assertEqual(
+            self.published(lambda: self.board.members.remove(self.member)),
+            [("members.changed", board)],
+        )
+        self.assertEqual(
+            self.published(
+                lambda: self.client.post(
+                    "/api/tasks/bulk/", {"tasks": [{"id": self.task.pk, "status": "done"}]}, format="json"
+                )
+            ),
+            [("tasks.changed", board)],
+        )
+        self.assertEqual(RecordingBroker.published[0]["ids"], [self.task.pk])
+
+        with transaction.atomic():
+            Task.objects.create(board=self.board, title="Rolled back")
+            transaction.set_rollback(True)
+        self.assertEqual(self.published(lambda: None), [])
+
+    async def test_slow_subscribers_get_resync(self):
+        broker = events.get_broker()
+        subscription = broker.subscribe([self.board.pk])
+        for index in range(events.QUEUE_SIZE + 1):
+            broker.publish({"type": events.TASK_UPDATED, "board": self.board.pk, "id": index})
+        await asyncio.sleep(0)
+        self.assertEqual(await subscription.get(0.1), {"type": events.RESYNC, "board": self.board.pk})
+        self.assertIsNone(await subscription.get(0.01))
+        broker.unsubscribe(subscription)
+        self.assertEqual(broker.subscriber_count(), 0)
+
+    async def test_server_sent_events(self):
+        url = f"/api/boards/{self.board.pk}/events/"
+        self.assertEqual((await self.async_client.get(url)).status_code, 401)
+        outsider_token = await sync_to_async(Token.objects.create)(user=self.outsider)
+        response = await self.async_client.get(url, {"token": outsider_token.key})
+        self.assertEqual(response.status_code, 404)
+
+        response = await self.async_client.get(url, headers={"Authorization": f"Token {self.token.key}"})
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        stream = aiter(response.streaming_content)
+        self.assertTrue((await anext(stream)).startswith(b"retry: 3000\n\nevent: subscribed\n"))
+
+        def create_task():
+            with self.captureOnCommitCallbacks(execute=True):
+                return Task.objects.create(board=self.board, title="Pushed")
+
+        task = await sync_to_async(create_task)()
+        message = (await asyncio.wait_for(anext(stream), 1)).decode()
+        self.assertTrue(message.startswith("event: task.created\n"))
+        self.assertIn(f'"id": {task.pk}', message)
+
+        def remove_member():
+            with self.captureOnCommitCallbacks(execute=True):
+                self.board.members.remove(self.member)
+
+        await sync_to_async(remove_member)()
+        with self.assertRaises(StopAsyncIteration):
+            await asyncio.wait_for(anext(stream), 1)
+        self.assertEqual(events.get_broker().subscriber_count(), 0)
+
+    async def test_websocket(self):
+        path = f"/ws/boards/{self.board.pk}/"
+
+        async def connect(query_string):
+            incoming, outgoing = asyncio.Queue(), asyncio.Queue()
+            await incoming.put({"type": "websocket.connect"})
+            scope = {"type": "websocket", "path": path, "query_string": query_string, "headers": []}
+            app = asyncio.ensure_future(
+                realtime.websocket_application(scope, incoming.get, outgoing.put)
+            )
+            return app, incoming, outgoing
+
+        app, _, outgoing = await connect(b"token=invalid")
+        self.assertEqual(await outgoing.get(), {"type": "websocket.close", "code": 4401})
+        await app
+
+        app, incoming, outgoing = await connect(f"token={self.token.key}".encode())
+        self.assertEqual(await outgoing.get(), {"type": "websocket.accept"})
+        subscribed = await asyncio.wait_for(outgoing.get(), 1)
+        self.assertEqual(json.loads(subscribed["text"])["type"], events.SUBSCRIBED)
+        events.get_broker().publish({"type": events.TASK_UPDATED, "board": self.board.pk, "id": 1})
+        frame = await asyncio.wait_for(outgoing.get(), 1)
+        self.assertEqual(json.loads(frame["text"])["type"], events.TASK_UPDATED)
+
+        await incoming.put({"type": "websocket.disconnect"})
+        await asyncio.wait_for(app, 1)
+        self.assertEqual(events.get_broker().subscriber_count(), 0)
+
+
+class BoardsQueryBudgetTests(QueryBudgetTestCase):
+    """
+    Query budgets for every route of boards_app.api.urls.
+
+    The token of the scenario is cached as after a login, so budgets do
+    not include the token lookup (see user_auth_app.authentication).
+    """
+
+    def test_list(self):
+        # The owner sees `size` + 1 boards; large lists are streamed and
+        # load missing rows per chunk.
+        self.assertQueryBudget(
+            lambda s: self.client.get("/api/boards/"), budget=2, rows_streamed=lambda size: size + 1
+        )
+
+    def test_create(self):
+        self.assertQueryBudget(
+            lambda s: self.client.post(
+                "/api/boards/",
+                {"title": "New", "members": [user.pk for user in s.users[:3]]},
+                format="json",
+            ),
+            budget=9,
+            expected_status=201,
+        )
+
+    def test_retrieve(self):
+        self.assertQueryBudget(
+            lambda s: self.client.get(f"/api/boards/{s.board.pk}/"),
+            budget=1 + BOARD_DETAIL_QUERIES,
+        )
+
+    def test_partial_update(self):
+        self.assertQueryBudget(
+            lambda s: self.client.patch(
+                f"/api/boards/{s.board.pk}/",
+                {"title": "Renamed", "members": [s.owner.pk, s.users[0].pk]},
+                format="json",
+            ),
+            budget=4,
+        )
+
+    def test_destroy(self):
+        self.assertQueryBudget(
+            lambda s: self.client.delete(f"/api/boards/{s.board.pk}/"),
+            budget=7,
+            expected_status=204,
+            rows_deleted=lambda size: 3 * size,
+        )
+
+    def test_sync(self):
+        # Full sync: clock, accessible boards, boards, members, tasks, comments.
+        self.assertQueryBudget(lambda s: self.client.get("/api/boards/sync/"), budget=6)
@@ -0,0 +1,127 @@
+"""
+Per-board change tracking.
+
+Every change of a board, its members, tasks or comments increments
+Boards.version and sets Boards.updated_at. The API uses both as
+validators for conditional GETs (ETag / Last-Modified, see
+core.conditional), so an unchanged board can be answered with 304
+after one indexed lookup.
+
+Bumps are issued by the signal receivers of boards_app and tasks_app,
+where possible in the same UPDATE that maintains the counters (see
+boards_app.counters). They also increment the board's delta sync
+counter (Boards.sync_seq, see boards_app.sync).
+"""
+
+from django.db.models import F, OuterRef, Subquery
+from django.utils import timezone
+
+from boards_app.models import Boards
+
+
+def version_bump():
+    """
+    Return update() keyword arguments that mark a board as changed.
+    """
+    return {
+        "version": F("version") + 1,
+        "updated_at": timezone.now(),
+        "sync_seq": F("sync_seq") + 1,
+    }
+
+
+def board_sync_seq(board_field="board_id", lookup="pk"):
+    """
+    Return an expression reading the delta sync counter of a row's board.
+
+    Rows of a board are stamped with it in an UPDATE after the board was
+    bumped (or ticked, see BoardsQuerySet.tick()) in the same transaction.
+
+    Args:
+        board_field: Field of the updated model referencing the board,
+            e.g. "task_id" for comments.
+        lookup: Boards lookup matching that field, e.g. "tasks".
+    """
+    return Subquery(Boards.objects.filter(**{lookup: OuterRef(board_field)}).values("sync_seq")[:1])
+
+
+def bump_board_versions(board_ids):
+    """
+    Mark the given boards as changed in one UPDATE.
+    """
+    board_ids = [board_id for board_id in board_ids if board_id is not None]
+    if board_ids:
+        Boards.objects.filter(pk__in=board_ids).update(**version_bump())
+
+
+def bump_task_board_version(task_id):
+    """
+    Mark the board of a task as changed, e.g. after a comment write.
+
+    The board is resolved in a subquery, so this is a single UPDATE.
+    """
+    from tasks_app.models import Task
+
+    if task_id is not None:
+        Boards.objects.filter(
+            pk__in=Task.objects.filter(pk=task_id).values("board_id")
+        ).update(**version_bump())
+
+
+def bump_user_board_versions(user):
+    """
+    Mark the boards a user owns or is a member of as changed.
+
+    Used when the user's name or email changes, which are part of the
+    board payloads.
+    """
+    Boards.objects.accessible_to(user).update(**version_bump())
+
+
+def _board_validators_query(board_id, user):
+    return (
+        Boards.objects.accessible_to(user)
+        .filter(pk=board_id)
+        .values_list("version", "updated_at")
+    )
+
+
+def _accessible_board_validators_query(user):
+    return Boards.objects.accessible_to(user).order_by("pk").values_list("pk", "version", "updated_at")
+
+
+def board_validators(board_id, user):
+    """
+    Return (version, updated_at) of a board the user can access.
+
+    Returns:
+        tuple | None: None if the board does not exist or is not
+        accessible. One query, by primary key and the indexed access
+        subqueries.
+    """
+    return _board_validators_query(board_id, user).first()
+
+
+async def aboard_validators(board_id, user):
+    """
+    Async variant of board_validators().
+    """
+    return await _board_validators_query(board_id, user).afirst()
+
+
+def accessible_board_validators(user):
+    """
+    Return [(board_id, version, updated_at), ...] of every board the
+    user can access, ordered by ID.
+
+    Any change of one of these boards, or of the set of boards itself,
+    changes the result; list ETags are derived from it.
+    """
+    return list(_accessible_board_validators_query(user))
+
+
+async def aaccessible_board_validators(user):
+    """
+    Async variant of accessible_board_validators().
+    """
+    return [row async for row in _accessible_board_validators_query(user)]
@@ -1,6 +1,9 @@
 from django.urls import path, include
+from .views import CacheStatsView, RequestStatsView
 
 urlpatterns = [
     path("boards/", include("boards_app.api.urls")),
     path("tasks/", include("tasks_app.api.urls")),
-]
\ No newline at end of file
+    path("stats/requests/", RequestStatsView.as_view(), name="request-stats"),
+    path("stats/cache/", CacheStatsView.as_view(), name="cache-stats"),
+]
@@ -0,0 +1,59 @@
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core.cache import cache_stats
+from core.profiling import STATS
+
+
+class RequestStatsView(APIView):
+    """
+    Aggregated per-view request statistics collected by
+    core.middleware.RequestProfilingMiddleware.
+
+    - GET: Returns per-view averages (time, DB time, serializer time,
+      queries, N+1 flags), slowest views first.
+    - DELETE: Resets the statistics.
+
+    The statistics are kept in memory of the current process only.
+    Only staff users have access.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(
+            {
+                "enabled": getattr(settings, "KANMIND_PROFILING", False),
+                "views": STATS.snapshot(),
+            }
+        )
+
+    def delete(self, request):
+        STATS.reset()
+        return Response(status=204)
+
+
+class CacheStatsView(APIView):
+    """
+    Hit/miss counters and memory use of the server-side caches that
+    provide them (see core.cache.BoundedLocMemCache).
+
+    - GET: Returns the statistics per cache alias.
+    - DELETE: Resets the hit, miss and eviction counters.
+
+    The statistics are kept in memory of the current process only.
+    Only staff users have access.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(cache_stats())
+
+    def delete(self, request):
+        for alias in cache_stats():
+            caches[alias].reset_stats()
+        return Response(status=204)
@@ -9,8 +9,26 @@ https://docs.djangoproject.com/en/6.0/howto/deployment/asgi/
 
 import os
 
-from django.core.asgi import get_asgi_application
+import django
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
 
-application = get_asgi_application()
+# Set up Django before importing code that uses models.
+django.setup(set_prefix=False)
+
+from boards_app.realtime import websocket_application  # noqa: E402
+from core.async_api import AsyncReadASGIHandler  # noqa: E402
+
+# Django's ASGI handler, serving the hot reads with async views
+# (core.async_api).
+django_application = AsyncReadASGIHandler()
+
+
+async def application(scope, receive, send):
+    """
+    Route WebSocket connections to the board event channels
+    (boards_app.realtime), everything else to Django.
+    """
+    if scope["type"] == "websocket":
+        return await websocket_application(scope, receive, send)
+    return await django_application(scope, receive, send)
@@ -0,0 +1,156 @@
+"""
+Async read path of the API under ASGI.
+
+The API is built from synchronous DRF viewsets. Under ASGI every request
+to them occupies a worker thread for its whole duration. The hot read
+endpoints therefore have async implementations as well:
+
+- GET /api/boards/ and /api/boards/{id}/ (boards_app.api.async_views)
+- GET /api/tasks/assigned-to-me/, /api/tasks/reviewing/ and
+  /api/tasks/{id}/comments/ (tasks_app.api.async_views)
+
+They authenticate, check access and query with the async ORM, and they
+produce the same responses as the viewsets: the same body bytes, status,
+ETag/Last-Modified and Content-Type, Vary and Allow headers.
+
+AsyncReadASGIHandler (used by core.asgi) routes GET requests through
+ASYNC_URLCONF (core.async_urls). That URLconf lists the async views
+before the regular URLconf. Everything an async view does not implement
+is handed to the sync view of the same URL (SYNC_URLCONF). This covers
+other methods, paginated requests (?page_size=, ?cursor=), non-JSON
+renderers, invalid filter parameters, and requests that fail
+authentication or access checks. So errors and edge cases keep behaving
+exactly like the viewsets.
+
+WSGI deployments (core.wsgi) keep using the viewsets for everything.
+"""
+
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIHandler, ASGIRequest
+from django.http import HttpResponse
+from django.urls import resolve
+from django.utils.cache import patch_vary_headers
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+
+from core.pagination import OptInCursorPagination
+from user_auth_app.authentication import CachedTokenAuthentication
+
+ASYNC_URLCONF = "core.async_urls"
+SYNC_URLCONF = "core.urls"
+
+# Accept media ranges for which DRF picks its JSONRenderer.
+JSON_MEDIA_RANGES = frozenset({"*/*", "application/*", "application/json"})
+
+
+class AsyncReadRequest(ASGIRequest):
+    """
+    ASGI request that resolves GET requests through ASYNC_URLCONF.
+    """
+
+    def __init__(self, scope, body_file):
+        super().__init__(scope, body_file)
+        if self.method == "GET":
+            self.urlconf = ASYNC_URLCONF
+
+
+class AsyncReadASGIHandler(ASGIHandler):
+    """
+    Django's ASGI handler with the async read path, see core.asgi.
+    """
+
+    request_class = AsyncReadRequest
+
+
+def renders_json(request):
+    """
+    Return True if DRF would answer the request with plain JSON.
+
+    Requests asking for another renderer (the browsable API, ?format=)
+    or for JSON with parameters (e.g. `; indent=4`) return False.
+    """
+    if api_settings.URL_FORMAT_OVERRIDE in request.GET:
+        return False
+    accept = request.headers.get("Accept")
+    if not accept:
+        return True
+    media_ranges = [media_range.strip() for media_range in accept.split(",")]
+    return all(media_range in JSON_MEDIA_RANGES for media_range in media_ranges)
+
+
+def is_paginated(request):
+    """
+    Return True if the client opted in to cursor pagination.
+    """
+    paginator = OptInCursorPagination
+    return paginator.cursor_query_param in request.GET or paginator.page_size_query_param in request.GET
+
+
+async def authenticate(request):
+    """
+    Return the active user of a request, or None.
+
+    Checks the same credentials as the viewsets, in the same order: the
+    session user (SessionAuthentication), then the API token
+    (CachedTokenAuthentication). Invalid credentials return None, and
+    the sync view answers them with its regular error response.
+    """
+    user = await request.auser()
+    if user.is_active:
+        return user
+    try:
+        result = await CachedTokenAuthentication().aauthenticate(request)
+    except AuthenticationFailed:
+        return None
+    return result[0] if result is not None else None
+
+
+def json_response(data):
+    """
+    Return `data` rendered like a DRF Response with the JSONRenderer.
+    """
+    return HttpResponse(JSONRenderer().render(data), content_type=JSONRenderer.media_type)
+
+
+def allowed_methods(view):
+    """
+    Return the Allow header of a DRF view function, as DRF sets it.
+    """
+    actions = getattr(view, "actions", None) or {}
+    return ", ".join(
+        method.upper()
+        for method in view.cls.http_method_names
+        if method in actions or hasattr(view.cls, method)
+    )
+
+
+def async_read_view(handler):
+    """
+    Turn an async handler into a view with fallback to the sync view.
+
+    `handler(request, user, *args, **kwargs)` is called for
+    authenticated, unpaginated JSON GET requests. It returns a response,
+    or None to hand the request to the sync view, e.g. for a 404. Its
+    responses get the Vary and Allow headers DRF would add.
+    """
+
+    @wraps(handler)
+    async def view(request, *args, **kwargs):
+        sync_view = resolve(request.path_info, urlconf=SYNC_URLCONF).func
+        if request.method == "GET" and renders_json(request) and not is_paginated(request):
+            user = await authenticate(request)
+            if user is not None:
+                response = await handler(request, user, *args, **kwargs)
+                if response is not None:
+                    patch_vary_headers(response, ("Accept",))
+                    response["Allow"] = allowed_methods(sync_view)
+                    return response
+        return await sync_to_async(sync_view)(request, *args, **kwargs)
+
+    # The sync views are CSRF exempt and SessionAuthentication enforces
+    # CSRF itself.
+    return csrf_exempt(view)
@@ -0,0 +1,20 @@
+"""
+URLconf of GET requests under ASGI, see core.async_api.
+
+The async read views come first; every other URL resolves as in
+core.urls.
+"""
+
+from django.urls import include, path
+
+from boards_app.api import async_views as board_views
+from tasks_app.api import async_views as task_views
+
+urlpatterns = [
+    path("api/boards/", board_views.board_list),
+    path("api/boards/<int:pk>/", board_views.board_detail),
+    path("api/tasks/assigned-to-me/", task_views.assigned_to_me),
+    path("api/tasks/reviewing/", task_views.reviewing),
+    path("api/tasks/<int:pk>/comments/", task_views.comment_list),
+    path("", include("core.urls")),
+]
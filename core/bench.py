@@ -0,0 +1,1300 @@
+"""
+Benchmark harness used by `manage.py bench`.
+
+Builds a synthetic dataset in an isolated database (the test database of
+the configured backend), drives API endpoints through Django's test
+client from N concurrent worker threads and reports latency percentiles,
+throughput and queries per request.
+"""
+
+import asyncio
+import hashlib
+import random
+import threading
+import time
+import tracemalloc
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection, connections
+from django.test.utils import setup_test_environment, teardown_test_environment
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from boards_app.models import Boards
+from core import synthetic
+from tasks_app.models import Comment, Task
+
+User = get_user_model()
+
+# Result sizes of the streaming scenario unless --rows is given.
+DEFAULT_STREAMING_ROWS = (1000, 10000, 50000)
+
+# Task counts of the export scenario's memory runs unless --rows is given.
+DEFAULT_EXPORT_ROWS = (10000, 100000)
+
+
+@contextmanager
+def isolated_database(name=None, keep=False):
+    """
+    Create a throw-away database for the benchmark and drop it afterwards.
+
+    Uses the test database machinery of the configured backend. For SQLite
+    a file is used (instead of the default in-memory test database) so
+    that worker threads share the same data.
+
+    Args:
+        name: Optional test database name (SQLite: file path).
+        keep: Keep an existing database and do not destroy it at the end.
+    """
+    setup_test_environment()
+    settings_dict = connection.settings_dict
+    if connection.vendor == "sqlite":
+        settings_dict["TEST"]["NAME"] = name or "bench.sqlite3"
+        # Concurrent writers wait for the lock instead of failing at once.
+        settings_dict.setdefault("OPTIONS", {}).setdefault("timeout", 30)
+    elif name:
+        settings_dict["TEST"]["NAME"] = name
+    old_name = connection.creation.create_test_db(
+        verbosity=0, autoclobber=True, keepdb=keep, serialize=False
+    )
+    try:
+        yield
+    finally:
+        connections.close_all()
+        if not keep:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def percentile(sorted_values, pct):
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class QueryCounter:
+    """
+    Database execute wrapper counting the queries of the current thread.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def summarize(name, latencies, queries, errors, wall_time):
+    """
+    Build the result dictionary of one benchmarked operation.
+    """
+    latencies = sorted(latencies)
+    requests = len(latencies)
+    return {
+        "name": name,
+        "requests": requests,
+        "errors": errors,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "requests_per_sec": round(requests / wall_time, 1) if wall_time else 0.0,
+        "queries_per_request": round(queries / requests, 2) if requests else 0.0,
+    }
+
+
+def run_concurrent(name, operation, requests, concurrency, make_context=None):
+    """
+    Run `operation` `requests` times spread over `concurrency` threads.
+
+    Args:
+        name: Label of the operation in the report.
+        operation: Callable(context) -> response, one API request.
+        requests: Total number of requests.
+        concurrency: Number of worker threads.
+        make_context: Optional callable() -> per-thread context passed to
+            `operation` (e.g. an authenticated APIClient).
+
+    Returns:
+        dict: Summary as produced by summarize().
+    """
+    latencies = []
+    totals = {"queries": 0, "errors": 0}
+    lock = threading.Lock()
+    per_worker = [requests // concurrency] * concurrency
+    for index in range(requests % concurrency):
+        per_worker[index] += 1
+
+    def worker(count):
+        context = make_context() if make_context else None
+        counter = QueryCounter()
+        local_latencies = []
+        errors = 0
+        try:
+            with connection.execute_wrapper(counter):
+                for _ in range(count):
+                    started = time.perf_counter()
+                    response = operation(context)
+                    local_latencies.append(time.perf_counter() - started)
+                    if response is not None and response.status_code >= 400:
+                        errors += 1
+        finally:
+            connection.close()
+        with lock:
+            latencies.extend(local_latencies)
+            totals["queries"] += counter.count
+            totals["errors"] += errors
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for future in [pool.submit(worker, count) for count in per_worker if count]:
+            future.result()
+    wall_time = time.perf_counter() - started
+    return summarize(name, latencies, totals["queries"], totals["errors"], wall_time)
+
+
+def build_api_dataset(users, boards, tasks_per_board, comments_per_task, members_per_board):
+    """
+    Seed the dataset for the API scenario.
+
+    The first user is the benchmark user: a member of every board and
+    assignee/reviewer of a share of the tasks.
+
+    Returns:
+        dict: user, token, board_ids, task_ids and commented_task_ids.
+    """
+    all_users = synthetic.create_users(max(users, 1), prefix="bench")
+    bench_user = all_users[0]
+    board_ids, task_ids, commented_task_ids = [], [], []
+    for index in range(boards):
+        owner = all_users[index % len(all_users)]
+        members = [bench_user, *random.sample(all_users, min(members_per_board, len(all_users)))]
+        board = synthetic.create_boards(owner, 1, members=members, prefix="Bench board")[0]
+        tasks = synthetic.create_tasks(
+            board,
+            tasks_per_board,
+            assignees=members,
+            reviewers=list(reversed(members)),
+            creator=owner,
+        )
+        if comments_per_task:
+            # Every tenth task carries the comments.
+            for task in tasks[: max(1, len(tasks) // 10)]:
+                synthetic.create_comments(task, comments_per_task, authors=members)
+                commented_task_ids.append(task.pk)
+        board_ids.append(board.pk)
+        task_ids.extend(task.pk for task in tasks)
+    return {
+        "user": bench_user,
+        "token": Token.objects.create(user=bench_user),
+        "board_ids": board_ids,
+        "task_ids": task_ids,
+        "commented_task_ids": commented_task_ids or task_ids,
+    }
+
+
+def api_operations(dataset, requests):
+    """
+    Return the benchmarked API operations as (name, callable(client)) pairs.
+
+    Tasks removed by "tasks-delete" are created up front (requests + one
+    warm-up), so their creation is not part of the measurement.
+    """
+    board_ids = dataset["board_ids"]
+    task_ids = dataset["task_ids"]
+    commented_task_ids = dataset["commented_task_ids"]
+    user = dataset["user"]
+    board = Boards.objects.get(pk=board_ids[0])
+    deletable = deque(
+        task.pk
+        for task in synthetic.create_tasks(board, requests + 1, creator=user)
+    )
+
+    def create_task(client):
+        return client.post(
+            "/api/tasks/",
+            {"board": random.choice(board_ids), "title": "Bench", "assignee_id": user.pk},
+            format="json",
+        )
+
+    def update_task(client):
+        status = random.choice(Task.Status.values)
+        return client.patch(f"/api/tasks/{random.choice(task_ids)}/", {"status": status}, format="json")
+
+    def delete_task(client):
+        return client.delete(f"/api/tasks/{deletable.popleft()}/")
+
+    def comment_task_id():
+        return random.choice(commented_task_ids)
+
+    # Polling clients: repeat GETs with the ETag of their previous response.
+    etags = {}
+
+    def poll(url):
+        def run(client):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etags.get(url, '""'))
+            if "ETag" in response:
+                etags[url] = response["ETag"]
+            return response
+        return run
+
+    polled_board_url = f"/api/boards/{board_ids[-1]}/"
+
+    # Syncing clients: fetch the changes since their previous cursor.
+    cursors = {}
+
+    def sync(client):
+        since = cursors.get("since")
+        response = client.get("/api/boards/sync/", {"since": since} if since else {})
+        if response.status_code == 200:
+            cursors["since"] = response.json()["cursor"]
+        return response
+
+    return [
+        ("boards-list", lambda client: client.get("/api/boards/")),
+        ("board-detail", lambda client: client.get(f"/api/boards/{random.choice(board_ids)}/")),
+        ("boards-list-poll", poll("/api/boards/")),
+        ("board-detail-poll", poll(polled_board_url)),
+        ("boards-sync", sync),
+        ("tasks-create", create_task),
+        ("tasks-retrieve", lambda client: client.get(f"/api/tasks/{random.choice(task_ids)}/")),
+        ("tasks-update", update_task),
+        ("tasks-delete", delete_task),
+        ("tasks-assigned-to-me", lambda client: client.get("/api/tasks/assigned-to-me/")),
+        ("tasks-reviewing", lambda client: client.get("/api/tasks/reviewing/")),
+        ("comments-list", lambda client: client.get(f"/api/tasks/{comment_task_id()}/comments/")),
+        (
+            "comments-create",
+            lambda client: client.post(
+                f"/api/tasks/{comment_task_id()}/comments/", {"content": "Bench"}, format="json"
+            ),
+        ),
+    ]
+
+
+def run_api_scenario(options, log):
+    """
+    Benchmark the main API endpoints.
+
+    Returns:
+        dict: dataset description and one result per operation.
+    """
+    started = time.perf_counter()
+    dataset = build_api_dataset(
+        users=options["users"],
+        boards=options["boards"],
+        tasks_per_board=options["tasks_per_board"],
+        comments_per_task=options["comments_per_task"],
+        members_per_board=options["members_per_board"],
+    )
+    log(
+        f"Seeded {Boards.objects.count()} boards / {Task.objects.count()} tasks "
+        f"in {time.perf_counter() - started:.1f}s"
+    )
+
+    token = dataset["token"].key
+
+    def make_client():
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+        return client
+
+    selected = set(options["operations"] or [])
+    results = []
+    for name, operation in api_operations(dataset, options["requests"]):
+        if selected and name not in selected:
+            continue
+        # Warm-up request outside the measurement (imports, caches).
+        operation(make_client())
+        result = run_concurrent(
+            name, operation, options["requests"], options["concurrency"], make_client
+        )
+        log(
+            f"{name:<22} p50={result['p50_ms']:>8.2f}ms p95={result['p95_ms']:>8.2f}ms "
+            f"p99={result['p99_ms']:>8.2f}ms {result['requests_per_sec']:>8.1f} req/s "
+            f"{result['queries_per_request']:>6.2f} q/req errors={result['errors']}"
+        )
+        results.append(result)
+    return {
+        "dataset": {
+            "users": options["users"],
+            "boards": options["boards"],
+            "tasks_per_board": options["tasks_per_board"],
+            "comments_per_task": options["comments_per_task"],
+            "members_per_board": options["members_per_board"],
+        },
+        "results": results,
+    }
+
+
+def analyze_tables():
+    """
+    Refresh planner statistics after bulk loading.
+    """
+    if connection.vendor in ("sqlite", "postgresql"):
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+
+def time_callables(callables, repeat):
+    """
+    Run every (name, callable) `repeat` times and return latency summaries.
+    """
+    results = {}
+    for name, run in callables:
+        run()
+        latencies = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            run()
+            latencies.append(time.perf_counter() - started)
+        results[name] = summarize(name, latencies, 0, 0, sum(latencies))
+    return results
+
+
+@contextmanager
+def indexes_dropped(models):
+    """
+    Temporarily drop the Meta.indexes of the given models.
+    """
+    dropped = [(model, index) for model in models for index in model._meta.indexes]
+    with connection.schema_editor() as editor:
+        for model, index in dropped:
+            editor.remove_index(model, index)
+    analyze_tables()
+    try:
+        yield
+    finally:
+        with connection.schema_editor() as editor:
+            for model, index in dropped:
+                editor.add_index(model, index)
+        analyze_tables()
+
+
+def build_task_dataset(options, log, words=(), due_dates=(None,)):
+    """
+    Seed boards × tasks_per_board tasks, assigned and reviewed across all users.
+
+    `words` are appended to the task titles and `due_dates` cycled
+    through, see synthetic.create_tasks().
+
+    Returns:
+        dict: users, board_ids and commented_task_ids.
+    """
+    started = time.perf_counter()
+    users = synthetic.create_users(max(options["users"], 1), prefix="bench")
+    board_ids, commented_task_ids = [], []
+    for index in range(options["boards"]):
+        owner = users[index % len(users)]
+        board = synthetic.create_boards(
+            owner, 1, members=users[: options["members_per_board"]], prefix="Bench board"
+        )[0]
+        tasks = synthetic.create_tasks(
+            board,
+            options["tasks_per_board"],
+            assignees=users,
+            reviewers=[*users, None],
+            creator=owner,
+            words=words,
+            due_dates=due_dates,
+        )
+        if tasks and options["comments_per_task"]:
+            synthetic.create_comments(tasks[0], options["comments_per_task"], authors=users)
+            commented_task_ids.append(tasks[0].pk)
+        board_ids.append(board.pk)
+        if (index + 1) % 100 == 0:
+            log(f"  seeded {index + 1}/{options['boards']} boards")
+    analyze_tables()
+    log(
+        f"Seeded {Task.objects.count()} tasks on {len(board_ids)} boards "
+        f"in {time.perf_counter() - started:.1f}s"
+    )
+    return {"users": users, "board_ids": board_ids, "commented_task_ids": commented_task_ids}
+
+
+def run_index_scenario(options, log):
+    """
+    Compare the hot task/comment queries with and without the
+    composite/partial indexes of Task and Comment.
+
+    For the 1M task measurement use e.g.
+    `--boards 1000 --tasks-per-board 1000 --users 200`.
+    """
+    dataset = build_task_dataset(options, log)
+    users, board_ids = dataset["users"], dataset["board_ids"]
+    commented = dataset["commented_task_ids"] or [None]
+
+    queries = [
+        ("board-to-do-count", lambda: Task.objects.filter(
+            board_id=random.choice(board_ids), status=Task.Status.TODO).count()),
+        ("board-high-prio-count", lambda: Task.objects.filter(
+            board_id=random.choice(board_ids), priority=Task.Priority.HIGH).count()),
+        ("assigned-to-me-page", lambda: list(Task.objects.filter(
+            assignee=random.choice(users)).order_by("id").values_list("id", flat=True)[:50])),
+        ("reviewing-page", lambda: list(Task.objects.filter(
+            reviewer=random.choice(users)).order_by("id").values_list("id", flat=True)[:50])),
+        ("comments-of-task", lambda: list(Comment.objects.filter(
+            task_id=random.choice(commented)).order_by("-id").values_list("id", flat=True))),
+    ]
+
+    repeat = options["requests"]
+    with_indexes = time_callables(queries, repeat)
+    with indexes_dropped([Task, Comment]):
+        without_indexes = time_callables(queries, repeat)
+
+    results = []
+    for name, _ in queries:
+        indexed, plain = with_indexes[name], without_indexes[name]
+        speedup = round(plain["p50_ms"] / indexed["p50_ms"], 1) if indexed["p50_ms"] else None
+        log(
+            f"{name:<22} p50 {plain['p50_ms']:>9.3f}ms -> {indexed['p50_ms']:>8.3f}ms "
+            f"p95 {plain['p95_ms']:>9.3f}ms -> {indexed['p95_ms']:>8.3f}ms (x{speedup})"
+        )
+        results.append({
+            "name": name,
+            "with_indexes": indexed,
+            "without_indexes": plain,
+            "p50_speedup": speedup,
+        })
+    return {
+        "dataset": {"tasks": Task.objects.count(), "boards": len(board_ids), "users": len(users)},
+        "results": results,
+    }
+
+
+def measure_cpu(operation, repeat):
+    """
+    Return the average process CPU time of `operation` in milliseconds.
+    """
+    started = time.process_time()
+    for _ in range(repeat):
+        operation()
+    return (time.process_time() - started) * 1000 / repeat
+
+
+class SSEConnection:
+    """
+    One Server-Sent Events client, driving the ASGI application in-process.
+    """
+
+    def __init__(self, application, path, token):
+        self.application = application
+        self.scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "root_path": "",
+            "query_string": f"token={token}".encode(),
+            "headers": [(b"host", b"testserver")],
+            "server": ("testserver", 80),
+            "client": ("127.0.0.1", 0),
+        }
+        self.status = None
+        self.events = 0
+        self.subscribed = asyncio.Event()
+        self.received = asyncio.Event()
+        self.closed = asyncio.Event()
+        self.task = None
+
+    def open(self):
+        self.task = asyncio.ensure_future(self.application(self.scope, self.receive, self.send))
+
+    async def receive(self):
+        if not hasattr(self, "_requested"):
+            self._requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await self.closed.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(self, message):
+        if message["type"] == "http.response.start":
+            self.status = message["status"]
+        elif message["type"] == "http.response.body":
+            body = message.get("body", b"")
+            if b"event: subscribed" in body:
+                self.subscribed.set()
+            elif b"event: " in body:
+                self.events += 1
+                self.received.set()
+
+    async def close(self):
+        self.closed.set()
+        await asyncio.gather(self.task, return_exceptions=True)
+
+
+async def measure_push(board_id, token, connections, changes, change_task):
+    """
+    Open `connections` SSE streams of a board and push `changes` events.
+
+    Returns:
+        dict: memory per idle connection, idle CPU time per second and
+        fan-out latency and CPU time per change.
+    """
+    from asgiref.sync import sync_to_async
+
+    from core.asgi import application
+
+    path = f"/api/boards/{board_id}/events/"
+    clients = [SSEConnection(application, path, token) for _ in range(connections)]
+    tracemalloc.start()
+    memory_before = tracemalloc.get_traced_memory()[0]
+    for client in clients:
+        client.open()
+    await asyncio.gather(*(client.subscribed.wait() for client in clients))
+    memory_per_connection = (tracemalloc.get_traced_memory()[0] - memory_before) / connections
+    tracemalloc.stop()
+    failed = sum(client.status != 200 for client in clients)
+
+    idle_seconds = 2
+    cpu_started = time.process_time()
+    await asyncio.sleep(idle_seconds)
+    idle_cpu_ms = (time.process_time() - cpu_started) * 1000 / idle_seconds
+
+    latencies, cpu = [], 0.0
+    for _ in range(changes):
+        for client in clients:
+            client.received.clear()
+        started, cpu_started = time.perf_counter(), time.process_time()
+        await sync_to_async(change_task)()
+        await asyncio.gather(*(client.received.wait() for client in clients))
+        latencies.append(time.perf_counter() - started)
+        cpu += time.process_time() - cpu_started
+
+    await asyncio.gather(*(client.close() for client in clients))
+    latencies.sort()
+    return {
+        "failed_connections": failed,
+        "memory_kb_per_connection": round(memory_per_connection / 1024, 2),
+        "idle_cpu_ms_per_sec": round(idle_cpu_ms, 2),
+        "fanout_p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "fanout_p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "cpu_ms_per_change": round(cpu * 1000 / changes, 2),
+    }
+
+
+def run_push_scenario(options, log):
+    """
+    Compare the server cost of polling with the cost of push channels.
+
+    --connections clients follow the same board:
+    - poll: every client sends a conditional GET of the board detail every
+      --poll-interval seconds and reloads it after a change. Costs are
+      extrapolated from the measured CPU time of --requests 304 answers
+      and full responses.
+    - push: the clients hold Server-Sent Event streams, opened through
+      the ASGI application (core.asgi) in this process. Measured are
+      memory per connection, idle CPU time and, for --requests task
+      updates, the time and CPU until every client got the event.
+    """
+    connections = options["connections"]
+    interval = options["poll_interval"]
+    changes = options["requests"]
+    dataset = build_api_dataset(
+        users=options["users"],
+        boards=1,
+        tasks_per_board=options["tasks_per_board"],
+        comments_per_task=options["comments_per_task"],
+        members_per_board=options["members_per_board"],
+    )
+    board_id, token = dataset["board_ids"][0], dataset["token"].key
+    task = Task.objects.get(pk=dataset["task_ids"][0])
+
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+    url = f"/api/boards/{board_id}/"
+    etag = client.get(url)["ETag"]
+    poll_cpu = measure_cpu(lambda: client.get(url, HTTP_IF_NONE_MATCH=etag), changes)
+    full_cpu = measure_cpu(lambda: client.get(url), max(1, changes // 10))
+    poll = {
+        "requests_per_sec": round(connections / interval, 1),
+        "cpu_ms_per_request": round(poll_cpu, 3),
+        "idle_cpu_ms_per_sec": round(connections / interval * poll_cpu, 2),
+        "cpu_ms_per_change": round(connections * full_cpu, 2),
+        "max_delay_s": interval,
+    }
+    log(
+        f"poll  {connections} clients every {interval}s: {poll['requests_per_sec']} req/s, "
+        f"idle {poll['idle_cpu_ms_per_sec']} CPU-ms/s, {poll['cpu_ms_per_change']} CPU-ms per change"
+    )
+
+    def change_task():
+        task.title = f"Pushed {time.perf_counter()}"
+        task.save()
+
+    push = asyncio.run(measure_push(board_id, token, connections, changes, change_task))
+    log(
+        f"push  {connections} SSE streams: {push['memory_kb_per_connection']} KB/connection, "
+        f"idle {push['idle_cpu_ms_per_sec']} CPU-ms/s, {push['cpu_ms_per_change']} CPU-ms per change, "
+        f"fan-out p50={push['fanout_p50_ms']}ms p95={push['fanout_p95_ms']}ms"
+    )
+    return {
+        "dataset": {
+            "connections": connections,
+            "poll_interval_s": interval,
+            "tasks_per_board": options["tasks_per_board"],
+            "members_per_board": options["members_per_board"],
+        },
+        "results": {"poll": poll, "push": push},
+    }
+
+
+def read_paths(dataset):
+    """
+    Return the endpoints of the async read path (core.async_api) as
+    (name, callable() -> path) pairs.
+    """
+    board_ids = dataset["board_ids"]
+    commented_task_ids = dataset["commented_task_ids"]
+    return [
+        ("boards-list", lambda: "/api/boards/"),
+        ("board-detail", lambda: f"/api/boards/{random.choice(board_ids)}/"),
+        ("tasks-assigned-to-me", lambda: "/api/tasks/assigned-to-me/"),
+        ("tasks-reviewing", lambda: "/api/tasks/reviewing/"),
+        ("comments-list", lambda: f"/api/tasks/{random.choice(commented_task_ids)}/comments/"),
+    ]
+
+
+class ThreadSampler:
+    """
+    Record the peak number of live threads while the block runs.
+    """
+
+    def __enter__(self):
+        self.peak = threading.active_count()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def _sample(self):
+        while not self._stop.wait(0.005):
+            self.peak = max(self.peak, threading.active_count())
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+
+def wsgi_get(application, environ):
+    """
+    Send one request through a WSGI application and return the status code.
+    """
+    statuses = []
+    body = application(environ, lambda status, headers, exc_info=None: statuses.append(status))
+    try:
+        b"".join(body)
+    finally:
+        body.close()
+    return int(statuses[0].split()[0])
+
+
+async def asgi_get(application, path, headers):
+    """
+    Send one GET through an ASGI application and return the status code.
+    """
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"testserver"), *headers],
+        "server": ("testserver", 80),
+        "client": ("127.0.0.1", 0),
+    }
+    finished = asyncio.Event()
+    requested = False
+    status = None
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body" and not message.get("more_body"):
+            finished.set()
+
+    await application(scope, receive, send)
+    finished.set()
+    return status
+
+
+def run_wsgi_clients(paths, token, clients, rounds):
+    """
+    Run `clients` threads against core.wsgi, each sending every request
+    of `paths` `rounds` times. Returns (latencies per path name, errors).
+    """
+    from django.test import RequestFactory
+
+    from core.wsgi import application
+
+    factory = RequestFactory()
+    latencies = {name: [] for name, _ in paths}
+    errors = []
+    start = threading.Barrier(clients)
+
+    def client():
+        start.wait()
+        for _ in range(rounds):
+            for name, path in paths:
+                environ = factory.get(path(), HTTP_AUTHORIZATION=f"Token {token}").environ
+                started = time.perf_counter()
+                status = wsgi_get(application, environ)
+                latencies[name].append(time.perf_counter() - started)
+                if status >= 400:
+                    errors.append(status)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, len(errors)
+
+
+async def run_asgi_clients(paths, token, clients, rounds):
+    """
+    Run `clients` tasks on one event loop against core.asgi, each sending
+    every request of `paths` `rounds` times. Returns (latencies per path
+    name, errors).
+    """
+    from core.asgi import application
+
+    headers = [(b"authorization", f"Token {token}".encode())]
+    latencies = {name: [] for name, _ in paths}
+    errors = 0
+
+    async def client():
+        nonlocal errors
+        for _ in range(rounds):
+            for name, path in paths:
+                started = time.perf_counter()
+                status = await asgi_get(application, path(), headers)
+                latencies[name].append(time.perf_counter() - started)
+                if status >= 400:
+                    errors += 1
+
+    await asyncio.gather(*(client() for _ in range(clients)))
+    return latencies, errors
+
+
+def run_async_scenario(options, log):
+    """
+    Compare the sync viewsets under WSGI with the async read path under
+    ASGI (core.async_api) at high concurrency.
+
+    --connections clients start at the same time. Every client requests
+    the board list, a board detail, assigned-to-me, reviewing and a
+    comment list, max(1, --requests // --connections) times each.
+    - wsgi: one thread per client calls core.wsgi.application, like a
+      threaded WSGI server with a thread for every open connection.
+    - asgi: one asyncio task per client calls core.asgi.application on
+      a single event loop, like an ASGI server.
+
+    Reported per mode and endpoint: latency percentiles and requests/sec,
+    plus the peak number of threads and the CPU time per request.
+    """
+    clients = options["connections"]
+    rounds = max(1, options["requests"] // clients)
+    dataset = build_api_dataset(
+        users=options["users"],
+        boards=options["boards"],
+        tasks_per_board=options["tasks_per_board"],
+        comments_per_task=options["comments_per_task"],
+        members_per_board=options["members_per_board"],
+    )
+    token = dataset["token"].key
+    paths = read_paths(dataset)
+    # Rendered payloads and the token are cached by the first requests.
+    run_wsgi_clients(paths, token, 1, 1)
+    connections.close_all()
+
+    drivers = {
+        "wsgi": lambda: run_wsgi_clients(paths, token, clients, rounds),
+        "asgi": lambda: asyncio.run(run_asgi_clients(paths, token, clients, rounds)),
+    }
+    results = {}
+    for mode, drive in drivers.items():
+        with ThreadSampler() as threads:
+            started, cpu_started = time.perf_counter(), time.process_time()
+            latencies, errors = drive()
+            wall_time = time.perf_counter() - started
+            cpu = time.process_time() - cpu_started
+        requests = sum(len(values) for values in latencies.values())
+        results[mode] = {
+            "requests": requests,
+            "errors": errors,
+            "requests_per_sec": round(requests / wall_time, 1),
+            "cpu_ms_per_request": round(cpu * 1000 / requests, 3),
+            "peak_threads": threads.peak,
+            "operations": [
+                summarize(name, values, 0, 0, wall_time) for name, values in latencies.items()
+            ],
+        }
+        log(
+            f"{mode}  {clients} clients: {results[mode]['requests_per_sec']} req/s, "
+            f"{results[mode]['cpu_ms_per_request']} CPU-ms/req, "
+            f"peak {threads.peak} threads, errors={errors}"
+        )
+        for result in results[mode]["operations"]:
+            log(
+                f"  {result['name']:<22} p50={result['p50_ms']:>9.2f}ms "
+                f"p95={result['p95_ms']:>9.2f}ms p99={result['p99_ms']:>9.2f}ms"
+            )
+        connections.close_all()
+    return {
+        "dataset": {
+            "clients": clients,
+            "rounds": rounds,
+            "boards": options["boards"],
+            "tasks_per_board": options["tasks_per_board"],
+            "comments_per_task": options["comments_per_task"],
+        },
+        "results": results,
+    }
+
+
+def measure_list_memory(client, url):
+    """
+    GET a list and consume it like a server sending it to a socket.
+
+    Returns:
+        tuple: (peak traced memory in bytes, body length, body SHA-256).
+    """
+    digest = hashlib.sha256()
+    length = 0
+    tracemalloc.start()
+    try:
+        response = client.get(url)
+        parts = response.streaming_content if response.streaming else [response.content]
+        for part in parts:
+            digest.update(part)
+            length += len(part)
+        del response, parts
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return peak, length, digest.hexdigest()
+
+
+def run_streaming_scenario(options, log):
+    """
+    Compare the peak memory of buffered and streamed list responses.
+
+    For every --rows size the benchmark user is assigned that many tasks
+    in total, and GET /api/tasks/assigned-to-me/ is measured twice with
+    tracemalloc: buffered (KANMIND_STREAM_CHUNK_SIZE above the size) and
+    streamed with the configured chunk size (core.streaming). The bodies
+    must be identical.
+    """
+    from django.test.utils import override_settings
+
+    from core import streaming
+
+    sizes = sorted(options["rows"] or DEFAULT_STREAMING_ROWS)
+    dataset = build_api_dataset(
+        users=options["users"], boards=1, tasks_per_board=0, comments_per_task=0,
+        members_per_board=options["members_per_board"],
+    )
+    user, token = dataset["user"], dataset["token"].key
+    board = Boards.objects.get(pk=dataset["board_ids"][0])
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+    url = "/api/tasks/assigned-to-me/"
+
+    results, created = [], 0
+    for size in sizes:
+        synthetic.create_tasks(board, size - created, assignees=[user], creator=user)
+        created = size
+        client.get(url)  # Warm-up (imports, token cache).
+        with override_settings(KANMIND_STREAM_CHUNK_SIZE=size + 1):
+            started = time.perf_counter()
+            buffered_peak, length, buffered_digest = measure_list_memory(client, url)
+            buffered_ms = (time.perf_counter() - started) * 1000
+        started = time.perf_counter()
+        streamed_peak, _, streamed_digest = measure_list_memory(client, url)
+        streamed_ms = (time.perf_counter() - started) * 1000
+        result = {
+            "rows": size,
+            "body_kb": round(length / 1024, 1),
+            "identical": buffered_digest == streamed_digest,
+            "buffered_peak_kb": round(buffered_peak / 1024, 1),
+            "streamed_peak_kb": round(streamed_peak / 1024, 1),
+            "buffered_ms": round(buffered_ms, 1),
+            "streamed_ms": round(streamed_ms, 1),
+        }
+        log(
+            f"{size:>7} rows ({result['body_kb']} KB): buffered peak {result['buffered_peak_kb']} KB "
+            f"in {result['buffered_ms']}ms, streamed peak {result['streamed_peak_kb']} KB "
+            f"in {result['streamed_ms']}ms, identical={result['identical']}"
+        )
+        results.append(result)
+    return {"dataset": {"chunk_size": streaming.chunk_size()}, "results": results}
+
+
+def measure_export(board_ids, export_format, trace=False):
+    """
+    Render the export of `board_ids` and discard it, like a client
+    download.
+
+    Returns:
+        dict: records, seconds, rows_per_s, body_mb and, with `trace`,
+        peak_kb (peak traced memory).
+    """
+    from boards_app import export
+
+    records, length = 0, 0
+
+    def counted(items):
+        nonlocal records
+        for item in items:
+            records += 1
+            yield item
+
+    if trace:
+        tracemalloc.start()
+    try:
+        started = time.perf_counter()
+        for block in export.render(counted(export.export_records(board_ids)), export_format):
+            length += len(block)
+        seconds = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1] if trace else None
+    finally:
+        if trace:
+            tracemalloc.stop()
+    result = {
+        "records": records,
+        "seconds": round(seconds, 2),
+        "rows_per_s": round(records / seconds) if seconds else 0,
+        "body_mb": round(length / 1024 / 1024, 1),
+    }
+    if trace:
+        result["peak_kb"] = round(peak / 1024, 1)
+    return result
+
+
+def run_export_scenario(options, log):
+    """
+    Measure the throughput and peak memory of the board export.
+
+    Seeds --boards × --tasks-per-board tasks (build_task_dataset()) and
+    exports all boards in every format (boards_app.export), reporting
+    records per second. Peak memory is measured separately with
+    tracemalloc, which slows the export down, on the first boards holding
+    each --rows number of tasks: with chunked reads it must stay flat as
+    the export grows.
+    """
+    from boards_app import export
+
+    dataset = build_task_dataset(options, log)
+    board_ids = dataset["board_ids"]
+    per_board = max(options["tasks_per_board"], 1)
+
+    results = []
+    for export_format in export.FORMATS:
+        result = {"format": export_format, "boards": len(board_ids), **measure_export(board_ids, export_format)}
+        log(
+            f"{export_format:>6}: {result['records']} records ({result['body_mb']} MB) "
+            f"in {result['seconds']}s = {result['rows_per_s']} rows/s"
+        )
+        results.append(result)
+
+    memory = []
+    for size in sorted(options["rows"] or DEFAULT_EXPORT_ROWS):
+        subset = board_ids[: max(1, -(-size // per_board))]
+        result = {"tasks": len(subset) * per_board, **measure_export(subset, "ndjson", trace=True)}
+        log(
+            f"  memory: {result['tasks']:>8} tasks, {result['records']} records: "
+            f"peak {result['peak_kb']} KB"
+        )
+        memory.append(result)
+    return {
+        "dataset": {"boards": len(board_ids), "tasks": len(board_ids) * options["tasks_per_board"]},
+        "results": results,
+        "memory": memory,
+    }
+
+
+def run_import_scenario(options, log):
+    """
+    Measure the throughput of the bulk import against per-row creates.
+
+    Seeds --boards × --tasks-per-board tasks (build_task_dataset()),
+    exports them in every format (boards_app.export) and imports each
+    file as new boards of the first user (boards_app.importer), reporting
+    rows per second. The baseline creates --requests tasks one by one
+    with POST /api/tasks/, as a client migrating without the import would.
+    """
+    import os
+    import tempfile
+
+    from boards_app import export, importer
+
+    dataset = build_task_dataset(options, log)
+    owner = dataset["users"][0]
+    board_id = dataset["board_ids"][0]
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {Token.objects.create(user=owner).key}")
+    started = time.perf_counter()
+    for index in range(options["requests"]):
+        response = client.post(
+            "/api/tasks/",
+            {"board": board_id, "title": f"Baseline {index}", "assignee_id": owner.pk},
+            format="json",
+        )
+        assert response.status_code == 201, response.content
+    seconds = time.perf_counter() - started
+    baseline = {"rows": options["requests"], "seconds": round(seconds, 2),
+                "rows_per_s": round(options["requests"] / seconds)}
+    log(f"POST /api/tasks/: {baseline['rows']} rows in {baseline['seconds']}s = {baseline['rows_per_s']} rows/s")
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for import_format in export.FORMATS:
+            path = os.path.join(directory, f"export.{import_format}")
+            with open(path, "w", encoding="utf-8", newline="") as output:
+                for block in export.render(export.export_records(dataset["board_ids"]), import_format):
+                    output.write(block)
+            with open(path, "rb") as source:
+                summary = importer.import_rows(owner, source, import_format)
+            result = {"format": import_format, **summary}
+            log(
+                f"{import_format:>6}: {summary['rows']} rows ({summary['created']}) in "
+                f"{summary['seconds']:.1f}s = {summary['rows_per_second']} rows/s, "
+                f"{summary['errors']} errors"
+            )
+            results.append(result)
+    return {
+        "dataset": {"boards": len(dataset["board_ids"]), "tasks_per_board": options["tasks_per_board"]},
+        "baseline": baseline,
+        "results": results,
+    }
+
+
+# Search terms of the search scenario and the share of tasks whose title
+# contains them.
+SEARCH_TERMS = {"rare": 0.0001, "medium": 0.01, "common": 0.1}
+
+
+def search_words(seed, size=10000):
+    """
+    Return `size` title words in which each SEARCH_TERMS word has its
+    share, the others are distinct filler words.
+    """
+    words = [term for term, share in SEARCH_TERMS.items() for _ in range(max(1, round(share * size)))]
+    words += [f"filler{index}" for index in range(size - len(words))]
+    random.Random(seed).shuffle(words)
+    return words
+
+
+def run_search_scenario(options, log):
+    """
+    Compare the indexed task search with a naive icontains scan.
+
+    Seeds --boards × --tasks-per-board tasks whose titles contain the
+    SEARCH_TERMS with their shares (build_task_dataset()). For every term
+    (and the pair "task medium") GET /api/tasks/search/ is timed
+    --requests times as the first user, who is a member of every board,
+    next to the icontains fallback of tasks_app.search for the same page.
+    """
+    from tasks_app import search
+
+    dataset = build_task_dataset(options, log, words=search_words(options["seed"]))
+    user = dataset["users"][0]
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {Token.objects.create(user=user).key}")
+    repeat = max(1, options["requests"])
+
+    def timed(operation):
+        operation()  # Warm-up.
+        latencies = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            operation()
+            latencies.append((time.perf_counter() - started) * 1000)
+        latencies.sort()
+        return {"p50_ms": round(percentile(latencies, 50), 2), "p95_ms": round(percentile(latencies, 95), 2)}
+
+    results = []
+    for term in [*SEARCH_TERMS, "task medium"]:
+        response = client.get("/api/tasks/search/", {"q": term})
+        count = response.json()["count"]
+        indexed = timed(lambda: client.get("/api/tasks/search/", {"q": term}))
+        results_fallback = search.SearchResults(user, term)
+
+        def scan():
+            queryset = results_fallback._fallback()
+            return queryset.count(), list(queryset[:20])
+
+        scanned = timed(scan)
+        result = {"q": term, "count": count, "indexed": indexed, "icontains": scanned}
+        log(
+            f"{term!r:>16}: {count:>7} matches, search p50 {indexed['p50_ms']}ms "
+            f"p95 {indexed['p95_ms']}ms, icontains p50 {scanned['p50_ms']}ms"
+        )
+        results.append(result)
+    return {
+        "dataset": {"boards": len(dataset["board_ids"]), "tasks": Task.objects.count()},
+        "results": results,
+    }
+
+
+def response_body(response):
+    """
+    Return the body of a (possibly streamed) response.
+    """
+    if response.streaming:
+        return b"".join(response.streaming_content)
+    return response.content
+
+
+def run_filter_scenario(options, log):
+    """
+    Compare downloading the whole task list with server-side filters.
+
+    Seeds --boards × --tasks-per-board tasks with due dates over 90 days
+    (build_task_dataset()). The first user, a member of every board,
+    requests the full GET /api/tasks/ (what a client filtering locally
+    downloads) and filtered lists of tasks_app.filters, --requests times
+    each. Filtered lists are timed with and without the Task indexes.
+    """
+    today = date.today()
+    due_dates = [today + timedelta(days=offset) for offset in range(90)] + [None]
+    dataset = build_task_dataset(options, log, due_dates=due_dates)
+    user, board_id = dataset["users"][0], dataset["board_ids"][0]
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {Token.objects.create(user=user).key}")
+    week = {"due_after": today.isoformat(), "due_before": (today + timedelta(days=6)).isoformat()}
+    requests = [
+        ("all-tasks", "/api/tasks/", {}),
+        ("board-to-do", "/api/tasks/", {"board": board_id, "status": "to-do"}),
+        ("high-priority", "/api/tasks/", {"priority": "high", "page_size": 50}),
+        ("due-this-week", "/api/tasks/", {**week, "ordering": "due_date"}),
+        (
+            "assigned-high-priority",
+            "/api/tasks/assigned-to-me/",
+            {"priority": "high", "ordering": "-updated_at", "page_size": 50},
+        ),
+    ]
+    sizes = {}
+    for name, url, params in requests:
+        response = client.get(url, params)
+        assert response.status_code == 200, (name, response.status_code)
+        sizes[name] = len(response_body(response))
+
+    def fetch(url, params):
+        return lambda: response_body(client.get(url, params))
+
+    callables = [(name, fetch(url, params)) for name, url, params in requests]
+    repeat = max(1, options["requests"])
+    with_indexes = time_callables(callables, repeat)
+    with indexes_dropped([Task]):
+        without_indexes = time_callables(callables[1:], repeat)
+
+    results = []
+    for name, _, _ in requests:
+        indexed, plain = with_indexes[name], without_indexes.get(name)
+        result = {"name": name, "body_kb": round(sizes[name] / 1024, 1), "with_indexes": indexed}
+        line = f"{name:<22} {result['body_kb']:>10} KB  p50 {indexed['p50_ms']:>9.2f}ms"
+        if plain is not None:
+            result["without_indexes"] = plain
+            line += f" (without indexes {plain['p50_ms']:.2f}ms)"
+        log(line)
+        results.append(result)
+    return {
+        "dataset": {"tasks": Task.objects.count(), "boards": len(dataset["board_ids"])},
+        "results": results,
+    }
+
+
+def run_email_scenario(options, log):
+    """
+    Compare the email lookups of registration, login and email-check
+    before and after the unique email index (user_auth_app.emails).
+
+    Seeds --users users in chunks and looks up --requests random emails
+    (in mixed case) per operation: the former `email__iexact` lookup of
+    email-check and exact `email` check of registration, both unindexed,
+    next to the indexed lookup and GET /api/email-check/. Inviting 50
+    members is timed as 50 email-checks and as one batch request.
+
+    For the 1M user measurement use `--users 1000000`.
+    """
+    from user_auth_app import emails
+
+    started = time.perf_counter()
+    count, chunk_size = max(options["users"], 1), 10000
+    for chunk in range(0, count, chunk_size):
+        synthetic.create_users(min(chunk_size, count - chunk), prefix=f"email{chunk // chunk_size}")
+        if (chunk // chunk_size + 1) % 10 == 0:
+            log(f"  seeded {chunk + chunk_size}/{count} users")
+    analyze_tables()
+    log(f"Seeded {User.objects.count()} users in {time.perf_counter() - started:.1f}s")
+
+    rng = random.Random(options["seed"])
+    addresses = list(
+        User.objects.filter(pk__in=[rng.randint(1, count) for _ in range(200)])
+        .values_list("email", flat=True)
+    )
+
+    def random_email():
+        return rng.choice(addresses).upper()
+
+    client = APIClient()
+    client.force_authenticate(User.objects.order_by("pk").first())
+    lookups = [
+        ("iexact (email-check before)", lambda: User.objects.filter(email__iexact=random_email()).first()),
+        ("exact (registration before)", lambda: User.objects.filter(email=random_email()).exists()),
+        ("indexed find_user()", lambda: emails.find_user(random_email())),
+        ("indexed exists()", lambda: emails.by_email(random_email()).exists()),
+        ("GET /api/email-check/", lambda: client.get("/api/email-check/", {"email": random_email()})),
+        ("50 x GET /api/email-check/", lambda: [
+            client.get("/api/email-check/", {"email": random_email()}) for _ in range(50)]),
+        ("POST /api/email-check/batch/ (50)", lambda: client.post(
+            "/api/email-check/batch/", {"emails": [random_email() for _ in range(50)]}, format="json")),
+    ]
+    timings = time_callables(lookups, max(1, options["requests"]))
+    results = []
+    for name, _ in lookups:
+        timing = timings[name]
+        log(f"{name:<34} p50 {timing['p50_ms']:>9.3f}ms p95 {timing['p95_ms']:>9.3f}ms")
+        results.append(timing)
+    return {"dataset": {"users": User.objects.count()}, "results": results}
+
+
+# Scenarios selectable with `manage.py bench --scenario`.
+SCENARIOS = {
+    "api": run_api_scenario,
+    "async": run_async_scenario,
+    "emails": run_email_scenario,
+    "export": run_export_scenario,
+    "filters": run_filter_scenario,
+    "import": run_import_scenario,
+    "indexes": run_index_scenario,
+    "push": run_push_scenario,
+    "search": run_search_scenario,
+    "streaming": run_streaming_scenario,
+}
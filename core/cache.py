@@ -0,0 +1,120 @@
+"""
+Local-memory cache backend with a memory bound and hit/miss counters.
+
+BoundedLocMemCache behaves like Django's LocMemCache (least recently used
+entries are culled beyond MAX_ENTRIES) and additionally:
+
+- evicts least recently used entries while the pickled size of all
+  entries exceeds OPTIONS["MAX_BYTES"]; single values larger than the
+  bound are not stored at all
+- counts hits, misses and evictions, see stats()
+
+Like LocMemCache, the data and counters are per process.
+"""
+
+from collections import Counter
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.cache.backends.locmem import LocMemCache
+
+# Per cache name, like the stores of LocMemCache.
+_sizes = {}
+_stats = {}
+
+_MISSING = object()
+
+
+class BoundedLocMemCache(LocMemCache):
+
+    def __init__(self, name, params):
+        super().__init__(name, params)
+        max_bytes = params.get("OPTIONS", {}).get("MAX_BYTES")
+        self._max_bytes = int(max_bytes) if max_bytes else None
+        self._sizes = _sizes.setdefault(name, {})
+        self._stats = _stats.setdefault(name, Counter())
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _MISSING, version=version)
+        with self._lock:
+            self._stats["hits" if value is not _MISSING else "misses"] += 1
+        return default if value is _MISSING else value
+
+    def _set(self, key, value, timeout=DEFAULT_TIMEOUT):
+        self._forget(key)
+        if self._max_bytes is not None and len(value) > self._max_bytes:
+            self._cache.pop(key, None)
+            self._expire_info.pop(key, None)
+            return
+        super()._set(key, value, timeout)
+        self._sizes[key] = len(value)
+        self._stats["bytes"] += len(value)
+        while self._max_bytes is not None and self._stats["bytes"] > self._max_bytes:
+            self._evict_oldest()
+
+    def _evict_oldest(self):
+        key, _ = self._cache.popitem()
+        del self._expire_info[key]
+        self._forget(key)
+        self._stats["evictions"] += 1
+
+    def _cull(self):
+        if self._cull_frequency == 0:
+            self._clear()
+        else:
+            for _ in range(len(self._cache) // self._cull_frequency):
+                self._evict_oldest()
+
+    def _forget(self, key):
+        self._stats["bytes"] -= self._sizes.pop(key, 0)
+
+    def _delete(self, key):
+        deleted = super()._delete(key)
+        if deleted:
+            self._forget(key)
+        return deleted
+
+    def _clear(self):
+        self._cache.clear()
+        self._expire_info.clear()
+        self._sizes.clear()
+        self._stats["bytes"] = 0
+
+    def clear(self):
+        with self._lock:
+            self._clear()
+
+    def stats(self):
+        """
+        Return hit/miss/eviction counters and the current memory use.
+        """
+        with self._lock:
+            hits, misses = self._stats["hits"], self._stats["misses"]
+            return {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": round(hits / (hits + misses), 3) if hits + misses else None,
+                "evictions": self._stats["evictions"],
+                "entries": len(self._cache),
+                "bytes": self._stats["bytes"],
+                "max_bytes": self._max_bytes,
+                "max_entries": self._max_entries,
+            }
+
+    def reset_stats(self):
+        with self._lock:
+            for name in ("hits", "misses", "evictions"):
+                self._stats[name] = 0
+
+
+def cache_stats():
+    """
+    Return stats() of every configured cache alias that provides them.
+    """
+    from django.conf import settings
+
+    return {
+        alias: caches[alias].stats()
+        for alias in settings.CACHES
+        if hasattr(caches[alias], "stats")
+    }
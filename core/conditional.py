@@ -0,0 +1,78 @@
+"""
+Helpers for conditional GETs (ETag / Last-Modified).
+
+Views compute their validators from cheap version lookups (see
+boards_app.versions) before loading and serializing any data, answer
+matching If-None-Match / If-Modified-Since requests with 304, and attach
+the validators to full responses.
+"""
+
+import hashlib
+
+from django.http import Http404
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+# Request headers that make a GET conditional.
+CONDITIONAL_HEADERS = (
+    "HTTP_IF_NONE_MATCH",
+    "HTTP_IF_MODIFIED_SINCE",
+    "HTTP_IF_MATCH",
+    "HTTP_IF_UNMODIFIED_SINCE",
+)
+
+
+def is_conditional(request):
+    """
+    Return True if the request carries any precondition header.
+    """
+    return any(header in request.META for header in CONDITIONAL_HEADERS)
+
+
+def lookup_id(value):
+    """
+    Return the primary key of a detail URL as an int.
+
+    Validators are looked up before get_object(), so a malformed key
+    must end in the same 404 (Http404) instead of a database error. The
+    int also keeps the ETag independent of the spelling ("07" and "7").
+    """
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise Http404
+
+
+def make_etag(*parts):
+    """
+    Return a strong, quoted ETag derived from the given parts.
+    """
+    digest = hashlib.sha1(":".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def set_validators(response, etag, last_modified=None):
+    """
+    Attach ETag and, if given, Last-Modified to a response.
+    """
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+    return response
+
+
+def conditional_response(request, etag, last_modified=None):
+    """
+    Evaluate the request's preconditions against the given validators.
+
+    Returns:
+        HttpResponse | None: 304 Not Modified if If-None-Match (or, without
+        it, If-Modified-Since) matches, 412 if If-Match fails, otherwise
+        None and the view builds the full response.
+    """
+    timestamp = int(last_modified.timestamp()) if last_modified is not None else None
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is None:
+        return None
+    return set_validators(response, etag, last_modified)
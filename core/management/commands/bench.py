@@ -0,0 +1,128 @@
+import json
+import platform
+import random
+import subprocess
+import time
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from core.bench import SCENARIOS, isolated_database
+
+
+class Command(BaseCommand):
+    """
+    Repeatable load benchmark for the Kanmind API.
+
+    The benchmark runs against a separate, freshly created database
+    (never the development database) and reports p50/p95/p99 latency,
+    requests/sec and queries per request for every operation.
+
+    Usage:
+        python manage.py bench
+        python manage.py bench --boards 50 --tasks-per-board 200 --concurrency 8
+        python manage.py bench --operation boards-list --operation board-detail
+        python manage.py bench --json bench.json
+        python manage.py bench --scenario push --connections 2000 --requests 20
+        python manage.py bench --scenario async --connections 500
+        python manage.py bench --scenario streaming --rows 10000 --rows 100000
+    """
+
+    help = "Benchmark the API against a synthetic dataset in an isolated database."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="api")
+        parser.add_argument("--users", type=int, default=20, help="Number of users.")
+        parser.add_argument("--boards", type=int, default=20, help="Number of boards.")
+        parser.add_argument("--tasks-per-board", type=int, default=50)
+        parser.add_argument("--comments-per-task", type=int, default=5)
+        parser.add_argument("--members-per-board", type=int, default=5)
+        parser.add_argument("--requests", type=int, default=200, help="Requests per operation.")
+        parser.add_argument("--concurrency", type=int, default=4, help="Concurrent worker threads.")
+        parser.add_argument(
+            "--connections",
+            type=int,
+            default=1000,
+            help="push scenario: clients following one board; async scenario: concurrent clients.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=5.0,
+            help="push scenario: seconds between two polls of a client.",
+        )
+        parser.add_argument(
+            "--rows",
+            type=int,
+            action="append",
+            help="streaming/export scenarios: rows to measure memory for (repeatable).",
+        )
+        parser.add_argument(
+            "--operation",
+            dest="operations",
+            action="append",
+            help="Only run the given operation (repeatable).",
+        )
+        parser.add_argument("--seed", type=int, default=1, help="Random seed for the dataset.")
+        parser.add_argument(
+            "--database",
+            help="Name of the benchmark database (SQLite: file path, default bench.sqlite3).",
+        )
+        parser.add_argument(
+            "--keep-database",
+            action="store_true",
+            help="Reuse and keep the benchmark database.",
+        )
+        parser.add_argument("--json", dest="json_path", help="Write results as JSON ('-' for stdout).")
+
+    def handle(self, *args, **options):
+        if options["requests"] < 1 or options["concurrency"] < 1:
+            raise CommandError("--requests and --concurrency must be positive.")
+
+        random.seed(options["seed"])
+
+        log = self.stderr.write if options["json_path"] == "-" else self.stdout.write
+        scenario = SCENARIOS[options["scenario"]]
+
+        started = time.perf_counter()
+        with isolated_database(options["database"], keep=options["keep_database"]):
+            report = scenario(options, log)
+            report["environment"] = self.environment()
+
+        report.update(
+            scenario=options["scenario"],
+            requests_per_operation=options["requests"],
+            concurrency=options["concurrency"],
+            total_seconds=round(time.perf_counter() - started, 2),
+        )
+
+        if options["json_path"] == "-":
+            self.stdout.write(json.dumps(report, indent=2))
+        elif options["json_path"]:
+            with open(options["json_path"], "w", encoding="utf-8") as handle:
+                json.dump(report, handle, indent=2)
+            log(self.style.SUCCESS(f"Results written to {options['json_path']}"))
+
+    def environment(self):
+        """
+        Describe the environment, so results can be compared across commits.
+        """
+        try:
+            commit = subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"],
+                cwd=settings.BASE_DIR,
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            commit = None
+        return {
+            "commit": commit,
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "debug": settings.DEBUG,
+        }
@@ -0,0 +1,106 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from core import profiling
+
+
+class RequestProfilingMiddleware:
+    """
+    Opt-in per-request SQL and timing instrumentation.
+
+    Enabled with the KANMIND_PROFILING setting. When disabled, the
+    middleware raises MiddlewareNotUsed at startup and Django removes it
+    from the middleware chain, so it costs nothing per request.
+
+    For every request it records:
+    - the resolved view/action (e.g. "TasksViewset.assigned_to_me")
+    - wall time, serializer time, DB query count and DB time
+    - SQL statements repeated KANMIND_PROFILING_DUPLICATE_THRESHOLD times
+      or more (N+1 patterns)
+
+    The measurements are returned as a `Server-Timing` header (plus
+    `X-Query-Count` and, if present, `X-Duplicate-Queries`) and are
+    aggregated in core.profiling.STATS, exposed to admins at
+    /api/stats/requests/.
+
+    Supports both sync and async chains (like
+    django.utils.decorators.sync_and_async_middleware): under ASGI it
+    does not force the async read path (core.async_api) into a thread.
+    Queries are recorded by a wrapper on every connection of the process
+    (core.profiling.record_query), which finds the request's profile in
+    a context variable in any thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, "KANMIND_PROFILING", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.duplicate_threshold = getattr(
+            settings, "KANMIND_PROFILING_DUPLICATE_THRESHOLD", 3
+        )
+        profiling.install_serializer_timing()
+        for connection in connections.all():
+            profiling.install_query_recording(connection)
+        connection_created.connect(profiling.install_query_recording)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        profile, token = self.start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            profiling.deactivate(token)
+        return self.finish(request, profile, response)
+
+    async def __acall__(self, request):
+        """
+        Async variant of __call__().
+        """
+        profile, token = self.start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            profiling.deactivate(token)
+        return self.finish(request, profile, response)
+
+    def start(self, request):
+        """
+        Attach a new profile to the request and activate it.
+
+        Returns:
+            tuple: The profile and the token for profiling.deactivate().
+        """
+        profile = profiling.RequestProfile(self.duplicate_threshold)
+        request.profile = profile
+        return profile, profiling.activate(profile)
+
+    def finish(self, request, profile, response):
+        """
+        Add the measurements to the response and the aggregated stats.
+        """
+        profile.finish()
+
+        if profile.view_name is None:
+            profile.view_name = f"unresolved {request.method}"
+        response["Server-Timing"] = profile.server_timing()
+        response["X-Query-Count"] = str(profile.queries)
+        duplicates = profile.duplicates
+        if duplicates:
+            response["X-Duplicate-Queries"] = str(sum(duplicates.values()))
+        profiling.STATS.record(profile, response.status_code)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        """
+        Remember which view/action handles the request.
+        """
+        request.profile.view_name = profiling.resolve_view_name(view_func, request.method)
@@ -0,0 +1,52 @@
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class OptInCursorPagination(CursorPagination):
+    """
+    Keyset (cursor) pagination that is only applied on request.
+
+    Lists stay unpaginated (plain JSON arrays) unless the client sends
+    `page_size` or `cursor`, so existing clients keep working. Paginated
+    responses have the form {"next": ..., "previous": ..., "results": [...]}.
+
+    Pages are selected with `WHERE id > <position> ORDER BY id LIMIT n`,
+    on the indexed primary key. Deep pages therefore cost the same as
+    the first page.
+    """
+
+    ordering = "id"
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
+
+    def is_requested(self, request):
+        """
+        Return True if the client opted in to pagination.
+        """
+        params = request.query_params
+        return self.cursor_query_param in params or self.page_size_query_param in params
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.is_requested(request):
+            return None
+        return super().paginate_queryset(queryset, request, view)
+
+
+class NewestFirstCursorPagination(OptInCursorPagination):
+    """
+    Opt-in cursor pagination returning the newest rows first (e.g. comments).
+    """
+
+    ordering = "-id"
+
+
+class SearchPagination(PageNumberPagination):
+    """
+    Page number pagination for ranked search results, which have no
+    stable key to paginate on. Responses have the form
+    {"count": ..., "next": ..., "previous": ..., "results": [...]}.
+    """
+
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
@@ -0,0 +1,231 @@
+"""
+Per-request SQL and timing instrumentation.
+
+Used by core.middleware.RequestProfilingMiddleware. A RequestProfile is
+active for the duration of one request (stored in a context variable) and
+collects wall time, serializer time, query count, DB time and repeated
+SQL statements. Finished profiles are aggregated per view in STATS.
+"""
+
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+_current_profile = ContextVar("kanmind_request_profile", default=None)
+
+# Statements that are bookkeeping rather than data access.
+_IGNORED_PREFIXES = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+
+class RequestProfile:
+    """
+    Measurements of a single request.
+    """
+
+    def __init__(self, duplicate_threshold):
+        self.duplicate_threshold = duplicate_threshold
+        self.view_name = None
+        self.started = time.perf_counter()
+        self.total = 0.0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.queries = 0
+        self.statements = Counter()
+        self._serializer_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        """
+        Database execute wrapper: time and record every query.
+        """
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            if not sql.startswith(_IGNORED_PREFIXES):
+                self.queries += 1
+                self.statements[sql] += 1
+
+    def finish(self):
+        self.total = time.perf_counter() - self.started
+
+    @property
+    def duplicates(self):
+        """
+        SQL statements executed at least `duplicate_threshold` times.
+
+        Identical parametrized SQL repeated within one request is the
+        typical signature of an N+1 query pattern.
+        """
+        return {
+            sql: count
+            for sql, count in self.statements.items()
+            if count >= self.duplicate_threshold
+        }
+
+    def server_timing(self):
+        """
+        Render the measurements as a Server-Timing header value.
+        """
+        return ", ".join([
+            f'db;dur={self.db_time * 1000:.2f};desc="{self.queries} queries"',
+            f"serializer;dur={self.serializer_time * 1000:.2f}",
+            f"total;dur={self.total * 1000:.2f}",
+        ])
+
+
+def activate(profile):
+    """
+    Make `profile` the profile of the current request; returns a reset token.
+    """
+    return _current_profile.set(profile)
+
+
+def deactivate(token):
+    _current_profile.reset(token)
+
+
+def resolve_view_name(view_func, method):
+    """
+    Return a readable name of the view handling a request.
+
+    DRF viewsets resolve to "<ViewSet>.<action>", e.g.
+    "TasksViewset.assigned_to_me"; class-based views to
+    "<View>.<method>"; plain functions to their qualified name.
+    """
+    view_class = getattr(view_func, "cls", None) or getattr(view_func, "view_class", None)
+    if view_class is None:
+        return f"{view_func.__module__}.{view_func.__qualname__}"
+    actions = getattr(view_func, "actions", None) or {}
+    handler = actions.get(method.lower(), method.lower())
+    return f"{view_class.__name__}.{handler}"
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    Database execute wrapper recording into the active request profile.
+
+    Installed once per connection (install_query_recording()) instead of
+    per request: async views query from the threads of sync_to_async,
+    whose connections the request never sees. The profile follows the
+    request into those threads with its context variable.
+    """
+    profile = _current_profile.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    return profile(execute, sql, params, many, context)
+
+
+def install_query_recording(connection, **kwargs):
+    """
+    Add record_query() to the execute wrappers of `connection`, once.
+
+    Also a receiver of the connection_created signal.
+    """
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+_serializer_timing_installed = False
+
+
+def install_serializer_timing():
+    """
+    Time `.data` of DRF serializers while a request profile is active.
+
+    BaseSerializer.data is wrapped once per process, and only when
+    profiling is enabled. Without an active profile the wrapper just
+    delegates. Nested `.data` calls are only counted once.
+    """
+    global _serializer_timing_installed
+    if _serializer_timing_installed:
+        return
+    from rest_framework.serializers import BaseSerializer
+
+    original = BaseSerializer.data
+
+    def timed_data(serializer):
+        profile = _current_profile.get()
+        if profile is None:
+            return original.fget(serializer)
+        profile._serializer_depth += 1
+        started = time.perf_counter()
+        try:
+            return original.fget(serializer)
+        finally:
+            profile._serializer_depth -= 1
+            if profile._serializer_depth == 0:
+                profile.serializer_time += time.perf_counter() - started
+
+    BaseSerializer.data = property(timed_data)
+    _serializer_timing_installed = True
+
+
+class RequestStats:
+    """
+    In-process aggregation of request profiles per view.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = {}
+
+    def record(self, profile, status_code):
+        duplicates = profile.duplicates
+        with self._lock:
+            entry = self._views.setdefault(profile.view_name, {
+                "requests": 0,
+                "errors": 0,
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+                "db_ms": 0.0,
+                "serializer_ms": 0.0,
+                "queries": 0,
+                "max_queries": 0,
+                "n_plus_one_requests": 0,
+                "duplicate_sql": None,
+            })
+            total_ms = profile.total * 1000
+            entry["requests"] += 1
+            entry["errors"] += status_code >= 500
+            entry["total_ms"] += total_ms
+            entry["max_ms"] = max(entry["max_ms"], total_ms)
+            entry["db_ms"] += profile.db_time * 1000
+            entry["serializer_ms"] += profile.serializer_time * 1000
+            entry["queries"] += profile.queries
+            entry["max_queries"] = max(entry["max_queries"], profile.queries)
+            if duplicates:
+                entry["n_plus_one_requests"] += 1
+                entry["duplicate_sql"] = max(duplicates, key=duplicates.get)
+
+    def snapshot(self):
+        """
+        Return per-view averages, slowest views first.
+        """
+        with self._lock:
+            views = {name: dict(entry) for name, entry in self._views.items()}
+        result = []
+        for name, entry in views.items():
+            requests = entry["requests"]
+            result.append({
+                "view": name,
+                "requests": requests,
+                "errors": entry["errors"],
+                "avg_ms": round(entry["total_ms"] / requests, 2),
+                "max_ms": round(entry["max_ms"], 2),
+                "avg_db_ms": round(entry["db_ms"] / requests, 2),
+                "avg_serializer_ms": round(entry["serializer_ms"] / requests, 2),
+                "avg_queries": round(entry["queries"] / requests, 2),
+                "max_queries": entry["max_queries"],
+                "n_plus_one_requests": entry["n_plus_one_requests"],
+                "duplicate_sql": entry["duplicate_sql"],
+            })
+        return sorted(result, key=lambda item: item["avg_ms"], reverse=True)
+
+    def reset(self):
+        with self._lock:
+            self._views.clear()
+
+
+STATS = RequestStats()
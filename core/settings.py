@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -40,12 +41,14 @@ INSTALLED_APPS = [
     'rest_framework',
     'rest_framework.authtoken',
     'corsheaders',
+    'core',
     'user_auth_app',
     'boards_app',
     'tasks_app'
 ]
 
 MIDDLEWARE = [
+    'core.middleware.RequestProfilingMiddleware',
     'corsheaders.middleware.CorsMiddleware',          
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -105,6 +108,55 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Logins by email (any case) use the unique email index, see
+# user_auth_app.backends.EmailBackend; usernames go to ModelBackend.
+AUTHENTICATION_BACKENDS = [
+    'user_auth_app.backends.EmailBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
+
+# Caches
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Accessible board IDs per user, see boards_app.membership.
+    # Entries expire after TIMEOUT seconds; beyond MAX_ENTRIES the least
+    # recently used entries are evicted.
+    'membership': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'kanmind-membership',
+        'TIMEOUT': 60,
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    },
+    # Token -> user lookups, see user_auth_app.authentication.
+    'tokens': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'kanmind-tokens',
+        'TIMEOUT': 300,
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    },
+    # Rendered board payloads, see boards_app.payload_cache. Bounded by
+    # entry count and by the pickled size of all entries (MAX_BYTES);
+    # hit/miss counters are exposed at /api/stats/cache/.
+    'responses': {
+        'BACKEND': 'core.cache.BoundedLocMemCache',
+        'LOCATION': 'kanmind-responses',
+        'TIMEOUT': 3600,
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+            'MAX_BYTES': 64 * 1024 * 1024,
+        },
+    },
+}
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/6.0/topics/i18n/
@@ -124,15 +176,38 @@ USE_TZ = True
 STATIC_URL = 'static/'
 
 REST_FRAMEWORK = {
+    # Opt-in keyset pagination, see core.pagination.
+    "DEFAULT_PAGINATION_CLASS": "core.pagination.OptInCursorPagination",
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
     "DEFAULT_AUTHENTICATION_CLASSES": [
         "rest_framework.authentication.SessionAuthentication",
-        "rest_framework.authentication.TokenAuthentication",
+        # TokenAuthentication with cached lookups, see user_auth_app.authentication.
+        "user_auth_app.authentication.CachedTokenAuthentication",
     ],
 }  
 
+# Per-request SQL/timing instrumentation (core.middleware.RequestProfilingMiddleware).
+# Off by default; enable with KANMIND_PROFILING=1 in the environment.
+KANMIND_PROFILING = os.environ.get("KANMIND_PROFILING") == "1"
+
+# Identical SQL executed this many times in one request is flagged as N+1.
+KANMIND_PROFILING_DUPLICATE_THRESHOLD = 3
+
+# Delta sync (boards_app.sync): tombstones of deleted tasks and comments are
+# kept this long (`manage.py prune_tombstones`); older cursors get a full sync.
+KANMIND_SYNC_TOMBSTONE_DAYS = 30
+
+# Unpaginated lists of more rows than this are streamed, serialized this many
+# rows at a time (core.streaming).
+KANMIND_STREAM_CHUNK_SIZE = 1000
+
+# Pub/sub broker of the board change events pushed over SSE/WebSocket
+# (boards_app.events). The in-process broker only reaches clients connected
+# to the same server process.
+KANMIND_EVENT_BROKER = "boards_app.events.InProcessBroker"
+
 CORS_ALLOWED_ORIGINS = [
     "http://127.0.0.1:5500",
     "http://localhost:5500",
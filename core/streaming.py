@@ -0,0 +1,179 @@
+"""
+Streaming JSON rendering of large list responses.
+
+Unpaginated lists are normally serialized into one list of dicts and
+rendered into one bytes object. Both grow with the result size. Lists of
+more than KANMIND_STREAM_CHUNK_SIZE rows are streamed instead: the
+queryset is read in chunks (QuerySet.iterator()), and each chunk is
+serialized and rendered on its own and sent as part of a
+StreamingHttpResponse. Peak memory is bounded by the chunk size, not by
+the number of rows.
+
+The body is byte-identical to the buffered response. JSONRenderer renders
+a list as its items rendered one by one, joined with "," and wrapped in
+"[...]", so rendering the chunks separately and joining them gives the
+same bytes. Streamed responses have no Content-Length; all other headers
+(ETag, Vary, Allow) are set as for the buffered response.
+
+Only plain JSON responses are streamed. The browsable API and JSON with
+parameters (e.g. `; indent=4`) are rendered as usual.
+
+Under ASGI the chunks are produced as an async iterator, so Django serves
+them as they come instead of collecting the whole body first.
+"""
+
+from itertools import chain, islice
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from core.async_api import json_response
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def chunk_size():
+    """
+    Return the number of rows per chunk (KANMIND_STREAM_CHUNK_SIZE).
+
+    Lists of more rows than this are streamed.
+    """
+    return getattr(settings, "KANMIND_STREAM_CHUNK_SIZE", DEFAULT_CHUNK_SIZE)
+
+
+def chunked(iterable, size):
+    """
+    Yield lists of up to `size` items of `iterable`.
+    """
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+async def achunked(aiterable, size):
+    """
+    Async variant of chunked() for async iterables.
+    """
+    chunk = []
+    async for item in aiterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def renders_plain_json(request):
+    """
+    Return True if a DRF request is answered with JSONRenderer and no
+    indentation, i.e. if its list response can be streamed.
+    """
+    renderer = getattr(request, "accepted_renderer", None)
+    return (
+        type(renderer) is JSONRenderer
+        and renderer.get_indent(request.accepted_media_type, {}) is None
+    )
+
+
+def _render_items(rows):
+    # JSONRenderer renders [] as b"[]" and [a, b] as b"[a,b]".
+    return JSONRenderer().render(rows)[1:-1]
+
+
+def json_array(chunks):
+    """
+    Yield the JSON array of serialized `chunks` (lists of rows) in parts.
+    """
+    yield b"["
+    separator = b""
+    for rows in chunks:
+        if rows:
+            yield separator + _render_items(rows)
+            separator = b","
+    yield b"]"
+
+
+async def ajson_array(chunks):
+    """
+    Async variant of json_array() for an async iterable of chunks.
+    """
+    yield b"["
+    separator = b""
+    async for rows in chunks:
+        if rows:
+            yield separator + _render_items(rows)
+            separator = b","
+    yield b"]"
+
+
+async def _iterate_in_thread(iterator):
+    # Each part is produced by the request's thread-sensitive executor,
+    # which also owns the database connection of an open cursor.
+    done = object()
+    while (part := await sync_to_async(next)(iterator, done)) is not done:
+        yield part
+
+
+def streaming_response(request, parts, content_type=JSONRenderer.media_type):
+    """
+    Return a StreamingHttpResponse sending `parts` (bytes or str).
+
+    Under ASGI the sync iterator is wrapped into an async one.
+    """
+    django_request = getattr(request, "_request", request)
+    if hasattr(django_request, "scope"):
+        parts = _iterate_in_thread(iter(parts))
+    return StreamingHttpResponse(parts, content_type=content_type)
+
+
+def list_response(request, queryset, serializer_class, context=None):
+    """
+    Serialize an unpaginated queryset, streamed if it is large.
+
+    Args:
+        request: The DRF request.
+        queryset: Rows to serialize, in response order.
+        serializer_class: Serializer of one row.
+        context: Optional serializer context.
+
+    Returns:
+        Response with `serializer_class(rows, many=True).data` for up to
+        chunk_size() rows (or if the response is not plain JSON),
+        otherwise a StreamingHttpResponse with the same body. Either way
+        the queryset is read with one query.
+    """
+    context = context or {}
+    if not renders_plain_json(request):
+        return Response(serializer_class(queryset, many=True, context=context).data)
+    size = chunk_size()
+    rows = queryset.iterator(chunk_size=size)
+    first = list(islice(rows, size + 1))
+    if len(first) <= size:
+        return Response(serializer_class(first, many=True, context=context).data)
+    chunks = chain([first], chunked(rows, size))
+    serialized = (serializer_class(chunk, many=True, context=context).data for chunk in chunks)
+    return streaming_response(request, json_array(serialized))
+
+
+async def alist_response(queryset, serializer_class):
+    """
+    Async variant of list_response() for the async views of
+    core.async_api, which only answer plain JSON requests.
+    """
+    size = chunk_size()
+    chunks = achunked(queryset.aiterator(chunk_size=size), size + 1)
+    first = await anext(chunks, [])
+    if len(first) <= size:
+        await chunks.aclose()
+        return json_response(serializer_class(first, many=True).data)
+
+    async def serialized():
+        yield serializer_class(first, many=True).data
+        async for chunk in chunks:
+            yield serializer_class(chunk, many=True).data
+
+    return StreamingHttpResponse(ajson_array(serialized()), content_type=JSONRenderer.media_type)
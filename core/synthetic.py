@@ -0,0 +1,142 @@
+"""
+Bulk builders for synthetic Kanmind data.
+
+Used by the query-budget tests and the benchmark command. All rows are
+written with bulk_create, therefore the stored counters are rebuilt once
+at the end of each helper instead of per row. bulk_create sends no
+signals, so the helpers also invalidate the cached memberships of the
+affected users (see boards_app.membership) and bump the versions of
+changed boards (see boards_app.versions). Tasks and comments keep
+sync_seq 0: delta sync clients only get them with a full sync.
+"""
+
+from django.contrib.auth import get_user_model
+from boards_app import membership
+from boards_app.counters import rebuild_counters
+from boards_app.versions import bump_board_versions, bump_task_board_version
+from boards_app.models import Boards
+from tasks_app.counters import rebuild_comment_counts
+from tasks_app.models import Comment, Task
+from user_auth_app.models import UserProfile
+
+User = get_user_model()
+
+# Status/priority values cycled through by create_tasks().
+STATUSES = list(Task.Status.values)
+PRIORITIES = list(Task.Priority.values)
+
+
+def create_users(count, prefix="user"):
+    """
+    Create `count` users named <prefix>-<n>@example.com.
+
+    Passwords are unusable; tests and benchmarks authenticate with tokens.
+    """
+    users = User.objects.bulk_create(
+        User(
+            username=f"{prefix}-{index}@example.com",
+            email=f"{prefix}-{index}@example.com",
+            first_name=f"{prefix.title()} {index}",
+            password="!",
+        )
+        for index in range(count)
+    )
+    user_ids = [user.pk for user in users]
+    membership.invalidate(user_ids)
+    return list(User.objects.filter(pk__in=user_ids).order_by("pk"))
+
+
+def create_boards(owner, count, members=(), prefix="Board"):
+    """
+    Create `count` boards owned by `owner` with the given members.
+
+    The owner is always added as a member, mirroring BoardsListSerializer.create.
+    """
+    boards = Boards.objects.bulk_create(
+        Boards(title=f"{prefix} {index}", owner=owner) for index in range(count)
+    )
+    member_ids = {owner.pk, *(member.pk for member in members)}
+    through = Boards.members.through
+    through.objects.bulk_create(
+        through(boards_id=board.pk, user_id=user_id)
+        for board in boards
+        for user_id in member_ids
+    )
+    rebuild_counters(board.pk for board in boards)
+    membership.invalidate(member_ids)
+    return boards
+
+
+def add_members(board, users):
+    """
+    Add users to a board in one bulk insert.
+    """
+    through = Boards.members.through
+    through.objects.bulk_create(
+        (through(boards_id=board.pk, user_id=user.pk) for user in users),
+        ignore_conflicts=True,
+    )
+    rebuild_counters([board.pk])
+    bump_board_versions([board.pk])
+    membership.invalidate(user.pk for user in users)
+
+
+def create_tasks(
+    board, count, assignees=(None,), reviewers=(None,), creator=None, words=(), due_dates=(None,)
+):
+    """
+    Create `count` tasks on a board, cycling through statuses, priorities,
+    assignees, reviewers and due dates.
+
+    With `words`, the n-th task's title ends with the n-th word (cycling),
+    e.g. to control how many tasks a search term matches.
+    """
+    assignees = list(assignees)
+    reviewers = list(reviewers)
+    words = list(words)
+    due_dates = list(due_dates)
+    tasks = Task.objects.bulk_create(
+        Task(
+            board=board,
+            created_by=creator,
+            title=f"Task {index} {words[index % len(words)]}" if words else f"Task {index}",
+            description=f"Description of task {index}",
+            status=STATUSES[index % len(STATUSES)],
+            priority=PRIORITIES[index % len(PRIORITIES)],
+            assignee=assignees[index % len(assignees)],
+            reviewer=reviewers[index % len(reviewers)],
+            due_date=due_dates[index % len(due_dates)],
+        )
+        for index in range(count)
+    )
+    rebuild_counters([board.pk])
+    bump_board_versions([board.pk])
+    return tasks
+
+
+def create_comments(task, count, authors):
+    """
+    Create `count` comments on a task, cycling through the given authors.
+    """
+    authors = list(authors)
+    comments = Comment.objects.bulk_create(
+        Comment(
+            task=task,
+            author=authors[index % len(authors)],
+            content=f"Comment {index}",
+        )
+        for index in range(count)
+    )
+    rebuild_comment_counts([task.pk])
+    bump_task_board_version(task.pk)
+    return comments
+
+
+def create_profiles(users):
+    """
+    Create a UserProfile for each of the given users.
+    """
+    return UserProfile.objects.bulk_create(
+        UserProfile(user=user, bio=f"Bio of {user.username}", location="Berlin")
+        for user in users
+    )
@@ -0,0 +1,135 @@
+"""
+Shared helpers for the API query-budget tests.
+
+Every endpoint is called against datasets of several sizes. The number of
+SQL queries must stay within a fixed budget and must not grow with the
+number of rows, so a serializer change that adds per-row queries fails
+the build.
+"""
+
+from types import SimpleNamespace
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from boards_app import payload_cache
+from core import streaming, synthetic
+from user_auth_app.authentication import remember_token
+
+# Dataset sizes every endpoint is measured at.
+DATASET_SIZES = (10, 100, 1000)
+
+# Password of the scenario owner, for the login endpoint.
+SCENARIO_PASSWORD = "kanmind-secret"
+
+# Django deletes collected rows in batches of this size, so cascading
+# deletes may add one query per batch (see DeleteQuery.delete_batch).
+DELETE_BATCH_SIZE = 100
+
+
+def build_scenario(size, prefix="s"):
+    """
+    Seed a dataset where every relation the API touches has `size` rows.
+
+    - `owner` owns `board`, which has `size` members and `size` tasks
+      (assigned to / reviewed by `owner` in turns)
+    - `task` (first task of `board`) has `size` comments
+    - `owner` is a member of `size` further boards
+    - `owner` and every member have a profile
+    - `token` is the owner's auth token, cached as after a login, so
+      budgets do not include the token lookup
+    """
+    owner = synthetic.create_users(1, prefix=f"{prefix}{size}-owner")[0]
+    owner.set_password(SCENARIO_PASSWORD)
+    owner.save(update_fields=["password"])
+    users = synthetic.create_users(size, prefix=f"{prefix}{size}-member")
+    profiles = synthetic.create_profiles([owner, *users])
+    board = synthetic.create_boards(owner, 1, members=users)[0]
+    tasks = synthetic.create_tasks(
+        board, size, assignees=[owner, users[0]], reviewers=[users[0], owner], creator=owner
+    )
+    synthetic.create_comments(tasks[0], size, authors=[owner, *users[:5]])
+    other_owner = users[-1]
+    synthetic.create_boards(other_owner, size, members=[owner])
+    token = Token.objects.create(user=owner)
+    remember_token(owner, token)
+    return SimpleNamespace(
+        owner=owner,
+        users=users,
+        board=board,
+        tasks=tasks,
+        task=tasks[0],
+        profile=profiles[0],
+        token=token,
+    )
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class QueryBudgetTestCase(APITestCase):
+    """
+    Base class asserting per-endpoint query budgets across DATASET_SIZES.
+
+    Budgets are measured with an empty payload cache (see
+    boards_app.payload_cache), i.e. for the first request after a change.
+    """
+
+    def setUp(self):
+        super().setUp()
+        payload_cache.clear()
+
+    def authenticate(self, scenario):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {scenario.token.key}")
+
+    def measure(self, request, expected_status):
+        """
+        Run one request and return the number of queries it issued.
+        """
+        with CaptureQueriesContext(connection) as ctx:
+            response = request()
+            if response.streaming:
+                # Streamed lists (core.streaming) query while being sent.
+                body = b"".join(response.streaming_content)
+            else:
+                body = getattr(response, "data", response.content)
+        self.assertEqual(response.status_code, expected_status, body)
+        return len(ctx.captured_queries)
+
+    def assertQueryBudget(
+        self, call, budget, expected_status=200, rows_deleted=None, rows_streamed=None
+    ):
+        """
+        Assert that an endpoint stays within `budget` queries at every size.
+
+        Args:
+            call: Callable(scenario) -> response, executed once per size
+                against a freshly seeded scenario.
+            budget: Maximum number of queries at the smallest size.
+            expected_status: Expected HTTP status code.
+            rows_deleted: Optional callable(size) -> number of rows a
+                cascading delete removes. Each DELETE_BATCH_SIZE rows may
+                add one query; any other growth fails the test.
+            rows_streamed: Optional callable(size) -> number of rows of a
+                list streamed in chunks (see core.streaming). Each further
+                chunk may add one query.
+        """
+        counts = {}
+        for size in DATASET_SIZES:
+            scenario = build_scenario(size)
+            self.authenticate(scenario)
+            counts[size] = self.measure(lambda: call(scenario), expected_status)
+
+        smallest = DATASET_SIZES[0]
+        self.assertLessEqual(counts[smallest], budget, f"query counts per size: {counts}")
+        for size, count in counts.items():
+            allowance = 0
+            if rows_deleted is not None:
+                allowance = rows_deleted(size) // DELETE_BATCH_SIZE
+            if rows_streamed is not None:
+                allowance += (rows_streamed(size) - 1) // streaming.chunk_size()
+            self.assertLessEqual(
+                count,
+                counts[smallest] + allowance,
+                f"query count grows with dataset size: {counts}",
+            )
@@ -0,0 +1,272 @@
+from io import BytesIO
+from unittest import mock
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.contrib.auth.models import User
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient, APITestCase
+
+from boards_app import membership, payload_cache
+from boards_app.models import Boards
+from core import profiling
+from core.async_api import ASYNC_URLCONF, AsyncReadRequest
+from core.middleware import RequestProfilingMiddleware
+from core.testing import build_scenario
+from tasks_app.models import Task
+from user_auth_app.authentication import forget_tokens
+
+
+class RequestProfilingMiddlewareTests(APITestCase):
+    """
+    Tests for core.middleware.RequestProfilingMiddleware.
+    """
+
+    def setUp(self):
+        profiling.STATS.reset()
+        self.user = User.objects.create_user(username="owner@example.com", is_staff=True)
+        board = Boards.objects.create(title="Board", owner=self.user)
+        Task.objects.create(board=board, assignee=self.user)
+
+    def get_client(self):
+        # A new client builds a new middleware chain with the current settings.
+        client = APIClient()
+        client.force_authenticate(self.user)
+        return client
+
+    @override_settings(KANMIND_PROFILING=False)
+    def test_disabled_adds_nothing(self):
+        response = self.get_client().get("/api/tasks/assigned-to-me/")
+        self.assertNotIn("Server-Timing", response)
+        self.assertEqual(profiling.STATS.snapshot(), [])
+
+    @override_settings(KANMIND_PROFILING=True)
+    def test_enabled_reports_timing_and_stats(self):
+        client = self.get_client()
+        response = client.get("/api/tasks/assigned-to-me/")
+        self.assertIn("db;dur=", response["Server-Timing"])
+        self.assertIn("serializer;dur=", response["Server-Timing"])
+        self.assertEqual(response["X-Query-Count"], "2")
+
+        stats = client.get("/api/stats/requests/").json()
+        views = {entry["view"]: entry for entry in stats["views"]}
+        self.assertEqual(views["TasksViewset.assigned_to_me"]["requests"], 1)
+        self.assertEqual(views["TasksViewset.assigned_to_me"]["n_plus_one_requests"], 0)
+
+    @override_settings(KANMIND_PROFILING=True)
+    def test_async_chains_stay_async(self):
+        async def view(request):
+            await Task.objects.acount()
+            return HttpResponse()
+
+        middleware = RequestProfilingMiddleware(view)
+        self.assertTrue(iscoroutinefunction(middleware))
+        response = async_to_sync(middleware)(RequestFactory().get("/"))
+        self.assertEqual(response["X-Query-Count"], "1")
+
+        token = Token.objects.create(user=self.user)
+        with override_settings(ROOT_URLCONF=ASYNC_URLCONF):
+            response = async_to_sync(self.async_client.get)(
+                "/api/tasks/assigned-to-me/", headers={"Authorization": f"Token {token.key}"}
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("serializer;dur=", response["Server-Timing"])
+        self.assertEqual(response["X-Query-Count"], "3")
+
+    def test_duplicate_statements_are_flagged(self):
+        profile = profiling.RequestProfile(duplicate_threshold=3)
+        execute = lambda sql, params, many, context: None  # noqa: E731
+        for _ in range(3):
+            profile(execute, "SELECT 1 WHERE id = %s", (1,), False, {})
+        profile(execute, "SELECT 2", (), False, {})
+        self.assertEqual(profile.duplicates, {"SELECT 1 WHERE id = %s": 3})
+
+
+class AsyncReadPathTests(APITestCase):
+    """
+    Tests for the async read path (core.async_api): every response must
+    equal the one of the sync viewset.
+    """
+
+    # Headers the viewsets set; the middleware adds the same to both.
+    COMPARED_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Vary", "Allow")
+
+    def setUp(self):
+        payload_cache.clear()
+        membership.clear()
+        self.scenario = build_scenario(10)
+        self.auth = {"HTTP_AUTHORIZATION": f"Token {self.scenario.token.key}"}
+        self.stranger = User.objects.create_user(username="stranger@example.com")
+        self.foreign_board = Boards.objects.create(title="Foreign", owner=self.stranger)
+        self.foreign_task = Task.objects.create(board=self.foreign_board)
+        self.urls = [
+            "/api/boards/",
+            f"/api/boards/{self.scenario.board.pk}/",
+            "/api/tasks/assigned-to-me/",
+            "/api/tasks/reviewing/",
+            f"/api/tasks/{self.scenario.task.pk}/comments/",
+        ]
+
+    def get_async(self, url, **extra):
+        # AsyncClient takes headers by name instead of as META keys.
+        headers = {key[len("HTTP_"):].replace("_", "-"): value for key, value in extra.items()}
+        with override_settings(ROOT_URLCONF=ASYNC_URLCONF):
+            return async_to_sync(self.async_client.get)(url, headers=headers)
+
+    def assertSameResponse(self, url, native=True, **extra):
+        """
+        GET `url` through the sync and the async path and compare them.
+
+        With native=True the async view must not fall back to the sync
+        view.
+        """
+        expected = self.client.get(url, **extra)
+        fallback = mock.patch("core.async_api.sync_to_async", side_effect=AssertionError)
+        if native:
+            with fallback:
+                actual = self.get_async(url, **extra)
+        else:
+            actual = self.get_async(url, **extra)
+        self.assertEqual(actual.status_code, expected.status_code, url)
+        self.assertEqual(actual.content, expected.content, url)
+        for header in self.COMPARED_HEADERS:
+            self.assertEqual(actual.get(header), expected.get(header), f"{url} {header}")
+        return actual
+
+    def test_responses_match_sync_views(self):
+        for url in self.urls:
+            # Cold, then warm payload cache.
+            self.assertSameResponse(url, **self.auth)
+            self.assertSameResponse(url, **self.auth)
+
+    def test_filtered_task_lists_match_sync_views(self):
+        for query in ("status=to-do,review", "priority=high&ordering=-due_date", "ordering=-id"):
+            for url in self.urls[2:4]:
+                self.assertSameResponse(f"{url}?{query}", **self.auth)
+
+    def test_uncached_token_is_looked_up(self):
+        forget_tokens([self.scenario.token.key])
+        with mock.patch("core.async_api.sync_to_async", side_effect=AssertionError):
+            response = self.get_async("/api/boards/", **self.auth)
+        self.assertEqual(response.status_code, 200)
+        self.assertSameResponse("/api/boards/", **self.auth)
+
+    def test_conditional_requests_match_sync_views(self):
+        for url in self.urls[:4]:
+            etag = self.client.get(url, **self.auth)["ETag"]
+            response = self.assertSameResponse(url, HTTP_IF_NONE_MATCH=etag, **self.auth)
+            self.assertEqual(response.status_code, 304)
+
+    def test_session_authentication(self):
+        self.client.force_login(self.scenario.owner)
+        self.async_client.force_login(self.scenario.owner)
+        for url in self.urls:
+            self.assertSameResponse(url)
+
+    def test_fallbacks_match_sync_views(self):
+        invalid = {"HTTP_AUTHORIZATION": "Token invalid"}
+        cases = [
+            ("/api/boards/", {}),
+            ("/api/boards/", invalid),
+            (f"/api/boards/{self.foreign_board.pk}/", self.auth),
+            ("/api/boards/999999/", self.auth),
+            (f"/api/tasks/{self.foreign_task.pk}/comments/", self.auth),
+            ("/api/boards/?page_size=2", self.auth),
+            (f"/api/tasks/{self.scenario.task.pk}/comments/?page_size=2", self.auth),
+            ("/api/tasks/reviewing/?format=json", self.auth),
+            ("/api/tasks/assigned-to-me/?status=unknown", self.auth),
+            ("/api/tasks/reviewing/?ordering=title", self.auth),
+        ]
+        for url, extra in cases:
+            self.assertSameResponse(url, native=False, **extra)
+
+        response = self.get_async("/api/boards/", HTTP_ACCEPT="text/html", **self.auth)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/html"))
+
+    def test_query_counts_match_sync_views(self):
+        # The comment list checks access with the cached memberships,
+        # which cost one query per user and process when cold.
+        membership.accessible_board_ids(self.scenario.owner)
+        for url in self.urls:
+            payload_cache.clear()
+            with CaptureQueriesContext(connection) as sync_queries:
+                self.client.get(url, **self.auth)
+            payload_cache.clear()
+            with CaptureQueriesContext(connection) as async_queries:
+                self.get_async(url, **self.auth)
+            self.assertEqual(len(async_queries), len(sync_queries), url)
+
+    def test_only_get_requests_use_async_urlconf(self):
+        def make_request(method):
+            scope = {"type": "http", "method": method, "path": "/api/boards/", "headers": []}
+            return AsyncReadRequest(scope, BytesIO())
+
+        self.assertEqual(make_request("GET").urlconf, ASYNC_URLCONF)
+        self.assertFalse(hasattr(make_request("POST"), "urlconf"))
+        self.assertTrue(iscoroutinefunction(resolve("/api/boards/", ASYNC_URLCONF).func))
+        self.assertFalse(iscoroutinefunction(resolve("/api/boards/sync/", ASYNC_URLCONF).func))
+
+
+class StreamingListTests(APITestCase):
+    """
+    Tests for the streamed list responses (core.streaming).
+    """
+
+    def setUp(self):
+        payload_cache.clear()
+        self.user = User.objects.create_user(username="owner@example.com")
+        self.auth = {"HTTP_AUTHORIZATION": f"Token {Token.objects.create(user=self.user).key}"}
+        boards = [Boards.objects.create(title=f"Board {index} \u2028 ü", owner=self.user) for index in range(7)]
+        for index in range(8):
+            Task.objects.create(
+                board=boards[index % 2],
+                title=f"Task {index} \u2029 <ä>",
+                assignee=self.user,
+                reviewer=self.user,
+            )
+        self.urls = ["/api/boards/", "/api/tasks/", "/api/tasks/assigned-to-me/", "/api/tasks/reviewing/"]
+
+    def buffered(self, url, **extra):
+        with self.settings(KANMIND_STREAM_CHUNK_SIZE=1000):
+            response = self.client.get(url, **self.auth, **extra)
+        self.assertFalse(response.streaming)
+        return response
+
+    def test_streamed_body_is_byte_identical(self):
+        for chunk_size in (1, 3, 5):
+            with self.settings(KANMIND_STREAM_CHUNK_SIZE=chunk_size):
+                for url in self.urls:
+                    payload_cache.clear()
+                    expected = self.buffered(url)
+                    payload_cache.clear()
+                    response = self.client.get(url, **self.auth)
+                    self.assertTrue(response.streaming, url)
+                    self.assertEqual(b"".join(response.streaming_content), expected.content, url)
+                    self.assertEqual(response["ETag"], expected["ETag"])
+                    self.assertEqual(response["Content-Type"], expected["Content-Type"])
+
+    def test_async_views_stream_identical_body(self):
+        async def get(url):
+            # Sent and consumed on one event loop, as by an ASGI server.
+            headers = {"Authorization": self.auth["HTTP_AUTHORIZATION"]}
+            response = await self.async_client.get(url, headers=headers)
+            self.assertTrue(response.streaming, url)
+            return b"".join([part async for part in response.streaming_content])
+
+        with self.settings(KANMIND_STREAM_CHUNK_SIZE=3, ROOT_URLCONF=ASYNC_URLCONF):
+            # /api/tasks/ is served by the viewset, its chunks are wrapped.
+            for url in self.urls:
+                self.assertEqual(async_to_sync(get)(url), self.buffered(url).content, url)
+
+    def test_small_lists_and_other_renderers_are_not_streamed(self):
+        with self.settings(KANMIND_STREAM_CHUNK_SIZE=8):
+            self.assertFalse(self.client.get("/api/tasks/assigned-to-me/", **self.auth).streaming)
+        with self.settings(KANMIND_STREAM_CHUNK_SIZE=3):
+            for accept in ("text/html", "application/json; indent=4"):
+                response = self.client.get("/api/tasks/", HTTP_ACCEPT=accept, **self.auth)
+                self.assertFalse(response.streaming, accept)
@@ -1,10 +1,11 @@
 from django.contrib import admin
 from django.urls import include, path
-from user_auth_app.api.views import EmailCheckView
+from user_auth_app.api.views import EmailBatchCheckView, EmailCheckView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('user_auth_app.api.urls')),
     path('api/email-check/', EmailCheckView.as_view(), name='email-check'),
+    path('api/email-check/batch/', EmailBatchCheckView.as_view(), name='email-check-batch'),
     path("api/", include("core.api.urls")),
 ]
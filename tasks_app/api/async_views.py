@@ -0,0 +1,79 @@
+"""
+Async implementations of the task and comment reads, see core.async_api.
+
+Same responses, validators and query plan as the corresponding actions
+of TasksViewset.
+"""
+
+from boards_app import membership, versions
+from boards_app.models import accessible_board_filter
+from core import streaming
+from core.async_api import async_read_view, json_response
+from core.conditional import conditional_response, make_etag, set_validators
+from rest_framework.exceptions import ValidationError
+from tasks_app import filters
+from tasks_app.models import Comment, Task
+from .serializers import CommentSerializer, TasksSerializer
+
+
+async def _task_list(request, user, **lookups):
+    """
+    Serialize the user's tasks matching `lookups` and the query
+    parameters of tasks_app.filters, see TasksViewset.list_response().
+
+    Invalid parameters return None: the sync view answers them with 400.
+    """
+    try:
+        params = filters.parse_params(request.GET)
+    except ValidationError:
+        return None
+    etag = make_etag(
+        "tasks",
+        user.pk,
+        request.get_full_path(),
+        await versions.aaccessible_board_validators(user),
+    )
+    response = conditional_response(request, etag)
+    if response is not None:
+        return response
+
+    queryset = (
+        Task.objects.filter(accessible_board_filter(user, "board"))
+        .select_related("assignee", "reviewer")
+        .filter(**lookups)
+    )
+    queryset = filters.filter_tasks(queryset, params)
+    return set_validators(await streaming.alist_response(queryset, TasksSerializer), etag)
+
+
+@async_read_view
+async def assigned_to_me(request, user):
+    """
+    GET /api/tasks/assigned-to-me/, see TasksViewset.assigned_to_me().
+    """
+    return await _task_list(request, user, assignee=user)
+
+
+@async_read_view
+async def reviewing(request, user):
+    """
+    GET /api/tasks/reviewing/, see TasksViewset.review_to_me().
+    """
+    return await _task_list(request, user, reviewer=user)
+
+
+@async_read_view
+async def comment_list(request, user, pk):
+    """
+    GET /api/tasks/{id}/comments/, see TasksViewset.comments().
+
+    Access to the task's board is checked with the cached memberships
+    (boards_app.membership). Unknown tasks and tasks of foreign boards
+    are answered by the viewset (404).
+    """
+    board_id = await Task.objects.filter(pk=pk).values_list("board_id", flat=True).afirst()
+    if board_id is None or not await membership.acan_access(user, board_id):
+        return None
+    queryset = Comment.objects.filter(task_id=pk).select_related("author").order_by("-id")
+    comments = [comment async for comment in queryset]
+    return json_response(CommentSerializer(comments, many=True).data)
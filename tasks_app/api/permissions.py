@@ -1,5 +1,5 @@
 from rest_framework.permissions import BasePermission
-from boards_app.models import Boards
+from boards_app import membership
 
 
 class IsTaskOrBoardOwner(BasePermission):
@@ -59,11 +59,6 @@ class CanCreateTaskOnBoard(BasePermission):
         if not board_id:
             return False  
 
-        try:
-            board = Boards.objects.get(pk=board_id)
-        except Boards.DoesNotExist:
-            return False  
-
-        user = request.user
-        return board.owner_id == user.id or board.members.filter(id=user.id).exists()
+        # Unknown boards are not accessible either (cached, see boards_app.membership)
+        return membership.can_access(request.user, board_id)
     
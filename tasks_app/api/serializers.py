@@ -41,7 +41,7 @@ class TasksSerializer(serializers.ModelSerializer):
 
     Read side:
       - assignee / reviewer are nested user objects (read-only) using AssigneeSerializer.
-      - comments_count is a computed integer field.
+      - comments_count is the cached counter stored on the task.
 
     Write side:
       - assignee_id / reviewer_id accept user primary keys and map them to the
@@ -53,8 +53,8 @@ class TasksSerializer(serializers.ModelSerializer):
     assignee = AssigneeSerializer(read_only=True)
     reviewer = AssigneeSerializer(read_only=True)
 
-    # Computed field: number of comments on the task.
-    comments_count = serializers.SerializerMethodField()
+    # Cached number of comments, maintained on the model (see tasks_app.counters).
+    comments_count = serializers.IntegerField(read_only=True)
 
     # Write-only fields that accept user IDs and populate FK relations via `source`.
     assignee_id = serializers.PrimaryKeyRelatedField(
@@ -97,15 +97,6 @@ class TasksSerializer(serializers.ModelSerializer):
         validated_data.setdefault("assignee", self.context["request"].user)
         return super().create(validated_data)
 
-    def get_comments_count(self, task):
-        """
-        Return the number of Comment rows linked to this task.
-
-        Note: This performs a query per serialized task. For list endpoints,
-        consider annotating the queryset with Count('comment') to avoid N+1 queries.
-        """
-        return Comment.objects.filter(task=task).count()
-
 
 class CommentSerializer(serializers.ModelSerializer):
     """
@@ -139,3 +130,45 @@ class CommentSerializer(serializers.ModelSerializer):
         """
         validated_data["author"] = self.context["request"].user
         return super().create(validated_data)
+
+
+class SyncCommentSerializer(CommentSerializer):
+    """
+    Comment representation of the delta sync (see boards_app.sync),
+    including the task the comment belongs to.
+    """
+
+    class Meta(CommentSerializer.Meta):
+        fields = ["id", "task", "created_at", "author", "content"]
+
+
+class TaskBulkItemSerializer(serializers.ModelSerializer):
+    """
+    Field validation of one item of the bulk task endpoint.
+
+    Unlike TasksSerializer, board and user references are validated as
+    plain integers here. tasks_app.bulk resolves them for all items at
+    once, so validating an item never queries the database.
+
+    Items with an `id` are partial updates (including moves to another
+    status or board), items without one are creates.
+    """
+
+    id = serializers.IntegerField(required=False)
+    board = serializers.IntegerField()
+    assignee_id = serializers.IntegerField()
+    reviewer_id = serializers.IntegerField(allow_null=True, required=False)
+
+    class Meta:
+        model = Task
+        fields = [
+            "id",
+            "board",
+            "title",
+            "description",
+            "status",
+            "priority",
+            "assignee_id",
+            "reviewer_id",
+            "due_date",
+        ]
@@ -1,3 +1,4 @@
+from django.db import transaction
 from django.db.models import Q
 from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
@@ -5,9 +6,21 @@ from rest_framework import viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.exceptions import PermissionDenied
-from boards_app.models import Boards
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from boards_app import membership, versions
+from boards_app.models import Boards, accessible_board_filter
+from core.conditional import (
+    conditional_response,
+    is_conditional,
+    lookup_id,
+    make_etag,
+    set_validators,
+)
+from core import streaming
+from core.pagination import NewestFirstCursorPagination, SearchPagination
 from .permissions import IsTaskOrBoardOwner, CanCreateTaskOnBoard
+from tasks_app import bulk, search
+from tasks_app.filters import TaskFilterBackend
 from tasks_app.models import Task, Comment
 from .serializers import TasksSerializer, CommentSerializer
 
@@ -24,9 +37,17 @@ class TasksViewset(viewsets.ModelViewSet):
       - destroy
 
     Additional custom actions are defined below to filter tasks for the
-    authenticated user and to handle task-related comments.
+    authenticated user, to search them, to write many tasks at once and
+    to handle task-related comments.
+
+    All list endpoints support opt-in cursor pagination (?page_size=,
+    ?cursor=), see core.pagination.OptInCursorPagination. Task lists and
+    the task detail support conditional GETs (ETag / If-None-Match).
+    Task lists are filtered and ordered by validated query parameters
+    (?status=, ?board=, ?ordering=, ...), see tasks_app.filters.
     """
-        # Base queryset for all actions in this ViewSet.
+    # Base queryset for all actions in this ViewSet, narrowed to the
+    # boards of the requesting user in get_queryset().
     queryset = Task.objects.all()
 
     # Serializer used for Task objects.
@@ -34,6 +55,9 @@ class TasksViewset(viewsets.ModelViewSet):
 
     permission_classes = [IsAuthenticated, CanCreateTaskOnBoard]
 
+    # Filters and ordering of the task lists, also used by the paginator.
+    filter_backends = [TaskFilterBackend]
+
     #User as creator of the board
     """
     Create a new task on a specific board.
@@ -56,19 +80,20 @@ class TasksViewset(viewsets.ModelViewSet):
     Notes:
     - The task creator is set automatically to the authenticated user.
     - Board ownership and membership are enforced explicitly at the view level
-      instead of relying solely on DRF permissions.
+      instead of relying solely on DRF permissions, using the cached board
+      IDs of the user (boards_app.membership).
     """
     def create(self, request, *args, **kwargs):
         board_id = request.data.get("board")
-        board = get_object_or_404(Boards, pk=board_id)
-
         user = request.user
-        if not (board.owner_id == user.id or board.members.filter(id=user.id).exists()):
+        if not membership.can_access(user, board_id):
+            # Only tell unknown boards (404) from foreign ones (403) on denial.
+            get_object_or_404(Boards, pk=board_id)
             raise PermissionDenied("You are not allowed to create tasks on this board.")
 
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        serializer.save(created_by=user, board=board)
+        serializer.save(created_by=user)
 
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
@@ -77,6 +102,157 @@ class TasksViewset(viewsets.ModelViewSet):
           return [IsAuthenticated(), IsTaskOrBoardOwner()]
       return [IsAuthenticated()]
 
+    def get_queryset(self):
+        """
+        Return only tasks on boards the current user owns or is a member of.
+
+        Scoping happens in the same SQL query that loads the tasks (see
+        boards_app.models.accessible_board_filter). List actions therefore
+        never load tasks of foreign boards, and retrieve/update/destroy or
+        the comment routes of such a task answer 404 without a separate
+        membership query.
+
+        assignee/reviewer are nested in TasksSerializer and always joined;
+        the board row is only joined for retrieve (its version is the ETag)
+        and destroy, where IsTaskOrBoardOwner reads its owner.
+        """
+        queryset = self.queryset.filter(
+            accessible_board_filter(self.request.user, "board")
+        ).select_related("assignee", "reviewer")
+        if self.action in ("retrieve", "destroy"):
+            queryset = queryset.select_related("board")
+        return queryset
+
+    def list_response(self, queryset):
+        """
+        Serialize a task queryset, paginated if the client asked for it.
+
+        Supports conditional GETs: the ETag covers the user, the query
+        string and the ID and version of every accessible board (one
+        indexed query, see boards_app.versions), which changes whenever
+        any task the user can see changes. A matching If-None-Match is
+        answered with 304 before the tasks are loaded.
+
+        Unpaginated lists of more than KANMIND_STREAM_CHUNK_SIZE tasks are
+        streamed with the same body, see core.streaming.
+        """
+        request = self.request
+        etag = make_etag(
+            "tasks",
+            request.user.pk,
+            request.get_full_path(),
+            versions.accessible_board_validators(request.user),
+        )
+        response = conditional_response(request, etag)
+        if response is not None:
+            return response
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return set_validators(self.get_paginated_response(serializer.data), etag)
+        return set_validators(
+            streaming.list_response(
+                request, queryset, self.get_serializer_class(), self.get_serializer_context()
+            ),
+            etag,
+        )
+
+    def list(self, request, *args, **kwargs):
+        """
+        Return the tasks of the user's boards matching the filters of
+        tasks_app.filters, see list_response().
+        """
+        return self.list_response(self.filter_queryset(self.get_queryset()))
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Return a task, or answer 304 if its board did not change.
+
+        The validators are the version and updated_at of the task's board.
+        Conditional requests read them in one indexed, access-scoped query
+        before the task is loaded; full responses take them from the
+        board joined to the task. Unknown or foreign tasks and malformed
+        IDs get 404.
+        """
+        if is_conditional(request):
+            task_id = lookup_id(kwargs[self.lookup_field])
+            validators = (
+                self.get_queryset()
+                .filter(pk=task_id)
+                .values_list("board_id", "board__version", "board__updated_at")
+                .first()
+            )
+            if validators is not None:
+                board_id, version, updated_at = validators
+                etag = make_etag("task", task_id, board_id, version)
+                response = conditional_response(request, etag, updated_at)
+                if response is not None:
+                    return response
+
+        task = self.get_object()
+        board = task.board
+        serializer = self.get_serializer(task)
+        return set_validators(
+            Response(serializer.data),
+            make_etag("task", task.pk, board.pk, board.version),
+            board.updated_at,
+        )
+
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request):
+        """
+        Create, update and move many tasks in one request.
+
+        Endpoint:
+          POST /tasks/bulk/
+
+        Request body:
+          {"tasks": [{...}, ...]} with at most tasks_app.bulk.MAX_ITEMS items.
+          - items without `id` create a task (same fields as POST /tasks/)
+          - items with `id` partially update that task; a move is an
+            update of `status` and/or `board`
+
+        Boards, users and tasks of all items are checked with one query
+        each and all valid items are written in one transaction. Invalid
+        items are skipped and reported.
+
+        Returns:
+          200 with {"results": [...]}, one result per item in request
+          order: {"index", "status": 201|200, "task"} or
+          {"index", "status": 400|403|404, "errors"}.
+        """
+        items = request.data.get("tasks") if isinstance(request.data, dict) else None
+        if not isinstance(items, list):
+            raise ValidationError({"tasks": ["Expected a list of tasks."]})
+        if len(items) > bulk.MAX_ITEMS:
+            raise ValidationError({"tasks": [f"Send at most {bulk.MAX_ITEMS} tasks per request."]})
+        results = bulk.bulk_save_tasks(request.user, items, self.get_queryset())
+        return Response({"results": results})
+
+    @action(detail=False, methods=["get"], url_path="search")
+    def search(self, request):
+        """
+        Full-text search over the tasks and comments of the user's boards.
+
+        Endpoint:
+          GET /tasks/search/?q=<words>&page=<n>&page_size=<n>
+
+        Tasks whose title and description, or one of whose comments,
+        contain every word of `q` (the last one also as a prefix), best
+        matches first. Backed by a full-text index, see tasks_app.search.
+
+        Returns:
+          {"count", "next", "previous", "results"}: a page of tasks
+          (core.pagination.SearchPagination, 20 per page by default).
+        """
+        results = search.SearchResults(request.user, request.query_params.get("q"))
+        if not results.terms:
+            raise ValidationError({"q": ["Enter at least one word."]})
+        paginator = SearchPagination()
+        page = paginator.paginate_queryset(results, request, view=self)
+        return paginator.get_paginated_response(TasksSerializer(page, many=True).data)
+
     @action(detail=False, methods=["get"], url_path="assigned-to-me")
     def assigned_to_me(self, request):
         """
@@ -85,10 +261,12 @@ class TasksViewset(viewsets.ModelViewSet):
 
         Endpoint:
           GET /tasks/assigned-to-me/
+
+        Supports opt-in cursor pagination (?page_size=, ?cursor=) and
+        the filters of tasks_app.filters.
         """
-        qs = self.get_queryset().filter(assignee=request.user)
-        serializer = self.get_serializer(qs, many=True)
-        return Response(serializer.data)
+        qs = self.filter_queryset(self.get_queryset().filter(assignee=request.user))
+        return self.list_response(qs)
 
     @action(detail=False, methods=["get"], url_path="reviewing")
     def review_to_me(self, request):
@@ -98,31 +276,45 @@ class TasksViewset(viewsets.ModelViewSet):
 
         Endpoint:
           GET /tasks/reviewing/
+
+        Supports opt-in cursor pagination (?page_size=, ?cursor=) and
+        the filters of tasks_app.filters.
         """
-        qs = self.get_queryset().filter(reviewer=request.user)
-        serializer = self.get_serializer(qs, many=True)
-        return Response(serializer.data)
+        qs = self.filter_queryset(self.get_queryset().filter(reviewer=request.user))
+        return self.list_response(qs)
 
     @action(detail=True, methods=["get", "post"], url_path="comments")
     def comments(self, request, pk=None):
         """
         GET  /tasks/{id}/comments/   -> list comments for a task
         POST /tasks/{id}/comments/  -> create a comment for a task
+
+        The list supports opt-in cursor pagination (?page_size=, ?cursor=),
+        newest comments first by ID, paginated or not: created_at is only
+        a date and can be set back by imports.
+
+        Only members of the task's board reach the comments, other users
+        get 404 from the scoped queryset (see get_queryset()).
         """
         task = self.get_object()
-        board = task.board
-        user = request.user
-
-        if not (board.owner_id == user.id or board.members.filter(id=user.id).exists()):
-            raise PermissionDenied("Not allowed to comment on this board.")
 
         if request.method == "GET":
-            qs = Comment.objects.filter(task=task).order_by("-created_at")
+            qs = (
+                Comment.objects.filter(task=task)
+                .select_related("author")
+                .order_by("-id")
+            )
+            paginator = NewestFirstCursorPagination()
+            page = paginator.paginate_queryset(qs, request, view=self)
+            if page is not None:
+                return paginator.get_paginated_response(CommentSerializer(page, many=True).data)
             return Response(CommentSerializer(qs, many=True).data)
 
         serializer = CommentSerializer(data=request.data, context={"request": request})
         serializer.is_valid(raise_exception=True)
-        serializer.save(task=task)
+        # The comment row and the task's comments_count change together.
+        with transaction.atomic():
+            serializer.save(task=task)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
     @action(detail=True, methods=["get", "delete"], url_path=r"comments/(?P<comment_id>\d+)")
@@ -142,16 +334,24 @@ class TasksViewset(viewsets.ModelViewSet):
           The lookup includes both the comment ID and the task ID:
             Comment(pk=comment_id, task_id=pk)
           This guarantees that the comment must belong to the given task and
-          prevents accessing or deleting comments from other tasks.
+          prevents accessing or deleting comments from other tasks. The
+          task's board must be accessible to the user, in the same query.
 
         Parameters:
           - pk: task ID (from the parent task route)
           - comment_id: comment ID (captured via the url_path regex)
         """
-        comment = get_object_or_404(Comment, pk=comment_id, task_id=pk)
+        # The task is joined for the access check anyway; loading it lets
+        # the delete receivers read the board without a query.
+        comments = Comment.objects.filter(
+            accessible_board_filter(request.user, "task__board")
+        ).select_related("author", "task")
+        comment = get_object_or_404(comments, pk=comment_id, task_id=pk)
 
         if request.method == "GET":
             return Response(CommentSerializer(comment).data)
 
-        comment.delete()
+        # The comment row and the task's comments_count change together.
+        with transaction.atomic():
+            comment.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,204 @@
+"""
+Bulk task creates, partial updates and moves.
+
+Used by the bulk action of TasksViewset. Every item is validated on its
+own (TaskBulkItemSerializer, no queries), then the referenced boards,
+users and tasks of all items are resolved with one set-based query each.
+Valid items are written together with bulk_create/bulk_update in one
+transaction, invalid items are reported and skipped; updates that change
+no value are not written. Board counters are kept consistent by the
+receivers of tasks_bulk_saved.
+"""
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import status
+from boards_app import membership
+from boards_app.models import Boards
+from tasks_app.api.serializers import TaskBulkItemSerializer, TasksSerializer
+from tasks_app.models import Task
+from tasks_app.signals import tasks_bulk_saved
+
+User = get_user_model()
+
+# Maximum number of items accepted in one request.
+MAX_ITEMS = 500
+
+# Validated item fields that map 1:1 to Task model fields.
+TASK_FIELDS = {
+    "board": "board_id",
+    "title": "title",
+    "description": "description",
+    "status": "status",
+    "priority": "priority",
+    "assignee_id": "assignee_id",
+    "reviewer_id": "reviewer_id",
+    "due_date": "due_date",
+}
+
+
+def _failure(index, status_code, errors):
+    return {"index": index, "status": status_code, "errors": errors}
+
+
+def _missing_user(pk):
+    return [f'Invalid pk "{pk}" - object does not exist.']
+
+
+def _check_references(data, accessible_board_ids, existing_board_ids, users):
+    """
+    Check the board and user references of one validated item.
+
+    Returns:
+        tuple: (status code, errors) of the first problem, or None.
+    """
+    board_id = data.get("board")
+    if board_id is not None and board_id not in accessible_board_ids:
+        if board_id in existing_board_ids:
+            return status.HTTP_403_FORBIDDEN, {
+                "board": ["You are not allowed to use tasks on this board."]
+            }
+        return status.HTTP_404_NOT_FOUND, {"board": ["Board not found."]}
+    errors = {}
+    for field in ("assignee_id", "reviewer_id"):
+        user_id = data.get(field)
+        if user_id is not None and user_id not in users:
+            errors[field] = _missing_user(user_id)
+    if errors:
+        return status.HTTP_400_BAD_REQUEST, errors
+    return None
+
+
+def _apply(task, data, users):
+    """
+    Copy validated item data onto a task, including the nested users.
+
+    Returns:
+        set: The fields whose value changed.
+    """
+    changed = set()
+    for name, attname in TASK_FIELDS.items():
+        if name in data:
+            if getattr(task, attname) != data[name]:
+                changed.add(attname)
+            setattr(task, attname, data[name])
+    for name in ("assignee", "reviewer"):
+        if f"{name}_id" in data:
+            setattr(task, name, users.get(data[f"{name}_id"]))
+    return changed
+
+
+def bulk_save_tasks(user, items, tasks_queryset):
+    """
+    Create, update and move many tasks at once.
+
+    Args:
+        user: The requesting user; new tasks are created by this user.
+        items: List of task dicts. Items with an `id` are partial updates,
+            items without one are creates (board and assignee_id required).
+        tasks_queryset: Tasks the user may update, already scoped to the
+            boards of the user (see TasksViewset.get_queryset).
+
+    Returns:
+        list[dict]: One result per item, in request order:
+        `{"index", "status": 201|200, "task"}` on success or
+        `{"index", "status": 400|403|404, "errors"}` on failure.
+    """
+    results = [None] * len(items)
+    creates, updates = [], []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            results[index] = _failure(
+                index, status.HTTP_400_BAD_REQUEST, {"non_field_errors": ["Expected an object."]}
+            )
+            continue
+        is_update = "id" in item
+        serializer = TaskBulkItemSerializer(data=item, partial=is_update)
+        if not serializer.is_valid():
+            results[index] = _failure(index, status.HTTP_400_BAD_REQUEST, serializer.errors)
+            continue
+        (updates if is_update else creates).append((index, serializer.validated_data))
+
+    # Resolve all references with one query per kind.
+    valid = creates + updates
+    board_ids = {data["board"] for _, data in valid if data.get("board") is not None}
+    accessible_board_ids = membership.accessible_board_ids(user)
+    foreign_board_ids = board_ids - accessible_board_ids
+    existing_board_ids = set()
+    if foreign_board_ids:
+        existing_board_ids = set(
+            Boards.objects.filter(pk__in=foreign_board_ids).values_list("pk", flat=True)
+        )
+    user_ids = {
+        data[field]
+        for _, data in valid
+        for field in ("assignee_id", "reviewer_id")
+        if data.get(field) is not None
+    }
+    users = User.objects.in_bulk(user_ids) if user_ids else {}
+    update_ids = {data["id"] for _, data in updates}
+    tasks = tasks_queryset.in_bulk(update_ids) if update_ids else {}
+
+    new_tasks, changed_tasks, changed_fields, affected_board_ids = [], {}, set(), set()
+    for index, data in creates:
+        problem = _check_references(data, accessible_board_ids, existing_board_ids, users)
+        if problem:
+            results[index] = _failure(index, *problem)
+            continue
+        task = Task(created_by=user)
+        _apply(task, data, users)
+        new_tasks.append((index, task))
+        affected_board_ids.add(task.board_id)
+
+    for index, data in updates:
+        task = tasks.get(data["id"])
+        if task is None:
+            results[index] = _failure(index, status.HTTP_404_NOT_FOUND, {"id": ["Task not found."]})
+            continue
+        problem = _check_references(data, accessible_board_ids, existing_board_ids, users)
+        if problem:
+            results[index] = _failure(index, *problem)
+            continue
+        results[index] = {"index": index, "status": status.HTTP_200_OK, "task": task}
+        # Moves change the counters of the old and the new board.
+        old_board_id = task.board_id
+        fields = _apply(task, data, users)
+        if fields:
+            # Unchanged tasks are not written, their boards not bumped.
+            changed_fields |= fields
+            changed_tasks.setdefault(task.pk, task)
+            affected_board_ids.update((old_board_id, task.board_id))
+
+    with transaction.atomic():
+        # Boards first (as in Task.save()), the tasks are stamped with
+        # their board's next delta sync counter value.
+        sequences = {}
+        if new_tasks or changed_tasks:
+            sequences = Boards.objects.filter(pk__in=affected_board_ids).tick()
+        for _, task in new_tasks:
+            task.sync_seq = sequences.get(task.board_id, 0)
+        created = Task.objects.bulk_create([task for _, task in new_tasks])
+        updated = list(changed_tasks.values())
+        if updated:
+            # bulk_update() does not apply auto_now.
+            now = timezone.now()
+            for task in updated:
+                task.updated_at = now
+                task.sync_seq = sequences.get(task.board_id, 0)
+            Task.objects.bulk_update(updated, sorted(changed_fields | {"updated_at", "sync_seq"}))
+        if created or updated:
+            tasks_bulk_saved.send(
+                sender=Task,
+                created=created,
+                updated=updated,
+                board_ids=affected_board_ids,
+                sequences=sequences,
+            )
+
+    for index, task in new_tasks:
+        results[index] = {"index": index, "status": status.HTTP_201_CREATED, "task": task}
+    for result in results:
+        if "task" in result:
+            result["task"] = TasksSerializer(result["task"]).data
+    return results
@@ -0,0 +1,83 @@
+"""
+Maintenance of the cached `Task.comments_count` column.
+
+The column is adjusted with F() expressions whenever a comment is
+created, moved or deleted, and can be recomputed from the comments
+table to repair drift.
+"""
+
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from boards_app.versions import board_sync_seq
+from tasks_app.models import Comment, Task
+
+
+def adjust_comments_count(task_id, delta):
+    """
+    Add `delta` to the comments_count of a single task in one UPDATE.
+
+    Also sets the task's updated_at and stamps it with the delta sync
+    counter of its board, which the comment write has incremented before:
+    comments_count is part of the task payload (see boards_app.sync).
+    """
+    if task_id is not None and delta:
+        Task.objects.filter(pk=task_id).update(
+            comments_count=F("comments_count") + delta,
+            updated_at=timezone.now(),
+            sync_seq=board_sync_seq(),
+        )
+
+
+def comments_count_expression():
+    """
+    Return an expression computing the comment count of a task.
+    """
+    counted = (
+        Comment.objects.filter(task=OuterRef("pk"))
+        .order_by()
+        .values("task")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    return Coalesce(
+        Subquery(counted, output_field=IntegerField()),
+        Value(0),
+    )
+
+
+def rebuild_comment_counts(task_ids=None):
+    """
+    Recompute comments_count from the comments table.
+
+    Args:
+        task_ids: Optional iterable of task IDs. All tasks if omitted.
+
+    Returns:
+        int: Number of tasks updated.
+    """
+    queryset = Task.objects.all()
+    if task_ids is not None:
+        queryset = queryset.filter(pk__in=list(task_ids))
+    return queryset.update(comments_count=comments_count_expression())
+
+
+def find_comment_count_drift(task_ids=None):
+    """
+    Return tasks whose stored comments_count differs from the actual count.
+
+    Returns:
+        list[dict]: Entries with task_id, stored and expected values.
+    """
+    queryset = Task.objects.annotate(expected=comments_count_expression()).exclude(
+        comments_count=F("expected")
+    )
+    if task_ids is not None:
+        queryset = queryset.filter(pk__in=list(task_ids))
+    return [
+        {"task_id": pk, "stored": stored, "expected": expected}
+        for pk, stored, expected in queryset.order_by("pk").values_list(
+            "pk", "comments_count", "expected"
+        )
+    ]
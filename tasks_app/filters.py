@@ -0,0 +1,170 @@
+"""
+Validated filtering and ordering of the task lists.
+
+GET /api/tasks/, /api/tasks/assigned-to-me/ and /api/tasks/reviewing/
+accept these query parameters:
+
+- status, priority: one or more choices, comma-separated or repeated
+  (?status=to-do,review or ?status=to-do&status=review)
+- board, assignee, reviewer: one or more IDs
+- due_date, due_after, due_before: a date (YYYY-MM-DD); due_after and
+  due_before are inclusive
+- ordering: one of ORDERING_FIELDS, "-" for descending
+
+Parameters are validated with TaskFilterSerializer: unknown values answer
+400 instead of being ignored. Other parameters (page_size, cursor, ...)
+are left to the views.
+
+Every filter is a plain comparison on a column (=, IN, >=, <=), so it
+can be answered from the composite (board, ...) and (assignee/reviewer,
+id) indexes of Task (see Task.Meta.indexes and IndexUsageTests). The ID
+is appended to every ordering, so the order is total and stable between
+requests.
+"""
+
+from rest_framework import serializers
+from rest_framework.filters import BaseFilterBackend
+
+from tasks_app.models import Task
+
+# Values of ?ordering= (with an optional "-" prefix).
+ORDERING_FIELDS = ("id", "due_date", "updated_at")
+
+# Orderings the cursor pagination supports: the cursor holds the value
+# of the first ordering field, which must not be NULL.
+PAGINATED_ORDERING_FIELDS = ("id", "updated_at")
+
+# Most values per list parameter, to keep IN (...) lists short.
+MAX_VALUES = 50
+
+# Actions of TasksViewset whose lists are filtered.
+LIST_ACTIONS = ("list", "assigned_to_me", "review_to_me")
+
+
+class CommaSeparatedField(serializers.ListField):
+    """
+    List field reading comma-separated and/or repeated query parameters.
+    """
+
+    def get_value(self, dictionary):
+        values = super().get_value(dictionary)
+        if values is serializers.empty:
+            return values
+        return [part for value in values for part in str(value).split(",") if part]
+
+
+class TaskFilterSerializer(serializers.Serializer):
+    """
+    Validates the filter and ordering parameters of a task list.
+    """
+
+    status = CommaSeparatedField(
+        child=serializers.ChoiceField(choices=Task.Status.choices),
+        required=False,
+        max_length=MAX_VALUES,
+    )
+    priority = CommaSeparatedField(
+        child=serializers.ChoiceField(choices=Task.Priority.choices),
+        required=False,
+        max_length=MAX_VALUES,
+    )
+    board = CommaSeparatedField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        max_length=MAX_VALUES,
+    )
+    assignee = CommaSeparatedField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        max_length=MAX_VALUES,
+    )
+    reviewer = CommaSeparatedField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        max_length=MAX_VALUES,
+    )
+    due_date = serializers.DateField(required=False)
+    due_after = serializers.DateField(required=False)
+    due_before = serializers.DateField(required=False)
+    ordering = serializers.ChoiceField(
+        choices=[prefix + field for field in ORDERING_FIELDS for prefix in ("", "-")],
+        required=False,
+    )
+
+
+def parse_params(query_params):
+    """
+    Validate the filter and ordering parameters of a request.
+
+    Args:
+        query_params: The QueryDict of the request (request.GET).
+
+    Returns:
+        dict: The validated parameters that were given.
+
+    Raises:
+        ValidationError: A parameter has an invalid value.
+    """
+    serializer = TaskFilterSerializer(data=query_params)
+    serializer.is_valid(raise_exception=True)
+    return serializer.validated_data
+
+
+def filter_tasks(queryset, params):
+    """
+    Narrow a task queryset to the validated `params` (see parse_params()).
+
+    Returns:
+        QuerySet: The filtered queryset, ordered by ?ordering= and ID, or
+        unchanged in order if no ordering was given.
+    """
+    lookups = {}
+    for field in ("status", "priority", "board", "assignee", "reviewer"):
+        values = params.get(field)
+        if len(values or ()) == 1:
+            lookups[field] = values[0]
+        elif values:
+            lookups[f"{field}__in"] = values
+    if "due_date" in params:
+        lookups["due_date"] = params["due_date"]
+    if "due_after" in params:
+        lookups["due_date__gte"] = params["due_after"]
+    if "due_before" in params:
+        lookups["due_date__lte"] = params["due_before"]
+    queryset = queryset.filter(**lookups)
+    ordering = task_ordering(params)
+    return queryset.order_by(*ordering) if ordering else queryset
+
+
+def task_ordering(params):
+    """
+    Return the order_by() fields of ?ordering=, or () if not given.
+    """
+    ordering = params.get("ordering")
+    if not ordering or ordering.lstrip("-") == "id":
+        return (ordering,) if ordering else ()
+    return (ordering, "-id" if ordering.startswith("-") else "id")
+
+
+class TaskFilterBackend(BaseFilterBackend):
+    """
+    DRF filter backend applying filter_tasks() to the task lists.
+
+    It also provides the ordering of the cursor pagination
+    (CursorPagination.get_ordering() asks the view's filter backends),
+    so paginated lists are returned in the requested order.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        if getattr(view, "action", None) not in LIST_ACTIONS:
+            return queryset
+        return filter_tasks(queryset, parse_params(request.query_params))
+
+    def get_ordering(self, request, queryset, view):
+        ordering = task_ordering(parse_params(request.query_params))
+        if ordering and ordering[0].lstrip("-") not in PAGINATED_ORDERING_FIELDS:
+            names = ", ".join(PAGINATED_ORDERING_FIELDS)
+            raise serializers.ValidationError(
+                {"ordering": [f"Paginated lists can only be ordered by {names}."]}
+            )
+        return ordering
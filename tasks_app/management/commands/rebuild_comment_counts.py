@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from tasks_app.counters import find_comment_count_drift, rebuild_comment_counts
+
+
+class Command(BaseCommand):
+    """
+    Verify and repair the cached Task.comments_count column.
+
+    Usage:
+        python manage.py rebuild_comment_counts            # repair all tasks
+        python manage.py rebuild_comment_counts 12 40      # repair selected tasks
+        python manage.py rebuild_comment_counts --check    # only report drift
+    """
+
+    help = "Verify and repair the cached comment counts stored on tasks."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "task_ids",
+            nargs="*",
+            type=int,
+            help="Restrict the run to these task IDs.",
+        )
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only verify the counts and fail if any task is out of sync.",
+        )
+
+    def handle(self, *args, **options):
+        task_ids = options["task_ids"] or None
+        drift = find_comment_count_drift(task_ids)
+
+        for entry in drift:
+            self.stdout.write(
+                f"Task {entry['task_id']}: stored={entry['stored']} expected={entry['expected']}"
+            )
+
+        if options["check"]:
+            if drift:
+                raise CommandError(f"{len(drift)} task(s) have out-of-sync comment counts.")
+            self.stdout.write(self.style.SUCCESS("All comment counts are in sync."))
+            return
+
+        # Only the drifted rows need to be rewritten.
+        with transaction.atomic():
+            repaired = rebuild_comment_counts(entry["task_id"] for entry in drift)
+        self.stdout.write(self.style.SUCCESS(f"Repaired comment counts for {repaired} task(s)."))
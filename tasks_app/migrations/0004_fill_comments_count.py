@@ -0,0 +1,34 @@
+# Generated by Django 6.0 on 2026-10-18 19:20
+
+from django.db import migrations
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def fill_comments_count(apps, schema_editor):
+    """
+    Initialize Task.comments_count from the existing comments.
+    """
+    Task = apps.get_model("tasks_app", "Task")
+    Comment = apps.get_model("tasks_app", "Comment")
+    counted = (
+        Comment.objects.filter(task=OuterRef("pk"))
+        .order_by()
+        .values("task")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    Task.objects.update(
+        comments_count=Coalesce(Subquery(counted, output_field=IntegerField()), Value(0))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks_app', '0003_task_created_by_alter_task_status'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_comments_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,87 @@
+# Generated by Django 6.0 on 2026-10-18 23:10
+
+from django.db import migrations
+
+# The full-text index as of this migration, see tasks_app.search. Frozen
+# here so later changes of that module do not change this migration.
+SQLITE_INSTALL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS tasks_app_task_fts USING fts5(title, description, "
+    "content='tasks_app_task', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS tasks_app_task_fts_insert AFTER INSERT ON tasks_app_task "
+    "BEGIN INSERT INTO tasks_app_task_fts(rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_app_task_fts_delete AFTER DELETE ON tasks_app_task "
+    "BEGIN INSERT INTO tasks_app_task_fts(tasks_app_task_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_app_task_fts_update AFTER UPDATE OF title, description "
+    "ON tasks_app_task "
+    "BEGIN INSERT INTO tasks_app_task_fts(tasks_app_task_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO tasks_app_task_fts(rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); END",
+    "INSERT INTO tasks_app_task_fts(tasks_app_task_fts) VALUES ('rebuild')",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS tasks_app_comment_fts USING fts5(content, "
+    "content='tasks_app_comment', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS tasks_app_comment_fts_insert AFTER INSERT ON tasks_app_comment "
+    "BEGIN INSERT INTO tasks_app_comment_fts(rowid, content) VALUES (new.id, new.content); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_app_comment_fts_delete AFTER DELETE ON tasks_app_comment "
+    "BEGIN INSERT INTO tasks_app_comment_fts(tasks_app_comment_fts, rowid, content) "
+    "VALUES ('delete', old.id, old.content); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_app_comment_fts_update AFTER UPDATE OF content "
+    "ON tasks_app_comment "
+    "BEGIN INSERT INTO tasks_app_comment_fts(tasks_app_comment_fts, rowid, content) "
+    "VALUES ('delete', old.id, old.content); "
+    "INSERT INTO tasks_app_comment_fts(rowid, content) VALUES (new.id, new.content); END",
+    "INSERT INTO tasks_app_comment_fts(tasks_app_comment_fts) VALUES ('rebuild')",
+]
+
+SQLITE_DROP = [
+    "DROP TRIGGER IF EXISTS tasks_app_task_fts_insert",
+    "DROP TRIGGER IF EXISTS tasks_app_task_fts_delete",
+    "DROP TRIGGER IF EXISTS tasks_app_task_fts_update",
+    "DROP TABLE IF EXISTS tasks_app_task_fts",
+    "DROP TRIGGER IF EXISTS tasks_app_comment_fts_insert",
+    "DROP TRIGGER IF EXISTS tasks_app_comment_fts_delete",
+    "DROP TRIGGER IF EXISTS tasks_app_comment_fts_update",
+    "DROP TABLE IF EXISTS tasks_app_comment_fts",
+]
+
+POSTGRES_INSTALL = [
+    "CREATE INDEX IF NOT EXISTS task_search_idx ON tasks_app_task USING gin ("
+    "(setweight(to_tsvector('simple'::regconfig, coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple'::regconfig, coalesce(description, '')), 'B')))",
+    "CREATE INDEX IF NOT EXISTS comment_search_idx ON tasks_app_comment USING gin ("
+    "to_tsvector('simple'::regconfig, content))",
+]
+
+POSTGRES_DROP = [
+    "DROP INDEX IF EXISTS task_search_idx",
+    "DROP INDEX IF EXISTS comment_search_idx",
+]
+
+
+def _run(schema_editor, statements):
+    for statement in statements.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement, params=None)
+
+
+def install_index(apps, schema_editor):
+    """
+    Create the full-text index of the backend, see tasks_app.search.
+    """
+    _run(schema_editor, {"sqlite": SQLITE_INSTALL, "postgresql": POSTGRES_INSTALL})
+
+
+def drop_index(apps, schema_editor):
+    _run(schema_editor, {"sqlite": SQLITE_DROP, "postgresql": POSTGRES_DROP})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks_app', '0006_task_comment_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_index, drop_index),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 6.0 on 2026-10-19 00:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards_app', '0011_sync_clock'),
+        ('tasks_app', '0008_task_list_filter_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='comment',
+            name='comment_task_updated_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_board_updated_idx',
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='sync_seq',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='sync_seq',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['task', 'sync_seq'], name='comment_task_seq_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['board', 'sync_seq'], name='task_board_seq_idx'),
+        ),
+    ]
@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 from boards_app.models import Boards
 from django.utils import timezone
@@ -100,10 +100,104 @@ class Task(models.Model):
     )
 
     # Cached number of comments associated with this task.
-    # This can be used for performance optimization if comment counts
-    # are needed frequently.
+    # Maintained by tasks_app.counters on every comment write and
+    # repairable with `manage.py rebuild_comment_counts`.
     comments_count = models.IntegerField(default=0)
 
+    # Time of the last change of the task or its comments_count.
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # Delta sync counter value of the board (Boards.sync_seq) at the last
+    # change of the task or its comments_count, see boards_app.sync.
+    sync_seq = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            # Delta sync: changed tasks of the user's boards.
+            models.Index(fields=["board", "sync_seq"], name="task_board_seq_idx"),
+            # Board counters: tasks of a board by status.
+            models.Index(fields=["board", "status"], name="task_board_status_idx"),
+            # Board counters (high-priority tasks of a board) and task list
+            # filters (tasks_app.filters): tasks of a board by priority, and
+            # by due date range or in due date order.
+            models.Index(fields=["board", "priority"], name="task_board_priority_idx"),
+            models.Index(fields=["board", "due_date"], name="task_board_due_idx"),
+            # assigned-to-me / reviewing, in keyset pagination order.
+            models.Index(
+                fields=["assignee", "id"],
+                condition=models.Q(assignee__isnull=False),
+                name="task_assignee_id_idx",
+            ),
+            models.Index(
+                fields=["reviewer", "id"],
+                condition=models.Q(reviewer__isnull=False),
+                name="task_reviewer_id_idx",
+            ),
+        ]
+
+    # Fields that contribute to the denormalized counters on Boards.
+    COUNTER_FIELDS = ("board_id", "status", "priority")
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Remember the counter-relevant state as loaded from the database.
+
+        The post_delete handler and bulk writes (tasks_app.bulk) compare it
+        with the current state. save() re-reads it under a row lock.
+        """
+        instance = super().from_db(db, field_names, values)
+        if all(field in instance.__dict__ for field in cls.COUNTER_FIELDS):
+            instance._counter_state = instance.counter_state()
+        return instance
+
+    def counter_state(self):
+        """
+        Return (board_id, status, priority) for board counter bookkeeping.
+        """
+        return (self.board_id, self.status, self.priority)
+
+    def save(self, *args, **kwargs):
+        """
+        Save the task and its board counter updates in one transaction.
+
+        The previous counter state is read with SELECT ... FOR UPDATE in
+        the same transaction: a concurrent save of the same task waits for
+        it and sees the state this one wrote, instead of both applying
+        their counter deltas (boards_app.counters) from the same old state
+        captured when the instances were loaded.
+
+        The task is stamped with the next value of its board's delta sync
+        counter (BoardsQuerySet.tick()), the previous board of a moved task
+        is ticked as well (`_board_sequences`, for its tombstone). Boards
+        are locked before the task, like in bulk writes (tasks_app.bulk).
+        """
+        using = kwargs.get("using")
+        boards = Boards.objects.using(using)
+        with transaction.atomic(using=using, savepoint=False):
+            board_ids = {self.board_id}
+            loaded = getattr(self, "_counter_state", None)
+            if loaded is not None:
+                board_ids.add(loaded[0])
+            sequences = boards.filter(pk__in=board_ids).tick()
+            if self.pk is not None:
+                self._counter_state = (
+                    Task.objects.using(using)
+                    .select_for_update()
+                    .filter(pk=self.pk)
+                    .values_list(*self.COUNTER_FIELDS)
+                    .first()
+                )
+                if self._counter_state is not None and self._counter_state[0] not in sequences:
+                    # Moved by a concurrent write since it was loaded.
+                    sequences.update(boards.filter(pk=self._counter_state[0]).tick())
+            self._board_sequences = sequences
+            self.sync_seq = sequences.get(self.board_id, 0)
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "sync_seq"}
+            super().save(*args, **kwargs)
+
 
 class Comment(models.Model):
     """
@@ -129,3 +223,45 @@ class Comment(models.Model):
 
     # Text content of the comment.
     content = models.TextField(blank=True)
+
+    # Time of the last change.
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # Delta sync counter value of the board at the last change, see
+    # boards_app.sync.
+    sync_seq = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            # Delta sync: changed comments of the tasks of the user's boards.
+            models.Index(fields=["task", "sync_seq"], name="comment_task_seq_idx"),
+            # Comments of a task, newest first (also paginated).
+            models.Index(fields=["task", "-id"], name="comment_task_id_idx"),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Remember the task the comment was counted towards when loaded.
+        """
+        instance = super().from_db(db, field_names, values)
+        if "task_id" in instance.__dict__:
+            instance._counted_task_id = instance.task_id
+        return instance
+
+    def save(self, *args, **kwargs):
+        """
+        Save the comment and the comments_count update in one transaction.
+
+        The comment is stamped with the next value of the delta sync
+        counter of its task's board (BoardsQuerySet.tick()), taken first.
+        """
+        using = kwargs.get("using")
+        with transaction.atomic(using=using, savepoint=False):
+            board = Task.objects.using(using).filter(pk=self.task_id).values("board_id")
+            sequences = Boards.objects.using(using).filter(pk__in=board).tick()
+            self.sync_seq = next(iter(sequences.values()), 0)
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "sync_seq"}
+            super().save(*args, **kwargs)
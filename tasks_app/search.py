@@ -0,0 +1,253 @@
+"""
+Full-text search over tasks and their comments.
+
+A task matches if its title and description, or one of its comments,
+contain every word of the query. The last word also matches as a word
+prefix (search as you type); only matching one word by prefix keeps
+queries with frequent words fast. Matches are ranked by relevance; title
+words weigh more than description words.
+
+Backends:
+- SQLite: FTS5 tables over the task titles/descriptions and over the
+  comment contents (external content tables, the text is not stored
+  twice). Triggers keep them in sync on every INSERT/UPDATE/DELETE, so
+  bulk_create() and update() are covered as well. Ranked by bm25().
+- PostgreSQL: GIN expression indexes on to_tsvector('simple', ...) of the
+  same columns, ranked by ts_rank(). The 'simple' configuration does not
+  stem: boards are written in several languages.
+- Other backends: unindexed icontains lookups, newest tasks first.
+
+The indexes are created by migration 0007_task_search, which has its own
+frozen copy of the statements below. On SQLite, migrations that rebuild
+the task or comment table drop its triggers, so install_index() runs
+again after every migrate (see signals.py), recreates missing triggers
+and rebuilds the FTS table they belong to.
+"""
+
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+from boards_app.models import Boards, accessible_board_filter
+from tasks_app.models import Task
+
+# Words of a query beyond this are ignored.
+MAX_TERMS = 8
+
+# bm25() weights of the title and description columns (SQLite). On
+# PostgreSQL titles have weight A and descriptions weight B.
+TITLE_WEIGHT = 2.0
+DESCRIPTION_WEIGHT = 1.0
+
+SQLITE_TABLES = {
+    "tasks_app_task_fts": ("tasks_app_task", ("title", "description")),
+    "tasks_app_comment_fts": ("tasks_app_comment", ("content",)),
+}
+
+# Indexed expressions; queries must use exactly the same ones.
+POSTGRES_TASK_DOCUMENT = (
+    "(setweight(to_tsvector('simple'::regconfig, coalesce({table}title, '')), 'A') || "
+    "setweight(to_tsvector('simple'::regconfig, coalesce({table}description, '')), 'B'))"
+)
+POSTGRES_COMMENT_DOCUMENT = "to_tsvector('simple'::regconfig, {table}content)"
+
+
+def _sqlite_index_sql(fts_table, table, columns):
+    names = ", ".join(columns)
+    new = ", ".join(f"new.{column}" for column in columns)
+    old = ", ".join(f"old.{column}" for column in columns)
+    delete = f"INSERT INTO {fts_table}({fts_table}, rowid, {names}) VALUES ('delete', old.id, {old});"
+    insert = f"INSERT INTO {fts_table}(rowid, {names}) VALUES (new.id, {new});"
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5({names}, "
+        f"content='{table}', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_insert AFTER INSERT ON {table} "
+        f"BEGIN {insert} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_delete AFTER DELETE ON {table} "
+        f"BEGIN {delete} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_update AFTER UPDATE OF {names} ON {table} "
+        f"BEGIN {delete} {insert} END",
+    ]
+
+
+def install_index(connection=connection):
+    """
+    Create the search index of the backend if it is missing.
+
+    On SQLite the FTS tables are rebuilt from the source tables when a
+    trigger had to be (re)created, i.e. on the first install and after a
+    table rebuild dropped the triggers.
+    """
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+            triggers = {name for (name,) in cursor.fetchall()}
+            for fts_table, (table, columns) in SQLITE_TABLES.items():
+                names = {f"{fts_table}_{kind}" for kind in ("insert", "delete", "update")}
+                if names <= triggers:
+                    continue
+                for statement in _sqlite_index_sql(fts_table, table, columns):
+                    cursor.execute(statement)
+                cursor.execute(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')")
+        elif connection.vendor == "postgresql":
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS task_search_idx ON tasks_app_task "
+                f"USING gin ({POSTGRES_TASK_DOCUMENT.format(table='')})"
+            )
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS comment_search_idx ON tasks_app_comment "
+                f"USING gin ({POSTGRES_COMMENT_DOCUMENT.format(table='')})"
+            )
+
+
+def drop_index(connection=connection):
+    """
+    Drop the search index of the backend (reverse of install_index()).
+    """
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            for fts_table in SQLITE_TABLES:
+                for kind in ("insert", "delete", "update"):
+                    cursor.execute(f"DROP TRIGGER IF EXISTS {fts_table}_{kind}")
+                cursor.execute(f"DROP TABLE IF EXISTS {fts_table}")
+        elif connection.vendor == "postgresql":
+            cursor.execute("DROP INDEX IF EXISTS task_search_idx")
+            cursor.execute("DROP INDEX IF EXISTS comment_search_idx")
+
+
+def search_terms(text):
+    """
+    Split a query into lower-cased words (at most MAX_TERMS).
+
+    Everything but letters, digits and underscores separates words, so
+    the terms are safe to embed in FTS5 and tsquery syntax.
+    """
+    return re.findall(r"\w+", (text or "").lower())[:MAX_TERMS]
+
+
+def _sqlite_matches(ranked=True):
+    task_weights = f"{TITLE_WEIGHT}, {DESCRIPTION_WEIGHT}"
+    task_score = f"-bm25(tasks_app_task_fts, {task_weights})" if ranked else "0"
+    comment_score = "-bm25(tasks_app_comment_fts)" if ranked else "0"
+    return (
+        f"SELECT rowid AS task_id, {task_score} AS score "
+        "FROM tasks_app_task_fts WHERE tasks_app_task_fts MATCH %s "
+        "UNION ALL "
+        f"SELECT comment.task_id, {comment_score} AS score "
+        "FROM tasks_app_comment_fts "
+        "JOIN tasks_app_comment AS comment ON comment.id = tasks_app_comment_fts.rowid "
+        "WHERE tasks_app_comment_fts MATCH %s"
+    )
+
+
+def _postgres_matches(ranked=True):
+    task_document = POSTGRES_TASK_DOCUMENT.format(table="task.")
+    comment_document = POSTGRES_COMMENT_DOCUMENT.format(table="comment.")
+    if ranked:
+        task_score = f"ts_rank({task_document}, to_tsquery('simple', %s))"
+        comment_score = f"ts_rank({comment_document}, to_tsquery('simple', %s))"
+    else:
+        task_score = comment_score = "0"
+    sql = (
+        f"SELECT task.id AS task_id, {task_score} AS score "
+        f"FROM tasks_app_task AS task WHERE {task_document} @@ to_tsquery('simple', %s) "
+        "UNION ALL "
+        f"SELECT comment.task_id, {comment_score} AS score "
+        "FROM tasks_app_comment AS comment "
+        f"WHERE {comment_document} @@ to_tsquery('simple', %s)"
+    )
+    return sql, 4 if ranked else 2
+
+
+class SearchResults:
+    """
+    Ranked tasks of the user's boards matching a query.
+
+    Lazy and sliceable like a queryset, so it can be paginated with
+    Django's Paginator: count() and every slice run one query each, a
+    slice loads its tasks (with assignee and reviewer) with one more.
+    """
+
+    def __init__(self, user, text):
+        self.user = user
+        self.terms = search_terms(text)
+        self._count = None
+
+    def _matches_sql(self, ranked=True):
+        """
+        Return (sql, params) selecting (task_id, score) of the matches on
+        the user's boards, one row per match (a task may match more than
+        once through its comments). Scores are 0 unless `ranked`.
+        """
+        boards_sql, boards_params = (
+            Boards.objects.accessible_to(self.user).values("pk").query.sql_with_params()
+        )
+        *words, last = self.terms
+        if connection.vendor == "sqlite":
+            match = " ".join([*(f'"{word}"' for word in words), f'"{last}"*'])
+            matches, params = _sqlite_matches(ranked), [match, match]
+        else:
+            match = " & ".join([*words, f"{last}:*"])
+            matches, placeholders = _postgres_matches(ranked)
+            params = [match] * placeholders
+        sql = (
+            f"SELECT matches.task_id, matches.score FROM ({matches}) AS matches "
+            "JOIN tasks_app_task AS task ON task.id = matches.task_id "
+            f"WHERE task.board_id IN ({boards_sql})"
+        )
+        return sql, [*params, *boards_params]
+
+    def _fallback(self):
+        queryset = Task.objects.filter(accessible_board_filter(self.user, "board"))
+        for term in self.terms:
+            queryset = queryset.filter(
+                Q(title__icontains=term)
+                | Q(description__icontains=term)
+                | Q(pk__in=Task.objects.filter(comments__content__icontains=term).values("pk"))
+            )
+        return queryset.order_by("-pk")
+
+    def count(self):
+        if self._count is None:
+            if not self.terms:
+                self._count = 0
+            elif connection.vendor in ("sqlite", "postgresql"):
+                # Ranking every match only to count them would cost as
+                # much as loading a page.
+                sql, params = self._matches_sql(ranked=False)
+                with connection.cursor() as cursor:
+                    cursor.execute(f"SELECT COUNT(DISTINCT task_id) FROM ({sql}) AS found", params)
+                    self._count = cursor.fetchone()[0]
+            else:
+                self._count = self._fallback().count()
+        return self._count
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice) or index.step is not None:
+            raise TypeError("SearchResults only support slicing.")
+        start = index.start or 0
+        if not self.terms or (index.stop is not None and index.stop <= start):
+            return []
+        limit = -1 if index.stop is None else index.stop - start
+        if connection.vendor not in ("sqlite", "postgresql"):
+            task_ids = list(self._fallback().values_list("pk", flat=True)[index])
+        else:
+            sql, params = self._matches_sql()
+            if limit >= 0 or connection.vendor == "sqlite":
+                # SQLite has no OFFSET without LIMIT; LIMIT -1 is unlimited.
+                limit_sql, limit_params = "LIMIT %s OFFSET %s", [limit, start]
+            else:
+                limit_sql, limit_params = "OFFSET %s", [start]
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"SELECT task_id, MAX(score) AS score FROM ({sql}) AS found "
+                    f"GROUP BY task_id ORDER BY score DESC, task_id DESC {limit_sql}",
+                    [*params, *limit_params],
+                )
+                task_ids = [task_id for task_id, _ in cursor.fetchall()]
+        tasks = Task.objects.select_related("assignee", "reviewer").in_bulk(task_ids)
+        return [tasks[task_id] for task_id in task_ids if task_id in tasks]
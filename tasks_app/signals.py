@@ -0,0 +1,220 @@
+from django.db import connections
+from django.db.migrations.recorder import MigrationRecorder
+from django.db.models.signals import post_delete, post_migrate, post_save, pre_delete
+from django.dispatch import Signal, receiver
+from boards_app import events
+from boards_app.counters import apply_task_change, rebuild_counters
+from boards_app.versions import bump_board_versions, bump_task_board_version
+from tasks_app.counters import adjust_comments_count
+from boards_app.models import Boards, Tombstone
+from tasks_app import search
+from tasks_app.models import Comment, Task
+
+
+# Sent by tasks_app.bulk after tasks were written with bulk_create/bulk_update,
+# which send no post_save. Arguments: created and updated (lists of tasks),
+# board_ids (set of IDs of every board that gained, lost or changed a task)
+# and sequences ({board_id: delta sync counter value} of those boards, the
+# tasks were stamped with, see BoardsQuerySet.tick()).
+tasks_bulk_saved = Signal()
+
+
+def _task_board_id(comment, task_id):
+    """
+    Return the board of a comment's task, without a query if the task is loaded.
+    """
+    if task_id == comment.task_id and Comment.task.is_cached(comment):
+        return comment.task.board_id
+    return Task.objects.filter(pk=task_id).values_list("board_id", flat=True).first()
+
+
+def _deletion_origin_model(origin):
+    """
+    Return the model class a delete() call started from.
+
+    `origin` is the model instance or queryset passed to post_delete.
+    """
+    if origin is None:
+        return None
+    return getattr(origin, "model", None) or type(origin)
+
+
+@receiver(pre_delete, sender=Task)
+@receiver(pre_delete, sender=Comment)
+def take_deletion_sequence(sender, instance, **kwargs):
+    """
+    Tick the delta sync counter of the board of a deleted task or comment
+    before the row is deleted, so the board is locked before the row (as
+    on save). The tombstone is stamped with the value.
+
+    Skipped where the post_delete receivers skip the deletion.
+    """
+    skipped = (Boards,) if sender is Task else (Task, Boards)
+    if _deletion_origin_model(kwargs.get("origin")) in skipped:
+        return
+    if sender is Task:
+        board = [(getattr(instance, "_counter_state", None) or instance.counter_state())[0]]
+    else:
+        task_id = getattr(instance, "_counted_task_id", instance.task_id)
+        board = Task.objects.filter(pk=task_id).values("board_id")
+    sequences = Boards.objects.filter(pk__in=board).tick()
+    instance._deletion_seq = next(iter(sequences.values()), 0)
+
+
+@receiver(post_save, sender=Task)
+def update_board_counters_on_save(sender, instance, created, raw, **kwargs):
+    """
+    Adjust board counters and versions after a task was created or updated.
+
+    Covers status/priority changes and moves between boards. Other field
+    changes only bump the board version. Publishes the change to the
+    board's subscribers (boards_app.events).
+    """
+    if raw:
+        return
+    old_state = None if created else getattr(instance, "_counter_state", None)
+    new_state = instance.counter_state()
+    apply_task_change(old_state, new_state)
+    if old_state is not None and old_state[0] != new_state[0]:
+        # Moved: clients syncing the old board drop the task.
+        Tombstone.objects.create(
+            kind=Tombstone.Kind.TASK,
+            object_id=instance.pk,
+            board_id=old_state[0],
+            sync_seq=instance._board_sequences.get(old_state[0], 0),
+        )
+        events.publish(old_state[0], events.TASK_DELETED, id=instance.pk)
+    event_type = events.TASK_UPDATED if old_state is not None else events.TASK_CREATED
+    events.publish(instance.board_id, event_type, id=instance.pk)
+    instance._counter_state = new_state
+
+
+@receiver(post_delete, sender=Task)
+def update_board_counters_on_delete(sender, instance, **kwargs):
+    """
+    Adjust board counters after a task was deleted (directly or by cascade).
+
+    Skipped when the whole board is being deleted, since its counters
+    go away with it.
+    """
+    if _deletion_origin_model(kwargs.get("origin")) is Boards:
+        return
+    old_state = getattr(instance, "_counter_state", None) or instance.counter_state()
+    apply_task_change(old_state, None)
+    Tombstone.objects.create(
+        kind=Tombstone.Kind.TASK,
+        object_id=instance.pk,
+        board_id=old_state[0],
+        sync_seq=instance._deletion_seq,
+    )
+    events.publish(old_state[0], events.TASK_DELETED, id=instance.pk)
+
+
+@receiver(tasks_bulk_saved)
+def rebuild_board_counters_on_bulk_save(sender, created, updated, board_ids, sequences, **kwargs):
+    """
+    Recompute the counters and bump the versions of all boards touched
+    by a bulk write.
+
+    Set-based UPDATEs instead of one F() update per task. Moved tasks
+    leave a tombstone on their old board. Every board gets a single
+    tasks.changed event with the IDs of its created, updated or
+    removed tasks.
+    """
+    rebuild_counters(board_ids)
+    bump_board_versions(board_ids)
+    moved = [
+        (task, state[0])
+        for task in updated
+        for state in [getattr(task, "_counter_state", None)]
+        if state is not None and state[0] != task.board_id
+    ]
+    Tombstone.objects.bulk_create(
+        Tombstone(
+            kind=Tombstone.Kind.TASK,
+            object_id=task.pk,
+            board_id=old_board_id,
+            sync_seq=sequences.get(old_board_id, 0),
+        )
+        for task, old_board_id in moved
+    )
+    changed = {}
+    for task in [*created, *updated]:
+        changed.setdefault(task.board_id, set()).add(task.pk)
+    for task, old_board_id in moved:
+        changed.setdefault(old_board_id, set()).add(task.pk)
+    for board_id, task_ids in changed.items():
+        events.publish(board_id, events.TASKS_CHANGED, ids=sorted(task_ids))
+
+
+@receiver(post_save, sender=Comment)
+def update_comments_count_on_save(sender, instance, created, raw, **kwargs):
+    """
+    Increment comments_count for new comments and move it along when a
+    comment is re-attached to another task. Bumps the board version(s)
+    and publishes the change (boards_app.events).
+    """
+    if raw:
+        return
+    old_task_id = None if created else getattr(instance, "_counted_task_id", instance.task_id)
+    if old_task_id != instance.task_id:
+        # The old board first: the task is stamped with its counter.
+        bump_task_board_version(old_task_id)
+        adjust_comments_count(old_task_id, -1)
+        adjust_comments_count(instance.task_id, 1)
+        if old_task_id is not None:
+            events.publish(
+                _task_board_id(instance, old_task_id),
+                events.COMMENT_DELETED,
+                id=instance.pk,
+                task=old_task_id,
+            )
+    bump_task_board_version(instance.task_id)
+    events.publish(
+        _task_board_id(instance, instance.task_id),
+        events.COMMENT_CREATED if created else events.COMMENT_UPDATED,
+        id=instance.pk,
+        task=instance.task_id,
+    )
+    instance._counted_task_id = instance.task_id
+
+
+@receiver(post_delete, sender=Comment)
+def update_comments_count_on_delete(sender, instance, **kwargs):
+    """
+    Decrement comments_count, bump the board version, leave a tombstone
+    and publish the deletion after a comment was deleted (directly or by
+    cascade).
+
+    Skipped when the task (or its board) is being deleted as well.
+    """
+    if _deletion_origin_model(kwargs.get("origin")) in (Task, Boards):
+        return
+    task_id = getattr(instance, "_counted_task_id", instance.task_id)
+    adjust_comments_count(task_id, -1)
+    bump_task_board_version(task_id)
+    board_id = _task_board_id(instance, task_id)
+    if board_id is not None:
+        Tombstone.objects.create(
+            kind=Tombstone.Kind.COMMENT,
+            object_id=instance.pk,
+            board_id=board_id,
+            sync_seq=instance._deletion_seq,
+        )
+    events.publish(board_id, events.COMMENT_DELETED, id=instance.pk, task=task_id)
+
+
+@receiver(post_migrate)
+def reinstall_search_index(sender, app_config, using, **kwargs):
+    """
+    Recreate missing search triggers after migrate, see tasks_app.search.
+
+    SQLite rebuilds a table for many schema changes and drops its
+    triggers with it. Only done while the search migration is applied.
+    """
+    if app_config.name != "tasks_app":
+        return
+    connection = connections[using]
+    applied = MigrationRecorder(connection).applied_migrations()
+    if ("tasks_app", "0007_task_search") in applied:
+        search.install_index(connection)
@@ -1,3 +1,652 @@
+from datetime import date
+from io import StringIO
+from unittest import skipUnless
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.http import QueryDict
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from boards_app.models import Boards, Tombstone, accessible_board_filter
+from core.testing import QueryBudgetTestCase, build_scenario
+from core import synthetic
+from boards_app import membership
+from boards_app.counters import find_counter_drift
+from tasks_app import filters, search
+from tasks_app.counters import find_comment_count_drift
+from tasks_app.models import Comment, Task
 
-# Create your tests here.
+
+class CommentsCountTests(APITestCase):
+    """
+    Tests for the cached Task.comments_count column.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="owner@example.com")
+        self.board = Boards.objects.create(title="Board", owner=self.user)
+        self.board.members.add(self.user)
+        self.task = Task.objects.create(board=self.board, title="Task")
+        self.client.force_authenticate(self.user)
+
+    def assertCommentsCount(self, expected):
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.comments_count, expected)
+        self.assertEqual(find_comment_count_drift(), [])
+
+    def test_comment_actions_keep_count_in_sync(self):
+        url = f"/api/tasks/{self.task.pk}/comments/"
+        first = self.client.post(url, {"content": "first"}, format="json")
+        self.client.post(url, {"content": "second"}, format="json")
+        self.assertCommentsCount(2)
+
+        response = self.client.get(f"/api/tasks/{self.task.pk}/")
+        self.assertEqual(response.json()["comments_count"], 2)
+
+        self.client.delete(f"{url}{first.json()['id']}/")
+        self.assertCommentsCount(1)
+
+    def test_moving_and_cascading_comments(self):
+        other = Task.objects.create(board=self.board, title="Other")
+        comment = Comment.objects.create(task=self.task, author=self.user, content="x")
+        self.assertCommentsCount(1)
+
+        comment = Comment.objects.get(pk=comment.pk)
+        comment.task = other
+        comment.save()
+        self.assertCommentsCount(0)
+        other.refresh_from_db()
+        self.assertEqual(other.comments_count, 1)
+
+        author = User.objects.create_user(username="author@example.com")
+        Comment.objects.create(task=self.task, author=author, content="y")
+        self.assertCommentsCount(1)
+        author.delete()
+        self.assertCommentsCount(0)
+
+    def test_rebuild_command_repairs_drift(self):
+        Comment.objects.create(task=self.task, author=self.user, content="x")
+        Task.objects.filter(pk=self.task.pk).update(comments_count=7)
+
+        with self.assertRaises(CommandError):
+            call_command("rebuild_comment_counts", "--check", stdout=StringIO())
+
+        call_command("rebuild_comment_counts", stdout=StringIO())
+        self.assertCommentsCount(1)
+
+
+class TasksQueryBudgetTests(QueryBudgetTestCase):
+    """
+    Query budgets for every route of tasks_app.api.urls.
+
+    The token of the scenario is cached as after a login, so budgets do
+    not include the token lookup (see user_auth_app.authentication).
+    """
+
+    def test_list(self):
+        # Tasks plus the board versions for the ETag.
+        self.assertQueryBudget(lambda s: self.client.get("/api/tasks/"), budget=2)
+
+    def test_create(self):
+        self.assertQueryBudget(
+            lambda s: self.client.post(
+                "/api/tasks/",
+                {
+                    "board": s.board.pk,
+                    "title": "New",
+                    "assignee_id": s.owner.pk,
+                    "reviewer_id": s.users[0].pk,
+                },
+                format="json",
+            ),
+            # Includes the tick of the board's delta sync counter (boards_app.sync).
+            budget=7,
+            expected_status=201,
+        )
+
+    def test_retrieve(self):
+        self.assertQueryBudget(lambda s: self.client.get(f"/api/tasks/{s.task.pk}/"), budget=1)
+
+    def test_partial_update(self):
+        self.assertQueryBudget(
+            lambda s: self.client.patch(
+                f"/api/tasks/{s.task.pk}/",
+                {"status": Task.Status.DONE, "priority": Task.Priority.HIGH},
+                format="json",
+            ),
+            # The previous counter state is re-read under a row lock, plus
+            # the tick of the board's delta sync counter (boards_app.sync).
+            budget=5,
+        )
+
+    def test_destroy(self):
+        self.assertQueryBudget(
+            lambda s: self.client.delete(f"/api/tasks/{s.task.pk}/"),
+            # Includes the tick of the board's delta sync counter (boards_app.sync).
+            budget=7,
+            expected_status=204,
+            rows_deleted=lambda size: size,
+        )
+
+    def test_assigned_to_me(self):
+        self.assertQueryBudget(lambda s: self.client.get("/api/tasks/assigned-to-me/"), budget=2)
+
+    def test_reviewing(self):
+        self.assertQueryBudget(lambda s: self.client.get("/api/tasks/reviewing/"), budget=2)
+
+    def test_comment_list(self):
+        self.assertQueryBudget(
+            lambda s: self.client.get(f"/api/tasks/{s.task.pk}/comments/"), budget=2
+        )
+
+    def test_comment_create(self):
+        self.assertQueryBudget(
+            lambda s: self.client.post(
+                f"/api/tasks/{s.task.pk}/comments/", {"content": "Hello"}, format="json"
+            ),
+            # Includes the tick of the board's delta sync counter (boards_app.sync).
+            budget=7,
+            expected_status=201,
+        )
+
+    def test_comment_retrieve(self):
+        self.assertQueryBudget(
+            lambda s: self.client.get(
+                f"/api/tasks/{s.task.pk}/comments/{s.task.comments.first().pk}/"
+            ),
+            budget=2,
+        )
+
+    def test_comment_destroy(self):
+        self.assertQueryBudget(
+            lambda s: self.client.delete(
+                f"/api/tasks/{s.task.pk}/comments/{s.task.comments.first().pk}/"
+            ),
+            # Includes the tick of the board's delta sync counter (boards_app.sync).
+            budget=9,
+            expected_status=204,
+        )
+
+
+class TaskScopingTests(APITestCase):
+    """
+    Tests for TasksViewset.get_queryset, scoped to the user's boards.
+    """
+
+    def setUp(self):
+        self.owner, self.member, self.outsider = synthetic.create_users(3, prefix="scope")
+        self.board = synthetic.create_boards(self.owner, 1, members=[self.member])[0]
+        self.tasks = synthetic.create_tasks(
+            self.board, 3, assignees=[self.member], reviewers=[self.member]
+        )
+        foreign_board = synthetic.create_boards(self.outsider, 1)[0]
+        self.foreign_task = synthetic.create_tasks(
+            foreign_board, 1, assignees=[self.member], reviewers=[self.member]
+        )[0]
+        self.comment = synthetic.create_comments(self.foreign_task, 1, authors=[self.outsider])[0]
+
+    def test_lists_contain_only_tasks_of_accessible_boards(self):
+        expected = sorted(task.pk for task in self.tasks)
+        for user in (self.owner, self.member):
+            self.client.force_authenticate(user)
+            # Scoped tasks and the board versions for the ETag.
+            with self.assertNumQueries(2):
+                response = self.client.get("/api/tasks/")
+            self.assertEqual(sorted(task["id"] for task in response.json()), expected)
+
+        self.client.force_authenticate(self.member)
+        for url in ("/api/tasks/assigned-to-me/", "/api/tasks/reviewing/"):
+            response = self.client.get(url)
+            self.assertEqual(sorted(task["id"] for task in response.json()), expected)
+
+    def test_tasks_of_foreign_boards_are_not_found(self):
+        self.client.force_authenticate(self.member)
+        task_url = f"/api/tasks/{self.foreign_task.pk}/"
+        comments_url = f"{task_url}comments/"
+        for response in (
+            self.client.get(task_url),
+            self.client.patch(task_url, {"title": "Taken"}, format="json"),
+            self.client.delete(task_url),
+            self.client.get(comments_url),
+            self.client.post(comments_url, {"content": "Hi"}, format="json"),
+            self.client.get(f"{comments_url}{self.comment.pk}/"),
+            self.client.delete(f"{comments_url}{self.comment.pk}/"),
+        ):
+            self.assertEqual(response.status_code, 404)
+        self.foreign_task.refresh_from_db()
+        self.assertEqual(self.foreign_task.title, "Task 0")
+        self.assertTrue(Comment.objects.filter(pk=self.comment.pk).exists())
+
+
+class TaskBulkTests(APITestCase):
+    """
+    Tests for POST /api/tasks/bulk/.
+    """
+
+    url = "/api/tasks/bulk/"
+
+    def setUp(self):
+        self.user, self.other, self.outsider = synthetic.create_users(3, prefix="bulk")
+        self.board = synthetic.create_boards(self.user, 1, members=[self.other])[0]
+        self.second_board = synthetic.create_boards(self.other, 1, members=[self.user])[0]
+        self.foreign_board = synthetic.create_boards(self.outsider, 1)[0]
+        self.tasks = synthetic.create_tasks(self.board, 5, assignees=[self.user])
+        self.client.force_authenticate(self.user)
+
+    def post(self, items):
+        response = self.client.post(self.url, {"tasks": items}, format="json")
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()["results"]
+
+    def new_items(self, count, board=None):
+        return [
+            {
+                "board": (board or self.board).pk,
+                "title": f"Bulk {index}",
+                "status": Task.Status.DONE,
+                "priority": Task.Priority.HIGH,
+                "assignee_id": self.user.pk,
+                "reviewer_id": self.other.pk,
+            }
+            for index in range(count)
+        ]
+
+    def test_create_update_and_move(self):
+        move = self.tasks[0]
+        results = self.post([
+            *self.new_items(2),
+            {"id": move.pk, "board": self.second_board.pk, "status": Task.Status.REVIEW},
+            {"id": self.tasks[1].pk, "title": "Renamed", "reviewer_id": self.other.pk},
+        ])
+        self.assertEqual([result["status"] for result in results], [201, 201, 200, 200])
+        self.assertEqual(results[0]["task"]["reviewer"]["id"], self.other.pk)
+        self.assertEqual(results[3]["task"]["title"], "Renamed")
+
+        created = Task.objects.get(pk=results[0]["task"]["id"])
+        self.assertEqual(created.created_by, self.user)
+        move.refresh_from_db()
+        self.assertEqual((move.board_id, move.status), (self.second_board.pk, Task.Status.REVIEW))
+        self.assertEqual(find_counter_drift(), [])
+        self.board.refresh_from_db()
+        self.assertEqual(self.board.ticket_count, 6)
+
+    def test_unchanged_tasks_are_not_written(self):
+        task = self.tasks[1]
+        etag = self.client.get(f"/api/boards/{self.board.pk}/")["ETag"]
+        version = Boards.objects.get(pk=self.board.pk).version
+        with CaptureQueriesContext(connection) as ctx:
+            results = self.post([
+                {"id": task.pk},
+                {"id": task.pk, "title": task.title, "status": task.status, "board": self.board.pk},
+            ])
+        self.assertEqual([result["status"] for result in results], [200, 200])
+        self.assertFalse(any(query["sql"].startswith("UPDATE") for query in ctx.captured_queries))
+        self.assertEqual(Boards.objects.get(pk=self.board.pk).version, version)
+        self.assertEqual(self.client.get(f"/api/boards/{self.board.pk}/")["ETag"], etag)
+
+    def test_invalid_items_are_reported_and_skipped(self):
+        foreign_task = synthetic.create_tasks(self.foreign_board, 1)[0]
+        valid, *_ = self.new_items(1)
+        results = self.post([
+            valid,
+            {**valid, "status": "unknown"},
+            {**valid, "board": self.foreign_board.pk},
+            {**valid, "board": self.foreign_board.pk + 100},
+            {**valid, "assignee_id": self.outsider.pk + 100},
+            {"id": foreign_task.pk, "title": "Taken"},
+            {"id": self.tasks[0].pk, "board": self.foreign_board.pk},
+            "not an object",
+        ])
+        self.assertEqual(
+            [result["status"] for result in results], [201, 400, 403, 404, 400, 404, 403, 400]
+        )
+        self.assertIn("assignee_id", results[4]["errors"])
+        self.assertEqual(Task.objects.filter(title="Bulk 0").count(), 1)
+        self.tasks[0].refresh_from_db()
+        self.assertEqual(self.tasks[0].board_id, self.board.pk)
+        self.assertEqual(find_counter_drift(), [])
+
+    def test_request_validation(self):
+        for payload in ({}, {"tasks": "x"}, {"tasks": [{}] * 501}):
+            response = self.client.post(self.url, payload, format="json")
+            self.assertEqual(response.status_code, 400)
+
+    def test_query_count_does_not_grow_with_items(self):
+        membership.accessible_board_ids(self.user)
+        counts = []
+        for count, board in ((5, self.second_board), (50, self.board)):
+            items = self.new_items(count) + [
+                {"id": task.pk, "status": Task.Status.DONE, "board": board.pk}
+                for task in self.tasks
+            ]
+            with CaptureQueriesContext(connection) as ctx:
+                results = self.post(items)
+            self.assertTrue(all(result["status"] in (200, 201) for result in results))
+            counts.append(len(ctx.captured_queries))
+        self.assertEqual(counts[0], counts[1], counts)
+
+
+class TaskPaginationTests(QueryBudgetTestCase):
+    """
+    Tests for the opt-in cursor pagination of task and comment lists.
+    """
+
+    def setUp(self):
+        self.scenario = build_scenario(100)
+        self.authenticate(self.scenario)
+
+    def walk(self, url, page_size):
+        """
+        Follow `next` links, returning all results and the query count per page.
+        """
+        results, query_counts = [], []
+        url = f"{url}?page_size={page_size}"
+        while url:
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            query_counts.append(len(ctx.captured_queries))
+            results.extend(response.json()["results"])
+            url = response.json()["next"]
+        return results, query_counts
+
+    def test_unpaginated_by_default(self):
+        response = self.client.get("/api/tasks/assigned-to-me/")
+        self.assertIsInstance(response.json(), list)
+
+    def test_task_lists_walk_all_pages_at_constant_cost(self):
+        for url, expected in [
+            ("/api/tasks/", Task.objects.count()),
+            ("/api/tasks/assigned-to-me/", Task.objects.filter(assignee=self.scenario.owner).count()),
+            ("/api/tasks/reviewing/", Task.objects.filter(reviewer=self.scenario.owner).count()),
+        ]:
+            results, query_counts = self.walk(url, page_size=7)
+            ids = [task["id"] for task in results]
+            self.assertEqual(len(ids), expected)
+            self.assertEqual(ids, sorted(ids))
+            self.assertEqual(len(set(query_counts)), 1, query_counts)
+
+    def test_comments_newest_first(self):
+        results, query_counts = self.walk(f"/api/tasks/{self.scenario.task.pk}/comments/", page_size=30)
+        ids = [comment["id"] for comment in results]
+        self.assertEqual(len(ids), 100)
+        self.assertEqual(ids, sorted(ids, reverse=True))
+        self.assertEqual(len(set(query_counts)), 1, query_counts)
+
+    def test_comments_in_the_same_order_with_and_without_pages(self):
+        # E.g. imported comments: created_at does not follow the IDs.
+        url = f"/api/tasks/{self.scenario.task.pk}/comments/"
+        comments = self.scenario.task.comments.order_by("pk")
+        Comment.objects.filter(pk__in=comments.values("pk")[:50]).update(created_at=date(2030, 1, 1))
+        results, _ = self.walk(url, page_size=30)
+        unpaginated = self.client.get(url).json()
+        self.assertEqual([row["id"] for row in unpaginated], [row["id"] for row in results])
+
+
+class TaskFilterTests(APITestCase):
+    """
+    Tests for the filters and ordering of the task lists (tasks_app.filters).
+    """
+
+    def setUp(self):
+        self.owner, self.member, self.outsider = synthetic.create_users(3, prefix="filter")
+        self.boards = synthetic.create_boards(self.owner, 2, members=[self.member])
+        due_dates = [date(2026, 3, day) for day in range(1, 8)] + [None]
+        for board in self.boards:
+            synthetic.create_tasks(
+                board, 24, assignees=[self.owner, self.member], reviewers=[self.member, None],
+                due_dates=due_dates,
+            )
+        foreign_board = synthetic.create_boards(self.outsider, 1)[0]
+        synthetic.create_tasks(foreign_board, 8, assignees=[self.owner])
+        self.client.force_authenticate(self.owner)
+        self.visible = Task.objects.filter(board__in=self.boards)
+
+    def ids(self, url, params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return [task["id"] for task in response.json()]
+
+    def test_filters_match_lookups(self):
+        board = self.boards[0]
+        cases = [
+            ({"status": "to-do"}, {"status": "to-do"}),
+            ({"status": "to-do,review"}, {"status__in": ["to-do", "review"]}),
+            ({"priority": ["high", "low"]}, {"priority__in": ["high", "low"]}),
+            ({"board": board.pk}, {"board": board}),
+            ({"assignee": self.member.pk}, {"assignee": self.member}),
+            ({"reviewer": self.member.pk, "status": "review"}, {"reviewer": self.member, "status": "review"}),
+            ({"due_date": "2026-03-02"}, {"due_date": date(2026, 3, 2)}),
+            (
+                {"due_after": "2026-03-02", "due_before": "2026-03-04"},
+                {"due_date__range": (date(2026, 3, 2), date(2026, 3, 4))},
+            ),
+            ({"status": ""}, {}),
+        ]
+        for params, lookups in cases:
+            expected = sorted(self.visible.filter(**lookups).values_list("pk", flat=True))
+            self.assertTrue(expected or not lookups, params)
+            self.assertEqual(sorted(self.ids("/api/tasks/", params)), expected, params)
+
+    def test_assigned_to_me_and_reviewing_are_filtered(self):
+        expected = self.visible.filter(assignee=self.owner, priority="high").order_by("-id")
+        ids = self.ids("/api/tasks/assigned-to-me/", {"priority": "high", "ordering": "-id"})
+        self.assertEqual(ids, list(expected.values_list("pk", flat=True)))
+
+        self.client.force_authenticate(self.member)
+        expected = self.visible.filter(reviewer=self.member, board=self.boards[1])
+        ids = self.ids("/api/tasks/reviewing/", {"board": self.boards[1].pk})
+        self.assertEqual(sorted(ids), sorted(expected.values_list("pk", flat=True)))
+
+    def test_ordering_is_total(self):
+        params = {"due_after": "2026-03-01", "ordering": "-due_date"}
+        expected = self.visible.filter(due_date__isnull=False).order_by("-due_date", "-id")
+        self.assertEqual(self.ids("/api/tasks/", params), list(expected.values_list("pk", flat=True)))
+
+    def test_invalid_parameters_are_rejected(self):
+        for params in (
+            {"status": "later"},
+            {"priority": "high,urgent"},
+            {"board": "first"},
+            {"assignee": "0"},
+            {"due_before": "tomorrow"},
+            {"ordering": "title"},
+            {"board": ",".join(str(pk) for pk in range(1, 60))},
+        ):
+            response = self.client.get("/api/tasks/", params)
+            self.assertEqual(response.status_code, 400, params)
+            self.assertIn(next(iter(params)), response.json())
+
+    def test_paginated_lists_keep_the_ordering(self):
+        Task.objects.filter(pk__in=self.visible.values("pk")[:5]).update(title="Touched")
+        expected = list(
+            self.visible.filter(status="done").order_by("-updated_at", "-id").values_list("pk", flat=True)
+        )
+        ids, url = [], "/api/tasks/?status=done&ordering=-updated_at&page_size=5"
+        while url:
+            response = self.client.get(url)
+            ids.extend(task["id"] for task in response.json()["results"])
+            url = response.json()["next"]
+        self.assertEqual(ids, expected)
+
+        response = self.client.get("/api/tasks/", {"ordering": "due_date", "page_size": 5})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("ordering", response.json())
+
+    def test_filtered_responses_are_smaller(self):
+        full = self.client.get("/api/tasks/")
+        filtered = self.client.get("/api/tasks/", {"status": "review", "board": self.boards[0].pk})
+        self.assertEqual(len(filtered.json()), 6)
+        self.assertLess(len(filtered.content) * 6, len(full.content))
+
+    def test_filter_does_not_apply_to_other_actions(self):
+        task = self.visible.filter(status="done").first()
+        response = self.client.get(f"/api/tasks/{task.pk}/", {"status": "to-do", "ordering": "x"})
+        self.assertEqual(response.status_code, 200)
+
+
+@skipUnless(connection.vendor in ("sqlite", "postgresql"), "planner checks for SQLite/PostgreSQL")
+class TaskSearchTests(APITestCase):
+    """
+    Tests for GET /api/tasks/search/ (tasks_app.search).
+    """
+
+    url = "/api/tasks/search/"
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="owner@example.com")
+        other = User.objects.create_user(username="other@example.com")
+        self.board = Boards.objects.create(title="Board", owner=self.user)
+        foreign = Boards.objects.create(title="Foreign", owner=other)
+        self.title_match = Task.objects.create(board=self.board, title="Invoice export", description="")
+        self.description_match = Task.objects.create(
+            board=self.board, title="Accounting", description="Send the invoices to Müller"
+        )
+        self.commented = Task.objects.create(board=self.board, title="Other", description="")
+        self.comment = Comment.objects.create(task=self.commented, author=self.user, content="Invoice is late")
+        Task.objects.create(board=self.board, title="Unrelated", description="Nothing here")
+        Task.objects.create(board=foreign, title="Invoice of someone else")
+        self.client.force_authenticate(self.user)
+
+    def search(self, q, **params):
+        response = self.client.get(self.url, {"q": q, **params})
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def ids(self, q):
+        return [task["id"] for task in self.search(q)["results"]]
+
+    def test_ranked_matches_of_accessible_boards(self):
+        data = self.search("invoice")
+        self.assertEqual(data["count"], 3)
+        ids = [task["id"] for task in data["results"]]
+        self.assertEqual(ids[0], self.title_match.pk)
+        self.assertEqual(set(ids), {self.title_match.pk, self.description_match.pk, self.commented.pk})
+        self.assertEqual(data["results"][0]["title"], "Invoice export")
+
+    def test_words_prefixes_and_diacritics(self):
+        self.assertEqual(self.ids("invoices muller"), [self.description_match.pk])
+        self.assertEqual(self.ids("EXP"), [self.title_match.pk])
+        self.assertEqual(self.ids("invoice nothing"), [])
+        self.assertEqual(self.ids('late" (*'), [self.commented.pk])
+
+    def test_index_follows_writes(self):
+        self.title_match.title = "Renamed"
+        self.title_match.save()
+        self.comment.delete()
+        self.assertEqual(self.ids("invoice"), [self.description_match.pk])
+        created = synthetic.create_tasks(self.board, 2)
+        Task.objects.filter(pk=created[0].pk).update(description="Bulk invoice")
+        self.assertEqual(set(self.ids("invoice")), {self.description_match.pk, created[0].pk})
+        self.description_match.delete()
+        self.assertEqual(self.ids("invoice"), [created[0].pk])
+
+    def test_pagination_and_queries(self):
+        synthetic.create_tasks(self.board, 30)
+        with self.assertNumQueries(3):
+            data = self.search("task", page_size=25)
+        self.assertEqual((data["count"], len(data["results"])), (30, 25))
+        self.assertIsNotNone(data["next"])
+        self.assertEqual(len(self.search("task", page=2, page_size=25)["results"]), 5)
+
+    def test_open_ended_slices(self):
+        results = search.SearchResults(self.user, "invoice")
+        ranked = [task.pk for task in results[0:3]]
+        self.assertEqual([task.pk for task in results[1:]], ranked[1:])
+        self.assertEqual([task.pk for task in results[:]], ranked)
+
+    def test_requires_words(self):
+        for q in ("", "  ", "*?"):
+            self.assertEqual(self.client.get(self.url, {"q": q}).status_code, 400)
+
+    @skipUnless(connection.vendor == "sqlite", "SQLite FTS5 index")
+    def test_uses_fts_index_and_reinstalls_triggers(self):
+        results = search.SearchResults(self.user, "invoice")
+        sql, params = results._matches_sql()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            plan = " ".join(str(row) for row in cursor.fetchall())
+            self.assertIn("VIRTUAL TABLE INDEX", plan)
+            # As after a migration that rebuilt the task table.
+            cursor.execute("DROP TRIGGER tasks_app_task_fts_insert")
+        task = Task.objects.create(board=self.board, title="Invoice after rebuild")
+        self.assertNotIn(task.pk, self.ids("rebuild"))
+        search.install_index()
+        self.assertEqual(self.ids("rebuild"), [task.pk])
+
+
+class IndexUsageTests(TestCase):
+    """
+    Check that the query planner uses the composite/partial indexes
+    for the hot task and comment queries.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        owner, other = synthetic.create_users(2, prefix="index")
+        board = synthetic.create_boards(owner, 1, members=[other])[0]
+        tasks = synthetic.create_tasks(board, 50, assignees=[owner, other], reviewers=[other, None])
+        synthetic.create_comments(tasks[0], 20, authors=[owner])
+        cls.board, cls.user, cls.task = board, owner, tasks[0]
+
+    def assertUsesIndex(self, queryset, index_name):
+        if connection.vendor == "postgresql":
+            # Tiny test tables would otherwise always be scanned sequentially.
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+        plan = queryset.explain()
+        self.assertIn(index_name, plan)
+
+    def test_board_status_counter(self):
+        queryset = Task.objects.filter(board=self.board, status=Task.Status.TODO).values("pk")
+        self.assertUsesIndex(queryset, "task_board_status_idx")
+
+    def test_board_high_priority_counter(self):
+        queryset = Task.objects.filter(board=self.board, priority=Task.Priority.HIGH).values("pk")
+        self.assertUsesIndex(queryset, "task_board_priority_idx")
+
+    def test_assigned_to_me(self):
+        queryset = Task.objects.filter(assignee=self.user).order_by("id")
+        self.assertUsesIndex(queryset, "task_assignee_id_idx")
+
+    def test_reviewing(self):
+        queryset = Task.objects.filter(reviewer=self.user).order_by("id")
+        self.assertUsesIndex(queryset, "task_reviewer_id_idx")
+
+    def test_comments_of_task(self):
+        queryset = Comment.objects.filter(task=self.task).order_by("-id")
+        self.assertUsesIndex(queryset, "comment_task_id_idx")
+
+    def test_sync_changes(self):
+        # One range per changed board, see boards_app.sync.
+        since = 10
+        tasks = Task.objects.filter(board_id=self.board.pk, sync_seq__gt=since)
+        self.assertUsesIndex(tasks, "task_board_seq_idx")
+        comments = Comment.objects.filter(task__board_id=self.board.pk, sync_seq__gt=since)
+        self.assertUsesIndex(comments, "comment_task_seq_idx")
+        tombstones = Tombstone.objects.filter(board_id=self.board.pk, sync_seq__gt=since)
+        self.assertUsesIndex(tombstones, "tombstone_board_seq_idx")
+
+    def test_accessible_tasks(self):
+        queryset = Task.objects.filter(accessible_board_filter(self.user, "board"))
+        self.assertUsesIndex(queryset, "boards_app_boards_owner_id")
+        self.assertUsesIndex(queryset, "boards_app_boards_members_user_id")
+
+    def test_task_list_filters(self):
+        accessible = Task.objects.filter(accessible_board_filter(self.user, "board"))
+        for query, index_name in [
+            ("status=to-do,review", "task_board_status_idx"),
+            ("priority=low", "task_board_priority_idx"),
+            ("due_after=2026-03-01&due_before=2026-03-31&ordering=due_date", "task_board_due_idx"),
+        ]:
+            params = filters.parse_params(QueryDict(query))
+            self.assertUsesIndex(filters.filter_tasks(accessible, params), index_name)
+
+    def test_assigned_to_me_filters(self):
+        assigned = Task.objects.filter(
+            accessible_board_filter(self.user, "board"), assignee=self.user
+        )
+        params = filters.parse_params(QueryDict("status=done&priority=high&ordering=-updated_at"))
+        self.assertUsesIndex(filters.filter_tasks(assigned, params), "task_assignee_id_idx")
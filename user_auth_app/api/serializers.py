@@ -1,4 +1,6 @@
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
+from user_auth_app import emails
 from user_auth_app.models import UserProfile
 from django.contrib.auth.models import User
 
@@ -24,6 +26,10 @@ class RegistrationsSerializer(serializers.ModelSerializer):
     - email-based registration
     - password confirmation
     - creation of a Django User instance
+
+    Emails are stored normalized (lower-cased) as email and username.
+    Uniqueness is checked on the unique email index (user_auth_app.emails),
+    which also rejects a concurrent registration of the same email.
     """
 
     repeated_password = serializers.CharField(write_only=True)
@@ -44,7 +50,8 @@ class RegistrationsSerializer(serializers.ModelSerializer):
 
         Validation rules:
         - password and repeated_password must match
-        - email must be unique
+        - email must be unique, also against registrations that passed
+          validate_email() at the same time
 
         Returns:
             User: The newly created user instance.
@@ -63,13 +70,19 @@ class RegistrationsSerializer(serializers.ModelSerializer):
         )
         account.first_name = self.validated_data["fullname"]
         account.set_password(pw)
-        account.save()
+        try:
+            with transaction.atomic():
+                account.save()
+        except IntegrityError:
+            # The email (or the username, which is the email) was taken
+            # since validate_email().
+            raise serializers.ValidationError({"email": ["Email already exists"]})
 
         return account
 
     def validate_email(self, value):
         """
-        Ensure the email address is unique.
+        Ensure the email address is unique, in any case.
 
         Args:
             value (str): Email address provided during registration.
@@ -78,9 +91,10 @@ class RegistrationsSerializer(serializers.ModelSerializer):
             ValidationError: If a user with this email already exists.
 
         Returns:
-            str: The validated email value.
+            str: The normalized email value.
         """
-        if User.objects.filter(email=value).exists():
+        value = emails.normalize_email(value)
+        if emails.by_email(value).exists():
             raise serializers.ValidationError(
                 "Email already exists"
             )
@@ -104,14 +118,16 @@ class EmailCheckSerializer(serializers.Serializer):
         """
         Return information about the user associated with the given email.
 
+        The email matches in any case, with one query on the unique email
+        index (see user_auth_app.emails).
+
         If a user exists:
         - return id, email, and fullname
 
         If no user exists:
         - return exists = False
         """
-        email = data["email"]
-        user = User.objects.filter(email__iexact=email).first()
+        user = emails.find_user(data["email"])
 
         if user:
             return {
@@ -121,3 +137,48 @@ class EmailCheckSerializer(serializers.Serializer):
             }
 
         return {"exists": False}
+
+
+class EmailBatchCheckSerializer(serializers.Serializer):
+    """
+    Serializer used to resolve many email addresses at once, e.g. the
+    members to invite to a board.
+
+    Accepts up to MAX_EMAILS addresses and returns the users found and
+    the addresses without a user.
+    """
+
+    MAX_EMAILS = 500
+
+    emails = serializers.ListField(
+        child=serializers.EmailField(),
+        allow_empty=False,
+        max_length=MAX_EMAILS,
+    )
+
+    def to_representation(self, data):
+        """
+        Resolve the validated emails with one query on the unique email
+        index (see user_auth_app.emails), in any case.
+
+        Returns:
+            dict: {"found": [{"id", "email", "fullname"}, ...],
+            "not_found": [email, ...]}, both in request order. An
+            address given several times (in any case) is listed once.
+        """
+        users = {
+            user.email_key: user
+            for user in emails.by_email(data["emails"]).only("id", "email", "first_name")
+        }
+        found, not_found, seen = [], [], set()
+        for email in data["emails"]:
+            key = emails.normalize_email(email)
+            if key in seen:
+                continue
+            seen.add(key)
+            user = users.get(key)
+            if user is None:
+                not_found.append(email)
+            else:
+                found.append({"id": user.id, "email": user.email, "fullname": user.first_name})
+        return {"found": found, "not_found": not_found}
@@ -1,13 +1,14 @@
 from rest_framework.authtoken.models import Token as AuthToken
 from rest_framework import generics
 from user_auth_app.models import UserProfile
-from .serializers import UserProfileSerializer, EmailCheckSerializer
+from .serializers import UserProfileSerializer, EmailCheckSerializer, EmailBatchCheckSerializer
 from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from .serializers import RegistrationsSerializer
 from rest_framework.response import Response
 from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.authtoken.models import Token
+from user_auth_app.authentication import remember_token
 
 
 class UserProfileList(generics.ListCreateAPIView):
@@ -67,7 +68,8 @@ class RegistrationsView(APIView):
 
         On success:
         - Creates the user (password is hashed in the serializer)
-        - Creates or fetches a DRF Token
+        - Creates or fetches a DRF Token and caches it for authentication
+          (see user_auth_app.authentication)
         - Returns: token, fullname, email, user_id
 
         On validation error:
@@ -81,6 +83,8 @@ class RegistrationsView(APIView):
 
         saved_account = serializer.save()
         token, _ = Token.objects.get_or_create(user=saved_account)
+        # The client uses the token right away, skip its first lookup.
+        remember_token(saved_account, token)
 
         return Response(
             {
@@ -102,7 +106,8 @@ class CustomLogin(ObtainAuthToken):
     - password
 
     This project uses email-based login on the frontend, so the view maps
-    incoming 'email' to 'username' (the project stores username=email).
+    incoming 'email' to 'username'. user_auth_app.backends.EmailBackend
+    resolves it on the unique email index, in any case.
     """
 
     permission_classes = [AllowAny]
@@ -140,6 +145,8 @@ class CustomLogin(ObtainAuthToken):
 
         user = serializer.validated_data["user"]
         token, _ = Token.objects.get_or_create(user=user)
+        # The client uses the token right away, skip its first lookup.
+        remember_token(user, token)
 
         return Response(
             {
@@ -202,3 +209,31 @@ class EmailCheckView(APIView):
         if serializer.is_valid(raise_exception=True):
             return Response(serializer.to_representation(serializer.validated_data))
         return Response(serializer.errors, status=404)
+
+
+class EmailBatchCheckView(APIView):
+    """
+    Endpoint to resolve many email addresses in one request.
+
+    - POST /api/email-check/batch/ with {"emails": [...]} (at most
+      EmailBatchCheckSerializer.MAX_EMAILS addresses)
+    - Returns {"found": [{"id", "email", "fullname"}, ...], "not_found": [...]}
+
+    Replaces one GET /api/email-check/ per address, e.g. when inviting
+    board members; all addresses are resolved with one indexed query.
+    """
+
+    serializer_class = EmailBatchCheckSerializer
+
+    def post(self, request):
+        """
+        Validate the list of emails and return the found users and the
+        unknown addresses.
+
+        Returns:
+            Response: 200 with the resolved emails, 400 if `emails` is
+            missing, empty, too long or contains invalid addresses.
+        """
+        serializer = self.serializer_class(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response(serializer.to_representation(serializer.validated_data))
@@ -3,3 +3,9 @@ from django.apps import AppConfig
 
 class UserAuthAppConfig(AppConfig):
     name = 'user_auth_app'
+
+    def ready(self):
+        """
+        Connect the signal handlers of this app.
+        """
+        from . import signals  # noqa: F401
@@ -0,0 +1,115 @@
+"""
+Token authentication with cached token lookups.
+
+rest_framework.authentication.TokenAuthentication loads the token and its
+user with one query on every request. CachedTokenAuthentication keeps the
+(user, token) pair of recently used tokens in the "tokens" cache (a
+local-memory cache, see CACHES in core.settings): entries expire after the
+cache TIMEOUT and the least recently used entries are evicted once
+MAX_ENTRIES is reached.
+
+Entries are dropped by user_auth_app.signals when a token is deleted and
+when its user is saved (e.g. deactivated) or deleted, so revoked tokens
+and inactive users are rejected immediately in this process.
+
+The async views of the read path (core.async_api) authenticate with
+aauthenticate(): cached tokens are resolved without leaving the event
+loop, misses are looked up with the async ORM.
+"""
+
+import hashlib
+
+from django.core.cache import caches
+from django.utils.translation import gettext_lazy as _
+from rest_framework.authentication import TokenAuthentication, get_authorization_header
+from rest_framework.exceptions import AuthenticationFailed
+
+CACHE_ALIAS = "tokens"
+
+
+def _cache():
+    return caches[CACHE_ALIAS]
+
+
+def _key(token_key):
+    # Client supplied values are hashed into safe, fixed length cache keys.
+    return "token:" + hashlib.sha256(token_key.encode()).hexdigest()
+
+
+def remember_token(user, token):
+    """
+    Store a token and its user, e.g. right after login or registration.
+
+    Tokens of inactive users are not cached.
+    """
+    if user.is_active:
+        _cache().set(_key(token.key), (user, token))
+
+
+def forget_tokens(token_keys):
+    """
+    Drop the cached entries of the given token keys.
+    """
+    keys = [_key(token_key) for token_key in token_keys]
+    if keys:
+        _cache().delete_many(keys)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Drop-in replacement for TokenAuthentication with cached lookups.
+
+    Cache misses fall back to the regular lookup (including the checks
+    for unknown tokens and inactive users) and store the result.
+    """
+
+    def authenticate_credentials(self, key):
+        cached = _cache().get(_key(key))
+        if cached is not None:
+            return cached
+        user, token = super().authenticate_credentials(key)
+        remember_token(user, token)
+        return user, token
+
+    async def aauthenticate(self, request):
+        """
+        Async variant of authenticate() for Django requests.
+
+        Returns:
+            tuple | None: (user, token), or None if the request carries
+            no token.
+
+        Raises:
+            AuthenticationFailed: Malformed header, unknown token or
+            inactive user, with the messages of authenticate().
+        """
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+        try:
+            key = auth[1].decode() if len(auth) == 2 else None
+        except UnicodeError:
+            key = None
+        if key is None:
+            # Malformed headers are rejected before any lookup.
+            return self.authenticate(request)
+        return await self.aauthenticate_credentials(key)
+
+    async def aauthenticate_credentials(self, key):
+        """
+        Async variant of authenticate_credentials().
+
+        The local-memory cache does no I/O and is read directly.
+        """
+        cached = _cache().get(_key(key))
+        if cached is not None:
+            return cached
+        model = self.get_model()
+        try:
+            token = await model.objects.select_related("user").aget(key=key)
+        except model.DoesNotExist:
+            raise AuthenticationFailed(_("Invalid token."))
+        if not token.user.is_active:
+            raise AuthenticationFailed(_("User inactive or deleted."))
+        remember_token(token.user, token)
+        return token.user, token
@@ -0,0 +1,35 @@
+from django.contrib.auth.backends import ModelBackend
+
+from user_auth_app import emails
+
+
+class EmailBackend(ModelBackend):
+    """
+    Authenticate with an email address in any case.
+
+    The login view passes the email as `username` (see CustomLogin). The
+    user is found with one query on the unique email index (see
+    user_auth_app.emails). Credentials without "@" are left to
+    ModelBackend (e.g. admin usernames).
+
+    Users who lost their email to the de-duplication of migration
+    user_auth_app/0002_unique_email keep their username, which is their
+    former address: when the password does not match the owner of the
+    email, ModelBackend still checks it against that username.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        """
+        Return the user with the email `username` if `password` matches.
+
+        Otherwise None, so the next backend is tried: a wrong password
+        costs a second hash in ModelBackend.
+        """
+        if username is None or password is None or "@" not in username:
+            return None
+        user = emails.find_user(username)
+        if user is None:
+            return None
+        if user.check_password(password) and self.user_can_authenticate(user):
+            return user
+        return None
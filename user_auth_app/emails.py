@@ -0,0 +1,68 @@
+"""
+Case-insensitive, uniquely indexed email lookups.
+
+auth_user.email is neither unique nor indexed, and emails that differ in
+case only are the same address. Migration 0002_unique_email therefore adds
+EMAIL_CONSTRAINT: a unique index on LOWER(email), partial on non-empty
+emails (users created without email, e.g. by createsuperuser, may share
+the empty one). It also makes two registrations of one address
+impossible, even when they race past the existence check. The migration
+has its own frozen copy of the index; change both together.
+
+Lookups must repeat the indexed expression and the index condition to
+use the index; by_email() builds them. Existing emails keep their case,
+registration stores new ones normalized (normalize_email()).
+"""
+
+from django.contrib.auth import get_user_model
+from django.db.models import Q, UniqueConstraint
+from django.db.models.functions import Lower
+
+EMAIL_CONSTRAINT = UniqueConstraint(
+    Lower("email"),
+    condition=~Q(email=""),
+    name="auth_user_email_ci_uniq",
+    violation_error_message="Email already exists",
+)
+
+
+def normalize_email(email):
+    """
+    Return the lookup key of an email: stripped and lower-cased.
+    """
+    return (email or "").strip().lower()
+
+
+def by_email(emails, queryset=None):
+    """
+    Filter users by email, case-insensitively, using EMAIL_CONSTRAINT.
+
+    Args:
+        emails: One email or an iterable of emails (normalized here).
+        queryset: Users to filter (default: all users).
+
+    Returns:
+        QuerySet: The users with one of the emails, annotated with their
+        normalized `email_key`.
+    """
+    if queryset is None:
+        queryset = get_user_model().objects.all()
+    queryset = queryset.exclude(email="").annotate(email_key=Lower("email"))
+    if isinstance(emails, str):
+        return queryset.filter(email_key=normalize_email(emails))
+    return queryset.filter(email_key__in={normalize_email(email) for email in emails})
+
+
+def find_user(email):
+    """
+    Return the user with `email` (any case), or None.
+    """
+    if not normalize_email(email):
+        return None
+    # get() instead of first(): ORDER BY id could steer the planner away
+    # from the email index.
+    try:
+        return by_email(email).get()
+    except get_user_model().DoesNotExist:
+        return None
+
@@ -0,0 +1,83 @@
+# Generated by Django 6.0 on 2026-10-18 23:55
+
+from django.conf import settings
+from django.db import migrations
+from django.db.models import Count, F, Subquery
+from django.db.models.functions import Lower
+
+# The email index as of this migration, see user_auth_app.emails
+# (EMAIL_CONSTRAINT). Frozen here so later changes of that module do not
+# change this migration. Valid on SQLite and PostgreSQL.
+CONSTRAINT_NAME = "auth_user_email_ci_uniq"
+INSTALL_SQL = "CREATE UNIQUE INDEX {name} ON {table} ((LOWER({email}))) WHERE NOT ({email} = '')"
+DROP_SQL = "DROP INDEX {name}"
+
+
+def user_model(apps):
+    return apps.get_model(*settings.AUTH_USER_MODEL.split("."))
+
+
+def dedupe_emails(apps, schema_editor):
+    """
+    Keep every email (any case) on one user only.
+
+    Of the users sharing an email, the one who logged in last (else the
+    oldest) keeps it; the others keep their account and data, but their
+    email is cleared. They log in with their username (see
+    user_auth_app.backends.EmailBackend).
+    """
+    User = user_model(apps)
+    keyed = User.objects.exclude(email="").annotate(email_key=Lower("email"))
+    duplicated = (
+        keyed.values("email_key").annotate(count=Count("pk")).filter(count__gt=1).values("email_key")
+    )
+    rows = (
+        keyed.filter(email_key__in=Subquery(duplicated))
+        .order_by("email_key", F("last_login").desc(nulls_last=True), "pk")
+        .values_list("pk", "email_key")
+    )
+    cleared, previous = [], None
+    for pk, email_key in rows:
+        if email_key == previous:
+            cleared.append(pk)
+        previous = email_key
+    for start in range(0, len(cleared), 500):
+        User.objects.filter(pk__in=cleared[start:start + 500]).update(email="")
+
+
+def _run(apps, schema_editor, statement):
+    quote = schema_editor.quote_name
+    schema_editor.execute(
+        statement.format(
+            name=quote(CONSTRAINT_NAME),
+            table=quote(user_model(apps)._meta.db_table),
+            email=quote("email"),
+        ),
+        params=None,
+    )
+
+
+def add_constraint(apps, schema_editor):
+    """
+    Add the unique index on LOWER(email), see user_auth_app.emails.
+    """
+    _run(apps, schema_editor, INSTALL_SQL)
+
+
+def remove_constraint(apps, schema_editor):
+    _run(apps, schema_editor, DROP_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_auth_app', '0001_initial'),
+        # The last migration that changes auth_user: on SQLite, rebuilding
+        # the table afterwards would drop the index.
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RunPython(dedupe_emails, migrations.RunPython.noop),
+        migrations.RunPython(add_constraint, remove_constraint),
+    ]
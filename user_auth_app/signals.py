@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+from user_auth_app.authentication import forget_tokens
+
+
+@receiver(post_delete, sender=Token)
+def forget_deleted_token(sender, instance, **kwargs):
+    """
+    Stop accepting a deleted token.
+
+    Also sent for the tokens of deleted users (cascade).
+    """
+    forget_tokens([instance.key])
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def forget_tokens_of_changed_user(sender, instance, created, **kwargs):
+    """
+    Drop the cached tokens of a saved user.
+
+    Covers deactivation (is_active=False is checked on the next lookup)
+    and keeps the cached user object from going stale. New users have
+    no tokens yet.
+    """
+    if created:
+        return
+    forget_tokens(Token.objects.filter(user_id=instance.pk).values_list("key", flat=True))
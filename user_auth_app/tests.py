@@ -1,3 +1,286 @@
-from django.test import TestCase
+from importlib import import_module
+from unittest import mock
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.db import IntegrityError, connection, transaction
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+from core.testing import SCENARIO_PASSWORD, QueryBudgetTestCase
+from user_auth_app import emails
 
-# Create your tests here.
+
+class UserAuthQueryBudgetTests(QueryBudgetTestCase):
+    """
+    Query budgets for every route of user_auth_app.api.urls and email-check.
+
+    The token of the scenario is cached as after a login, so budgets do
+    not include the token lookup (see user_auth_app.authentication).
+    """
+
+    def test_profile_list(self):
+        self.assertQueryBudget(lambda s: self.client.get("/api/profiles/"), budget=1)
+
+    def test_profile_create(self):
+        def call(scenario):
+            scenario.profile.delete()
+            return self.client.post(
+                "/api/profiles/", {"user": scenario.owner.pk, "bio": "Hi"}, format="json"
+            )
+
+        self.assertQueryBudget(call, budget=4, expected_status=201)
+
+    def test_profile_retrieve(self):
+        self.assertQueryBudget(
+            lambda s: self.client.get(f"/api/profiles/{s.profile.pk}/"), budget=1
+        )
+
+    def test_profile_partial_update(self):
+        self.assertQueryBudget(
+            lambda s: self.client.patch(
+                f"/api/profiles/{s.profile.pk}/", {"location": "Hamburg"}, format="json"
+            ),
+            budget=2,
+        )
+
+    def test_profile_destroy(self):
+        self.assertQueryBudget(
+            lambda s: self.client.delete(f"/api/profiles/{s.profile.pk}/"),
+            budget=2,
+            expected_status=204,
+        )
+
+    def test_registration(self):
+        # The user is inserted in a savepoint, so that a duplicate email
+        # is reported as 400 (see RegistrationsSerializer.save()).
+        self.assertQueryBudget(
+            lambda s: self.client.post(
+                "/api/registration/",
+                {
+                    "fullname": "New User",
+                    "email": f"new-{s.owner.pk}@example.com",
+                    "password": "pw-12345",
+                    "repeated_password": "pw-12345",
+                },
+                format="json",
+            ),
+            budget=8,
+        )
+
+    def test_login(self):
+        self.assertQueryBudget(
+            lambda s: self.client.post(
+                "/api/login/",
+                {"email": s.owner.email, "password": SCENARIO_PASSWORD},
+                format="json",
+            ),
+            budget=2,
+        )
+
+    def test_logout(self):
+        self.assertQueryBudget(lambda s: self.client.post("/api/logout/"), budget=0)
+
+    def test_email_check(self):
+        self.assertQueryBudget(
+            lambda s: self.client.get("/api/email-check/", {"email": s.users[-1].email}),
+            budget=1,
+        )
+
+    def test_email_check_batch(self):
+        self.assertQueryBudget(
+            lambda s: self.client.post(
+                "/api/email-check/batch/",
+                {"emails": [user.email.upper() for user in s.users[:200]]},
+                format="json",
+            ),
+            budget=1,
+        )
+
+
+class CachedTokenAuthenticationTests(APITestCase):
+    """
+    Tests for user_auth_app.authentication.CachedTokenAuthentication.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="token@example.com", email="token@example.com", password="pw-12345"
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+
+    def logout(self):
+        return self.client.post("/api/logout/")
+
+    def test_token_lookup_is_cached(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(self.logout().status_code, 200)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.logout().status_code, 200)
+
+    def test_login_and_registration_warm_the_cache(self):
+        response = self.client.post(
+            "/api/login/", {"email": "token@example.com", "password": "pw-12345"}, format="json"
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {response.json()['token']}")
+        with self.assertNumQueries(0):
+            self.assertEqual(self.logout().status_code, 200)
+
+        response = self.client.post(
+            "/api/registration/",
+            {
+                "fullname": "New User",
+                "email": "new@example.com",
+                "password": "pw-12345",
+                "repeated_password": "pw-12345",
+            },
+            format="json",
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {response.json()['token']}")
+        with self.assertNumQueries(0):
+            self.assertEqual(self.logout().status_code, 200)
+
+    def test_deleted_token_is_rejected(self):
+        self.logout()
+        self.token.delete()
+        self.assertEqual(self.logout().status_code, 403)
+
+    def test_deactivated_user_is_rejected(self):
+        self.logout()
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.logout().status_code, 403)
+
+    def test_deleted_user_is_rejected(self):
+        self.logout()
+        self.user.delete()
+        self.assertEqual(self.logout().status_code, 403)
+
+
+class EmailIndexTests(APITestCase):
+    """
+    Tests for the case-insensitive unique email index (user_auth_app.emails).
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="Anna@Example.com", email="Anna@Example.com", password="pw-12345"
+        )
+        Token.objects.create(user=self.user)
+
+    def register(self, email):
+        return self.client.post(
+            "/api/registration/",
+            {"fullname": "Anna", "email": email, "password": "pw-12345", "repeated_password": "pw-12345"},
+            format="json",
+        )
+
+    def test_registration_normalizes_and_rejects_any_case(self):
+        response = self.register(" Bert@Example.COM")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(User.objects.get(pk=response.json()["user_id"]).username, "bert@example.com")
+        for email in ("bert@example.com", "ANNA@example.com"):
+            response = self.register(email)
+            self.assertEqual(response.status_code, 400)
+            self.assertIn("email", response.json())
+
+    def test_concurrent_registration_is_rejected_by_the_index(self):
+        # As if another registration passed validate_email() first.
+        with mock.patch("user_auth_app.emails.by_email", return_value=User.objects.none()):
+            response = self.register("anna@EXAMPLE.com")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"email": ["Email already exists"]})
+        self.assertEqual(User.objects.count(), 1)
+
+    def test_index_allows_many_empty_emails_only(self):
+        User.objects.create(username="admin-1")
+        User.objects.create(username="admin-2")
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            User.objects.create(username="other", email="anna@example.COM")
+
+    def test_login_and_email_check_in_any_case(self):
+        # The user on the email index, then the token.
+        with self.assertNumQueries(2):
+            response = self.client.post(
+                "/api/login/", {"email": "anna@example.com", "password": "pw-12345"}, format="json"
+            )
+        self.assertEqual(response.json()["user_id"], self.user.pk)
+        response = self.client.post(
+            "/api/login/", {"email": "ANNA@example.com", "password": "wrong"}, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post(
+            "/api/login/", {"username": "Anna@Example.com", "password": "pw-12345"}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+
+        self.client.force_authenticate(self.user)
+        response = self.client.get("/api/email-check/", {"email": "anna@EXAMPLE.com"})
+        self.assertEqual(response.json()["id"], self.user.pk)
+        response = self.client.get("/api/email-check/", {"email": "nobody@example.com"})
+        self.assertEqual(response.json(), {"exists": False})
+
+    def test_deduped_users_log_in_with_their_username(self):
+        # Lost "anna@example.com" to self.user in the migration.
+        deduped = User.objects.create_user(username="anna@example.com", email="", password="other-pw")
+        response = self.client.post(
+            "/api/login/", {"email": "anna@example.com", "password": "other-pw"}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["user_id"], deduped.pk)
+        response = self.client.post(
+            "/api/login/", {"email": "anna@example.com", "password": "pw-12345"}, format="json"
+        )
+        self.assertEqual(response.json()["user_id"], self.user.pk)
+
+    def test_lookups_use_the_index(self):
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+        for queryset in (emails.by_email("anna@example.com"), emails.by_email(["a@example.com", "B@x.org"])):
+            self.assertIn(emails.EMAIL_CONSTRAINT.name, queryset.explain())
+
+    def test_migration_dedupes_emails(self):
+        migration = import_module("user_auth_app.migrations.0002_unique_email")
+        editor = connection.schema_editor()
+        with connection.cursor() as cursor:
+            cursor.execute(str(emails.EMAIL_CONSTRAINT.remove_sql(User, editor)))
+        recent = User.objects.create(username="recent", email="anna@EXAMPLE.com", last_login="2026-01-01T00:00Z")
+        older = User.objects.create(username="older", email="ANNA@example.com")
+        other = User.objects.create(username="other", email="other@example.com")
+
+        migration.dedupe_emails(apps, editor)
+        with connection.cursor() as cursor:
+            cursor.execute(str(emails.EMAIL_CONSTRAINT.create_sql(User, editor)))
+        self.assertEqual(
+            dict(User.objects.values_list("username", "email")),
+            {
+                "Anna@Example.com": "",
+                recent.username: "anna@EXAMPLE.com",
+                older.username: "",
+                other.username: "other@example.com",
+            },
+        )
+
+    def test_batch_check(self):
+        self.client.force_authenticate(self.user)
+        bert = User.objects.create_user(username="bert@example.com", email="bert@example.com")
+        url = "/api/email-check/batch/"
+        emails_in = ["BERT@example.com", "nobody@example.com", "anna@example.com", "bert@EXAMPLE.com"]
+        with self.assertNumQueries(1):
+            response = self.client.post(url, {"emails": emails_in}, format="json")
+        self.assertEqual(
+            response.json(),
+            {
+                "found": [
+                    {"id": bert.pk, "email": "bert@example.com", "fullname": ""},
+                    {"id": self.user.pk, "email": self.user.email, "fullname": ""},
+                ],
+                "not_found": ["nobody@example.com"],
+            },
+        )
+
+        too_many = [f"user-{index}@example.com" for index in range(501)]
+        for payload in ({}, {"emails": []}, {"emails": ["not an email"]}, {"emails": too_many}):
+            response = self.client.post(url, payload, format="json")
+            self.assertEqual(response.status_code, 400, payload)
+            self.assertIn("emails", response.json())